@@ -1,35 +1,55 @@
-from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import List, Dict, Optional, Any
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing import Deque, List, Dict, Literal, Optional, Any
+from collections import deque
+import asyncio
 import json
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
-from supabase import create_client, Client
-from flask import request, jsonify  # Add missing imports
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-from task_model import Task, Silo, TaskStatus, TaskPriority, TaskRelationship
-from task_processor import TaskProcessor
+from task_model import Task, Silo, TaskStatus, TaskPriority, TaskRelationship, INVERSE_RELATIONSHIPS
+from task_processor import DEFAULT_TASK_HOURS, shared_processor
+from storage import StorageEngine, PersistenceWorker, put_record, delete_record
+from task_index import TaskIndex
+from task_graph import DependencyIndex, RelationshipStore
+from silo_hierarchy import SiloHierarchy
+from silo_embeddings import SiloEmbeddingIndex, task_query
+from task_retrieval import TaskRetriever, RETRIEVAL_TOP_K
+from critical_path import compute_critical_path, DependencyCycleError
+from model_scheduler import BATCH, ModelBusyError
+from serialization import SerializedCache, json_response, not_modified
+from compact_store import CompactTaskStore
+from changeset import ChangeSet
+from change_feed import ChangeFeed, TASK, SILO
 
 from contextlib import asynccontextmanager
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+_supabase = None
 class ProcessTasksRequest(BaseModel):
     tasks: list[str]
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
-# Initialize Supabase client
 
+def get_supabase():
+    """Supabase client, created when the first authenticated request arrives"""
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+    return _supabase
 
 # Initialize OAuth2 scheme for token-based authentication
 async def get_current_user(token: str = Depends(oauth2_scheme)):
-    user = await supabase.auth.get_user(token)
+    user = await get_supabase().auth.get_user(token)
     if not user:
         raise HTTPException(status_code=401, detail="Unauthorized")
     return user
@@ -37,12 +57,21 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup code
+    global _warmup
     try:
-        load_from_file()
+        load_from_file(warm=False)
     except Exception as e:
         print(f"Error loading data: {e}")
+    # Index the loaded tasks in the background; index-backed routes wait for it
+    _warmup = asyncio.create_task(warm_indexes())
+    persistence.start()
+    # Probe Ollama in the background so a cold model host never delays startup
+    health_monitor = asyncio.create_task(task_processor.monitor_health())
     yield
-    # Shutdown code would go here
+    # Shutdown code
+    _warmup.cancel()
+    health_monitor.cancel()
+    await persistence.stop()
 
 app = FastAPI(title="Silo Task Manager API", lifespan=lifespan)
 
@@ -53,15 +82,42 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-# Initialize task processor
-task_processor = TaskProcessor()
+# Shared task processor; connects to Ollama on first use
+task_processor = shared_processor()
 
 # In-memory storage (replace with proper database in production)
-tasks = {}
+tasks = CompactTaskStore()  # Reads return copies; write changed tasks back with tasks[id] = task
 silos = {}
 
+# Persistence: snapshot plus append-only mutation log
+storage = StorageEngine()
+INDEX_WARMUP_CHUNK = 1000  # Loaded tasks indexed per event loop turn
+BULK_MAX_OPERATIONS = 10000  # Largest batch accepted by /api/tasks/bulk
+_changed_tasks = set()
+_changed_silos = set()
+
+# Secondary indexes kept current by mark_tasks_changed
+task_index = TaskIndex()
+dependency_index = DependencyIndex()
+relationships = RelationshipStore()
+silo_hierarchy = SiloHierarchy()
+silo_embeddings = SiloEmbeddingIndex()
+task_retriever = TaskRetriever()
+
+# Encoded JSON per entity for the read endpoints, dropped on change
+task_json = SerializedCache(Task)
+silo_json = SerializedCache(Silo)
+
+# Store version and recent changes, for conditional GETs and /api/changes
+change_feed = ChangeFeed()
+
+# Loaded tasks still waiting to be indexed, and the background task indexing them
+_unindexed: Deque[str] = deque()
+_warmup: Optional[asyncio.Task] = None
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     logger.info(f"Incoming request: {request.method} {request.url}")
@@ -73,40 +129,120 @@ async def log_requests(request: Request, call_next):
     logger.info(f"Response status: {response.status_code}")
     return response
 
+@app.exception_handler(ModelBusyError)
+async def model_busy_handler(request: Request, exc: ModelBusyError):
+    """Tell clients to back off when the model queue is saturated"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": str(exc), "retry_after": exc.retry_after},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Data storage helpers
-def save_to_file():
-    """Save data to a JSON file (temporary solution)"""
-    data = {
-        "tasks": tasks,
-        "silos": silos
-    }
-    with open("data.json", "w") as f:
-        json.dump(data, f, default=str)
-
-def load_from_file():
-    """Load data from a JSON file (temporary solution)"""
-    global tasks, silos
-    if not os.path.exists("data.json"):
-        return
-    
-    with open("data.json", "r") as f:
-        data = json.load(f)
-        # Convert string keys back to objects
-        tasks = {k: Task.parse_obj(v) for k, v in data.get("tasks", {}).items()}
-        silos = {k: Silo.parse_obj(v) for k, v in data.get("silos", {}).items()}
-
-# Try to load existing data on startup
-@app.on_event("startup")
-async def startup_event():
-    try:
-        load_from_file()
-    except Exception as e:
-        print(f"Error loading data: {e}")
+def _refresh_task_indexes(task_id: str, task: Optional[Task]):
+    refreshers = (
+        task_index.refresh,
+        dependency_index.refresh,
+        relationships.refresh,
+        silo_hierarchy.refresh_task,
+        silo_embeddings.refresh_task,
+        task_retriever.refresh
+    )
+    for refresh in refreshers:
+        try:
+            refresh(task_id, task)
+        except Exception as e:
+            # The store has already changed; keep the other indexes, the caches
+            # and the save going, and leave the task out of this index rather
+            # than half-updated in it
+            logger.error(f"Indexing task {task_id} in {refresh.__qualname__} failed: {e}")
+            refresh(task_id, None)
+
+def mark_tasks_changed(*task_ids: str):
+    """Record tasks that were created, modified or deleted since the last save"""
+    _changed_tasks.update(task_ids)
+    for task_id in task_ids:
+        _refresh_task_indexes(task_id, tasks.get(task_id))
+    task_json.invalidate(*task_ids)
+    change_feed.record(TASK, *task_ids, deleted={task_id for task_id in task_ids if task_id not in tasks})
+
+def mark_silos_changed(*silo_ids: str):
+    """Record silos that were created, modified or deleted since the last save"""
+    _changed_silos.update(silo_ids)
+    for silo_id in silo_ids:
+        silo_hierarchy.refresh_silo(silo_id, silos.get(silo_id))
+        silo_embeddings.refresh_silo(silo_id, silos.get(silo_id))
+    silo_json.invalidate(*silo_ids)
+    change_feed.record(SILO, *silo_ids, deleted={silo_id for silo_id in silo_ids if silo_id not in silos})
+
+def _collect_changes():
+    """Build log records for the tasks and silos changed since the last flush"""
+    records = []
+    for task_id in _changed_tasks:
+        if task_id in tasks:
+            records.append(put_record("task", tasks[task_id]))
+        else:
+            records.append(delete_record("task", task_id))
+    for silo_id in _changed_silos:
+        if silo_id in silos:
+            records.append(put_record("silo", silos[silo_id]))
+        else:
+            records.append(delete_record("silo", silo_id))
+    _changed_tasks.clear()
+    _changed_silos.clear()
+    return records
+
+persistence = PersistenceWorker(storage, _collect_changes, lambda: (tasks, silos))
+
+async def save_to_file():
+    """Hand the changed tasks and silos to the background persistence worker"""
+    await persistence.commit()
+
+def load_from_file(warm: bool = True):
+    """Open the latest snapshot and replay the mutation log
+
+    Tasks are decoded from the snapshot when first read. The indexes start
+    from the silos alone; the loaded tasks are indexed here, or later by
+    warm_indexes() when warm is False.
+    """
+    global tasks, silos, _unindexed
+    tasks, silos = storage.load()
+    task_index.rebuild({})
+    dependency_index.rebuild({})
+    relationships.rebuild({})
+    silo_hierarchy.rebuild(silos, {})
+    silo_embeddings.rebuild(silos, {})
+    task_retriever.rebuild({})
+    task_json.clear()
+    silo_json.clear()
+    change_feed.reset()
+    _unindexed = deque(tasks)
+    if warm:
+        _index_loaded_tasks()
+
+def _index_loaded_tasks(limit: Optional[int] = None) -> bool:
+    """Index up to limit loaded tasks; True once every loaded task is indexed"""
+    count = len(_unindexed) if limit is None else min(limit, len(_unindexed))
+    for _ in range(count):
+        # Refreshing is idempotent, so tasks changed since loading are safe to revisit
+        task_id = _unindexed.popleft()
+        _refresh_task_indexes(task_id, tasks.get(task_id))
+    return not _unindexed
+
+async def warm_indexes():
+    """Index the loaded tasks a chunk at a time so requests are served meanwhile"""
+    while not _index_loaded_tasks(INDEX_WARMUP_CHUNK):
+        await asyncio.sleep(0)
+
+async def indexes_ready():
+    """Dependency for routes that query the indexes: wait for the warm-up to finish"""
+    if _warmup is not None and not _warmup.done():
+        await asyncio.shield(_warmup)
 
 @app.get("/test-ai")
 async def test_ai():
     test_task = "Write research paper about AI ethics"
-    processed = task_processor.parse_task(test_task)
+    processed = await run_in_threadpool(task_processor.parse_task, test_task)
     return processed
 
 # Models for API requests
@@ -141,20 +277,162 @@ class SiloUpdate(BaseModel):
     parent_id: Optional[str] = None
     icon: Optional[str] = None
 
+class BulkTaskCreate(BaseModel):
+    ref: Optional[str] = None  # Name later operations in the same batch can use in place of the new task's id
+    title: str
+    description: Optional[str] = ""
+    silo_id: str
+
+class BulkTaskUpdate(TaskUpdate):
+    id: str
+
+class BulkRelationshipChange(BaseModel):
+    op: Literal["add", "remove"] = "add"
+    task_id: str
+    related_task_id: str
+    relationship_type: Optional[TaskRelationship] = None  # Required to add
+
+class BulkTaskRequest(BaseModel):
+    creates: List[BulkTaskCreate] = []
+    updates: List[BulkTaskUpdate] = []
+    relationships: List[BulkRelationshipChange] = []
+    deletes: List[str] = []
+
+# Edits staged on a ChangeSet, shared by the single-task and bulk endpoints
+async def commit_changes(changes: ChangeSet):
+    """Apply a change set to the stores, refresh the indexes and persist it in one commit"""
+    task_ids, silo_ids = changes.apply()
+    mark_silos_changed(*silo_ids)
+    mark_tasks_changed(*task_ids)
+    await save_to_file()
+
+def stage_task_create(changes: ChangeSet, task_data: BulkTaskCreate) -> Task:
+    if not changes.has_silo(task_data.silo_id):
+        raise HTTPException(status_code=404, detail=f"Silo {task_data.silo_id} not found")
+    new_task = Task(title=task_data.title, silo_id=task_data.silo_id)
+    if task_data.description:
+        new_task.description = task_data.description
+    changes.put_task(new_task)
+    changes.add_to_silo(new_task.silo_id, new_task.id)
+    return new_task
+
+def stage_task_update(changes: ChangeSet, task_id: str, task_update: TaskUpdate) -> Task:
+    if not changes.has_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+        
+    task = changes.task(task_id)
+    
+    # Update fields if provided
+    if task_update.title is not None:
+        task.title = task_update.title
+    if task_update.description is not None:
+        task.description = task_update.description
+    if task_update.status is not None:
+        try:
+            task.status = TaskStatus(task_update.status)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid status: {task_update.status}")
+    if task_update.priority is not None:
+        try:
+            task.priority = TaskPriority(task_update.priority)
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid priority: {task_update.priority}")
+    if task_update.due_date is not None:
+        try:
+            task.due_date = datetime.fromisoformat(task_update.due_date) if task_update.due_date else None
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format")
+    if task_update.estimated_time is not None:
+        try:
+            task.estimated_time = TypeAdapter(timedelta).validate_python(task_update.estimated_time) if task_update.estimated_time else None
+        except ValidationError:
+            raise HTTPException(status_code=400, detail="Invalid duration format")
+    if task_update.silo_id is not None:
+        # Remove from old silo
+        if task.silo_id and changes.has_silo(task.silo_id):
+            changes.remove_from_silo(task.silo_id, task_id)
+        
+        # Add to new silo
+        task.silo_id = task_update.silo_id
+        if changes.has_silo(task.silo_id):
+            changes.add_to_silo(task.silo_id, task_id)
+    if task_update.completion_percentage is not None:
+        task.completion_percentage = max(0, min(100, task_update.completion_percentage))
+        
+        # Auto-update status based on completion percentage
+        if task.completion_percentage == 100 and task.status != TaskStatus.COMPLETED:
+            task.status = TaskStatus.COMPLETED
+        elif task.completion_percentage > 0 and task.status == TaskStatus.NOT_STARTED:
+            task.status = TaskStatus.IN_PROGRESS
+    
+    # Add note if provided
+    if task_update.note:
+        task.add_note(task_update.note)
+    
+    task.updated_at = datetime.now()
+    return task
+
+def stage_task_delete(changes: ChangeSet, task_id: str):
+    if not changes.has_task(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
+        
+    task = changes.task(task_id)
+    
+    # Remove from silo
+    if task.silo_id and changes.has_silo(task.silo_id):
+        changes.remove_from_silo(task.silo_id, task_id)
+    
+    # Remove relationships held by the tasks that point at this one, both
+    # stored and staged in this change set (which are not indexed yet)
+    for other_id in relationships.referencing(task_id) | changes.referencing(task_id):
+        if other_id != task_id and changes.has_task(other_id):
+            changes.task(other_id).remove_relationship(task_id)
+    
+    changes.delete_task(task_id)
+
+def stage_relationship(changes: ChangeSet, task_id: str, related_task_id: str, rel_type: TaskRelationship):
+    if not changes.has_task(task_id):
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    if not changes.has_task(related_task_id):
+        raise HTTPException(status_code=404, detail=f"Related task {related_task_id} not found")
+    if task_id == related_task_id:
+        raise HTTPException(status_code=400, detail="Cannot create relationship to self")
+    
+    changes.add_relationship(task_id, related_task_id, rel_type)
+    # Record the other side too, so both tasks agree on the relationship
+    if rel_type in INVERSE_RELATIONSHIPS:
+        changes.add_relationship(related_task_id, task_id, INVERSE_RELATIONSHIPS[rel_type])
+
+def stage_relationship_removal(changes: ChangeSet, task_id: str, related_task_id: str):
+    if not changes.has_task(task_id):
+        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
+    
+    changes.task(task_id).remove_relationship(related_task_id)
+    if changes.has_task(related_task_id):
+        changes.task(related_task_id).remove_relationship(task_id)
+
 # API endpoints for Tasks
 @app.post("/api/tasks", response_model=Task)
 async def create_task(task_data: TaskCreate):
     if task_data.parse_with_ai:
         # Use AI to parse the task
-        parsed_task = task_processor.parse_task(
-            f"{task_data.title}\n{task_data.description}"
+        # Model calls run in the threadpool so they wait for the scheduler without blocking the loop
+        parsed_task = await run_in_threadpool(
+            task_processor.parse_task, f"{task_data.title}\n{task_data.description}"
         )
         
         # If silo_id is not provided, suggest one
         if not task_data.silo_id:
             available_silos = list(silos.values())
             if available_silos:
-                task_data.silo_id = task_processor.suggest_silo(parsed_task, available_silos)
+                # Embedding (and the first model load) runs in a worker thread
+                ranked = None
+                if len(available_silos) > 1:
+                    ranked = await silo_embeddings.arank(task_query(parsed_task), [s.id for s in available_silos])
+                # A tie-break prompt waits for a scheduler slot, so it runs in the threadpool too
+                task_data.silo_id = await run_in_threadpool(
+                    task_processor.suggest_silo, parsed_task, available_silos, ranked
+                )
             else:
                 raise HTTPException(status_code=400, detail="No silos available. Create a silo first.")
         
@@ -168,7 +446,7 @@ async def create_task(task_data: TaskCreate):
         
         # Estimate completion time if not set
         if not parsed_task.estimated_time:
-            parsed_task.estimated_time = task_processor.estimate_completion_time(parsed_task)
+            parsed_task.estimated_time = await run_in_threadpool(task_processor.estimate_completion_time, parsed_task)
         
         # Save the task
         tasks[parsed_task.id] = parsed_task
@@ -176,8 +454,10 @@ async def create_task(task_data: TaskCreate):
         # Add task to silo
         if parsed_task.silo_id in silos:
             silos[parsed_task.silo_id].add_task(parsed_task.id)
+            mark_silos_changed(parsed_task.silo_id)
         
-        save_to_file()
+        mark_tasks_changed(parsed_task.id)
+        await save_to_file()
         return parsed_task
     else:
         # Create task manually without AI processing
@@ -195,113 +475,192 @@ async def create_task(task_data: TaskCreate):
         # Add task to silo
         if new_task.silo_id in silos:
             silos[new_task.silo_id].add_task(new_task.id)
+            mark_silos_changed(new_task.silo_id)
         
-        save_to_file()
+        mark_tasks_changed(new_task.id)
+        await save_to_file()
         return new_task
 
-@app.get("/api/tasks", response_model=List[Task])
+@app.get("/api/tasks", response_model=List[Task], dependencies=[Depends(indexes_ready)])
 async def get_tasks(
+    request: Request,
     skip: int = 0, 
     limit: int = 50, 
     silo_id: Optional[str] = None, 
     status: Optional[str] = None, 
-    priority: Optional[str] = None
+    priority: Optional[str] = None,
+    due_after: Optional[datetime] = None,
+    due_before: Optional[datetime] = None,
+    cursor: Optional[str] = None
 ):
-    result = list(tasks.values())
+    # Nothing to filter or encode when the client's copy is current
+    etag = change_feed.etag()
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
     
-    # Apply filters
-    if silo_id:
-        result = [t for t in result if t.silo_id == silo_id]
-    if status:
-        result = [t for t in result if t.status.value == status]
-    if priority:
-        result = [t for t in result if t.priority.value == priority]
+    # Filter through the secondary indexes; pass X-Next-Cursor back as
+    # ?cursor= to fetch the following page without rescanning
+    try:
+        page_ids, next_cursor = task_index.query(
+            silo_id=silo_id,
+            status=status,
+            priority=priority,
+            due_after=due_after,
+            due_before=due_before,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
     
-    return result[skip : skip + limit]
+    headers = {"ETag": etag}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return json_response(request, task_json.encode_list(page_ids, tasks), headers)
+
+@app.get("/api/tasks/critical-path", dependencies=[Depends(indexes_ready)])
+async def get_critical_path(silo_id: Optional[str] = None):
+    """Critical path over stored tasks, from their dependencies and estimated_time (hours).
+    Tasks without an estimate count as DEFAULT_TASK_HOURS, as in task dump analysis."""
+    task_ids = task_index.ids_for_silo(silo_id) if silo_id else list(tasks)
+    edges = [
+        (dep_id, task_id)
+        for task_id in task_ids
+        for dep_id in tasks.get_field(task_id, "dependencies")
+    ]
+    estimates = {task_id: tasks.get_field(task_id, "estimated_time") for task_id in task_ids}
+    durations = {
+        task_id: estimate.total_seconds() / 3600 if estimate else DEFAULT_TASK_HOURS
+        for task_id, estimate in estimates.items()
+    }
+    
+    try:
+        return compute_critical_path(task_ids, edges, durations)
+    except DependencyCycleError as e:
+        raise HTTPException(status_code=409, detail={"message": str(e), "cycle": e.cycle})
+
+@app.get("/api/tasks/prioritized", response_model=List[Task], dependencies=[Depends(indexes_ready)])
+async def get_prioritized_tasks(request: Request, limit: int = Query(10, ge=1, le=500)):
+    """Top tasks that are ready to start, best first"""
+    etag = change_feed.etag()
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    body = task_json.encode_list(dependency_index.top_ready(limit), tasks)
+    return json_response(request, body, {"ETag": etag})
 
 @app.get("/api/tasks/{task_id}", response_model=Task)
-async def get_task(task_id: str):
+async def get_task(request: Request, task_id: str):
     if task_id not in tasks:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks[task_id]
+    etag = change_feed.entity_etag(TASK, task_id)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return json_response(request, task_json.encode(task_id, tasks), {"ETag": etag})
 
 @app.put("/api/tasks/{task_id}", response_model=Task)
 async def update_task(task_id: str, task_update: TaskUpdate):
-    if task_id not in tasks:
-        raise HTTPException(status_code=404, detail="Task not found")
-        
-    task = tasks[task_id]
+    changes = ChangeSet(tasks, silos)
+    task = stage_task_update(changes, task_id, task_update)
+    await commit_changes(changes)
+    return task
+
+@app.delete("/api/tasks/{task_id}", dependencies=[Depends(indexes_ready)])
+async def delete_task(task_id: str):
+    changes = ChangeSet(tasks, silos)
+    stage_task_delete(changes, task_id)
+    await commit_changes(changes)
+    return {"status": "success", "message": "Task deleted"}
+
+@app.post("/api/tasks/bulk", dependencies=[Depends(indexes_ready)])
+async def bulk_create_tasks(batch: BulkTaskRequest):
+    """Create, update, relate and delete many tasks as one all-or-nothing batch"""
+    return await apply_task_batch(batch)
+
+@app.patch("/api/tasks/bulk", dependencies=[Depends(indexes_ready)])
+async def bulk_update_tasks(batch: BulkTaskRequest):
+    """Update, relate, delete or create many tasks as one all-or-nothing batch"""
+    return await apply_task_batch(batch)
+
+async def apply_task_batch(batch: BulkTaskRequest):
+    """Stage every operation of a bulk request, then apply and persist them together
+
+    Operations run in the order creates, updates, relationships, deletes,
+    and each sees the ones before it; later operations may name a created
+    task by its ref. Every operation is checked before anything is applied:
+    if any fails, the response lists each failure and nothing changes.
+    Otherwise the whole batch is applied and persisted in a single commit.
+    """
+    operation_count = len(batch.creates) + len(batch.updates) + len(batch.relationships) + len(batch.deletes)
+    if operation_count > BULK_MAX_OPERATIONS:
+        raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_OPERATIONS} operations per batch")
     
-    # Update fields if provided
-    if task_update.title is not None:
-        task.title = task_update.title
-    if task_update.description is not None:
-        task.description = task_update.description
-    if task_update.status is not None:
-        try:
-            task.status = TaskStatus(task_update.status)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid status: {task_update.status}")
-    if task_update.priority is not None:
-        try:
-            task.priority = TaskPriority(task_update.priority)
-        except ValueError:
-            raise HTTPException(status_code=400, detail=f"Invalid priority: {task_update.priority}")
-    if task_update.due_date is not None:
+    changes = ChangeSet(tasks, silos)
+    refs: Dict[str, str] = {}
+    results: Dict[str, List[Dict[str, Any]]] = {"creates": [], "updates": [], "relationships": [], "deletes": []}
+    errors = []
+    
+    def stage(kind: str, index: int, operation):
         try:
-            task.due_date = datetime.fromisoformat(task_update.due_date) if task_update.due_date else None
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format")
-    if task_update.estimated_time is not None:
-        task.estimated_time = task_update.estimated_time
-    if task_update.silo_id is not None:
-        # Remove from old silo
-        if task.silo_id and task.silo_id in silos:
-            silos[task.silo_id].remove_task(task_id)
-        
-        # Add to new silo
-        task.silo_id = task_update.silo_id
-        if task.silo_id in silos:
-            silos[task.silo_id].add_task(task_id)
-    if task_update.completion_percentage is not None:
-        task.completion_percentage = max(0, min(100, task_update.completion_percentage))
-        
-        # Auto-update status based on completion percentage
-        if task.completion_percentage == 100 and task.status != TaskStatus.COMPLETED:
-            task.status = TaskStatus.COMPLETED
-        elif task.completion_percentage > 0 and task.status == TaskStatus.NOT_STARTED:
-            task.status = TaskStatus.IN_PROGRESS
+            result = operation()
+        except HTTPException as e:
+            errors.append({"operation": kind, "index": index, "status_code": e.status_code, "detail": e.detail})
+            return
+        results[kind].append({"index": index, **result})
     
-    # Add note if provided
-    if task_update.note:
-        task.add_note(task_update.note)
+    def create(item: BulkTaskCreate):
+        if item.ref is not None and item.ref in refs:
+            raise HTTPException(status_code=400, detail=f"Duplicate ref: {item.ref}")
+        task = stage_task_create(changes, item)
+        if item.ref is not None:
+            refs[item.ref] = task.id
+        return {"ref": item.ref, "id": task.id, "task": task}
     
-    task.updated_at = datetime.now()
-    save_to_file()
-    return task
-
-@app.delete("/api/tasks/{task_id}")
-async def delete_task(task_id: str):
-    if task_id not in tasks:
-        raise HTTPException(status_code=404, detail="Task not found")
-        
-    task = tasks[task_id]
+    def update(item: BulkTaskUpdate):
+        task_id = refs.get(item.id, item.id)
+        return {"id": task_id, "task": stage_task_update(changes, task_id, item)}
     
-    # Remove from silo
-    if task.silo_id and task.silo_id in silos:
-        silos[task.silo_id].remove_task(task_id)
+    def relate(item: BulkRelationshipChange):
+        task_id = refs.get(item.task_id, item.task_id)
+        related_task_id = refs.get(item.related_task_id, item.related_task_id)
+        if item.op == "remove":
+            stage_relationship_removal(changes, task_id, related_task_id)
+        elif item.relationship_type is None:
+            raise HTTPException(status_code=400, detail="relationship_type is required to add a relationship")
+        else:
+            stage_relationship(changes, task_id, related_task_id, item.relationship_type)
+        return {"op": item.op, "task_id": task_id, "related_task_id": related_task_id}
     
-    # Remove relationships
-    for t in tasks.values():
-        t.remove_relationship(task_id)
+    def delete(task_id: str):
+        task_id = refs.get(task_id, task_id)
+        stage_task_delete(changes, task_id)
+        return {"id": task_id}
     
-    # Remove the task
-    del tasks[task_id]
-    save_to_file()
-    return {"status": "success", "message": "Task deleted"}
+    for index, item in enumerate(batch.creates):
+        stage("creates", index, lambda: create(item))
+    for index, item in enumerate(batch.updates):
+        stage("updates", index, lambda: update(item))
+    for index, item in enumerate(batch.relationships):
+        stage("relationships", index, lambda: relate(item))
+    for index, task_id in enumerate(batch.deletes):
+        stage("deletes", index, lambda: delete(task_id))
+    
+    if errors:
+        raise HTTPException(status_code=400, detail={
+            "message": f"{len(errors)} of {operation_count} operations failed; nothing was applied",
+            "errors": errors
+        })
+    
+    await commit_changes(changes)
+    return {"status": "success", "results": results}
 
 @app.post("/api/tasks/process")
 async def process_tasks(request: ProcessTasksRequest):
+    # Reject up front rather than queueing behind a saturated batch lane
+    task_processor.scheduler.admit(BATCH)
     try:
         if not request.tasks:
             raise HTTPException(status_code=400, detail="No tasks provided")
@@ -311,7 +670,7 @@ async def process_tasks(request: ProcessTasksRequest):
         for task in request.tasks:
             print(f" - {task}")
         
-        processed = task_processor.process_task_dump(request.tasks)
+        processed = await task_processor.process_task_dump_async(request.tasks)
         
         # Check for warnings but don't fail the request
         if "error" in processed:
@@ -320,9 +679,13 @@ async def process_tasks(request: ProcessTasksRequest):
         # Always return a valid response structure, even if analysis partially failed
         return {
             "nodes": processed.get("nodes", []),
-            "edges": processed.get("dependencies", []),
+            "edges": processed.get("edges", []),
             "critical_path": processed.get("critical_path", []),
-            "warning": processed.get("warning")  # Include any warnings for the frontend
+            "duration_hours": processed.get("duration_hours", 0.0),  # Length of the critical path
+            "schedule": processed.get("schedule", {}),  # Start/finish and slack per task, in hours
+            "warning": processed.get("warning"),  # Include any warnings for the frontend
+            "timings": processed.get("timings"),  # Per-stage model latency
+            "model_calls": processed.get("model_calls")  # Ollama requests made for this dump
         }
         
     except Exception as e:
@@ -376,6 +739,27 @@ async def process_tasks(request: ProcessTasksRequest):
         # If we couldn't create a fallback, raise the original error
         raise HTTPException(status_code=500, detail=f"Processing failed: {detail}")
 
+@app.post("/api/tasks/process/stream")
+async def process_tasks_stream(request: ProcessTasksRequest):
+    """Stream the processed task graph as newline-delimited JSON events.
+
+    Task nodes are sent as soon as their titles exist, followed by research
+    resources and edges, then the critical path and a final "done" event.
+    """
+    if not request.tasks:
+        raise HTTPException(status_code=400, detail="No tasks provided")
+    task_processor.scheduler.admit(BATCH)
+    
+    async def events():
+        try:
+            async for event in task_processor.stream_task_dump(request.tasks):
+                yield json.dumps(event, default=str) + "\n"
+        except Exception as e:
+            logger.error(f"Processing error: {str(e)}")
+            yield json.dumps({"event": "error", "detail": f"Processing failed: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
 # Task relationship endpoints
 @app.post("/api/tasks/{task_id}/relationships/{related_task_id}")
 async def create_relationship(
@@ -383,29 +767,33 @@ async def create_relationship(
     related_task_id: str, 
     relationship_type: TaskRelationship = Query(..., enum=[r.value for r in TaskRelationship])
 ):
-    if task_id not in tasks:
-        raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
-    if related_task_id not in tasks:
-        raise HTTPException(status_code=404, detail=f"Related task {related_task_id} not found")
-    if task_id == related_task_id:
-        raise HTTPException(status_code=400, detail="Cannot create relationship to self")
-        
     try:
         rel_type = TaskRelationship(relationship_type)
-        tasks[task_id].add_relationship(related_task_id, rel_type)
-        save_to_file()
-        return {"status": "success", "message": "Relationship created"}
     except ValueError:
         raise HTTPException(status_code=400, detail=f"Invalid relationship type: {relationship_type}")
+    
+    changes = ChangeSet(tasks, silos)
+    stage_relationship(changes, task_id, related_task_id, rel_type)
+    await commit_changes(changes)
+    return {"status": "success", "message": "Relationship created"}
 
 @app.delete("/api/tasks/{task_id}/relationships/{related_task_id}")
 async def delete_relationship(task_id: str, related_task_id: str):
+    changes = ChangeSet(tasks, silos)
+    stage_relationship_removal(changes, task_id, related_task_id)
+    await commit_changes(changes)
+    return {"status": "success", "message": "Relationship removed"}
+
+@app.get("/api/tasks/{task_id}/relationships", dependencies=[Depends(indexes_ready)])
+async def get_relationships(task_id: str):
     if task_id not in tasks:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
-        
-    tasks[task_id].remove_relationship(related_task_id)
-    save_to_file()
-    return {"status": "success", "message": "Relationship removed"}
+    
+    return {
+        "task_id": task_id,
+        **relationships.describe(task_id),
+        "children": relationships.children(task_id)
+    }
 
 # API endpoints for Silos
 @app.post("/api/silos", response_model=Silo)
@@ -427,12 +815,19 @@ async def create_silo(silo_data: SiloCreate):
     # Add to parent silo if provided
     if new_silo.parent_id:
         silos[new_silo.parent_id].add_child(new_silo.id)
+        mark_silos_changed(new_silo.parent_id)
     
-    save_to_file()
+    mark_silos_changed(new_silo.id)
+    await save_to_file()
     return new_silo
 
 @app.get("/api/silos", response_model=List[Silo])
-async def get_silos(parent_id: Optional[str] = None):
+async def get_silos(request: Request, parent_id: Optional[str] = None):
+    etag = change_feed.etag()
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    
     result = list(silos.values())
     
     # Filter by parent_id if provided
@@ -444,13 +839,39 @@ async def get_silos(parent_id: Optional[str] = None):
             # Get silos with specific parent
             result = [s for s in result if s.parent_id == parent_id]
     
-    return result
+    return json_response(request, silo_json.encode_list([s.id for s in result], silos), {"ETag": etag})
 
 @app.get("/api/silos/{silo_id}", response_model=Silo)
-async def get_silo(silo_id: str):
+async def get_silo(request: Request, silo_id: str):
     if silo_id not in silos:
         raise HTTPException(status_code=404, detail="Silo not found")
-    return silos[silo_id]
+    etag = change_feed.entity_etag(SILO, silo_id)
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    return json_response(request, silo_json.encode(silo_id, silos), {"ETag": etag})
+
+@app.get("/api/silos/{silo_id}/tree", dependencies=[Depends(indexes_ready)])
+async def get_silo_tree(
+    silo_id: str,
+    max_depth: Optional[int] = Query(None, ge=0),
+    include_tasks: bool = False
+):
+    """A silo and all of its descendants, each with task rollups over its subtree"""
+    if silo_id not in silos:
+        raise HTTPException(status_code=404, detail="Silo not found")
+    
+    tree = silo_hierarchy.subtree(silo_id, max_depth)
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        node["silo"] = silos[node["id"]]
+        if include_tasks:
+            node["tasks"] = [tasks[t_id] for t_id in task_index.ids_for_silo(node["id"])]
+        stack.extend(node["children"])
+    
+    tree["path"] = silo_hierarchy.path(silo_id)
+    return tree
 
 @app.put("/api/silos/{silo_id}", response_model=Silo)
 async def update_silo(silo_id: str, silo_update: SiloUpdate):
@@ -474,6 +895,8 @@ async def update_silo(silo_id: str, silo_update: SiloUpdate):
         # Check for cycles
         if silo_update.parent_id and silo_update.parent_id == silo_id:
             raise HTTPException(status_code=400, detail="Cannot set self as parent")
+        if silo_update.parent_id and silo_hierarchy.is_ancestor(silo_id, silo_update.parent_id):
+            raise HTTPException(status_code=400, detail="Cannot move a silo under one of its descendants")
             
         # Check if new parent exists
         if silo_update.parent_id and silo_update.parent_id not in silos:
@@ -482,6 +905,7 @@ async def update_silo(silo_id: str, silo_update: SiloUpdate):
         # Remove from old parent
         if silo.parent_id and silo.parent_id in silos:
             silos[silo.parent_id].remove_child(silo_id)
+            mark_silos_changed(silo.parent_id)
             
         # Set new parent
         silo.parent_id = silo_update.parent_id
@@ -489,12 +913,14 @@ async def update_silo(silo_id: str, silo_update: SiloUpdate):
         # Add to new parent
         if silo.parent_id:
             silos[silo.parent_id].add_child(silo_id)
+            mark_silos_changed(silo.parent_id)
     
     silo.updated_at = datetime.now()
-    save_to_file()
+    mark_silos_changed(silo_id)
+    await save_to_file()
     return silo
 
-@app.delete("/api/silos/{silo_id}")
+@app.delete("/api/silos/{silo_id}", dependencies=[Depends(indexes_ready)])
 async def delete_silo(silo_id: str, reassign_tasks: Optional[str] = None):
     if silo_id not in silos:
         raise HTTPException(status_code=404, detail="Silo not found")
@@ -506,7 +932,7 @@ async def delete_silo(silo_id: str, reassign_tasks: Optional[str] = None):
     silo = silos[silo_id]
     
     # Handle child silos
-    for child_id in silo.children[:]:  # Create a copy to iterate
+    for child_id in list(silo.children):  # Create a copy to iterate
         if reassign_tasks:
             # Move child to new parent
             silos[child_id].parent_id = reassign_tasks
@@ -514,27 +940,71 @@ async def delete_silo(silo_id: str, reassign_tasks: Optional[str] = None):
         else:
             # Make child a root silo
             silos[child_id].parent_id = None
+        mark_silos_changed(child_id)
     
     # Handle tasks
-    task_ids = [t_id for t_id in tasks if tasks[t_id].silo_id == silo_id]
-    for task_id in task_ids:
+    for task_id in task_index.ids_for_silo(silo_id):
+        task = tasks[task_id]
         if reassign_tasks:
             # Move task to new silo
-            tasks[task_id].silo_id = reassign_tasks
+            task.silo_id = reassign_tasks
             silos[reassign_tasks].add_task(task_id)
         else:
             # Remove silo association
-            tasks[task_id].silo_id = None
+            task.silo_id = None
+        tasks[task_id] = task
+        mark_tasks_changed(task_id)
+    if reassign_tasks:
+        mark_silos_changed(reassign_tasks)
     
     # Remove from parent
     if silo.parent_id and silo.parent_id in silos:
         silos[silo.parent_id].remove_child(silo_id)
+        mark_silos_changed(silo.parent_id)
     
     # Remove the silo
     del silos[silo_id]
-    save_to_file()
+    mark_silos_changed(silo_id)
+    await save_to_file()
     return {"status": "success", "message": "Silo deleted"}
 
+# Change feed
+@app.get("/api/changes")
+async def get_changes(request: Request, since: int = Query(..., ge=0)):
+    """Tasks and silos changed since a store version, and the ids of those deleted
+
+    Start from the version in an ETag or a previous response, or from 0
+    for a full resync: every task and silo, with nothing deleted. Any
+    other version older than the change log reaches (or from before a
+    restart) gets a 410, and the client should start again from 0.
+    """
+    if since == 0:
+        task_ids, silo_ids = list(tasks), list(silos)
+        deleted = {"tasks": [], "silos": []}
+    else:
+        changed = change_feed.since(since)
+        if changed is None:
+            raise HTTPException(status_code=410, detail={
+                "message": f"Version {since} is no longer in the change log; resync from version 0",
+                **change_feed.stats()
+            })
+
+        task_ids = [task_id for task_id in changed[TASK] if task_id in tasks]
+        silo_ids = [silo_id for silo_id in changed[SILO] if silo_id in silos]
+        deleted = {
+            "tasks": [task_id for task_id in changed[TASK] if task_id not in tasks],
+            "silos": [silo_id for silo_id in changed[SILO] if silo_id not in silos]
+        }
+    # Assembled from the per-entity JSON cache like the list endpoints
+    body = b"".join([
+        b'{"version":', str(change_feed.version).encode(),
+        b',"tasks":', task_json.encode_list(task_ids, tasks),
+        b',"silos":', silo_json.encode_list(silo_ids, silos),
+        b',"deleted":', json.dumps(deleted).encode(),
+        b"}"
+    ])
+    return json_response(request, body, {"ETag": change_feed.etag()})
+
 # AI-assisted features
 @app.post("/api/ai/analyze-task")
 async def analyze_task(task_id: str):
@@ -546,26 +1016,41 @@ async def analyze_task(task_id: str):
     
     # Update the task with analysis
     tasks[task_id] = analysis
-    save_to_file()
+    mark_tasks_changed(task_id)
+    await save_to_file()
     
     return analysis
 
-@app.post("/api/ai/suggest-dependencies")
-async def suggest_dependencies(task_id: str):
+@app.post("/api/ai/suggest-dependencies", dependencies=[Depends(indexes_ready)])
+async def suggest_dependencies(
+    task_id: str,
+    silo_id: Optional[str] = None,
+    limit: int = Query(RETRIEVAL_TOP_K, ge=1, le=50)
+):
     if task_id not in tasks:
         raise HTTPException(status_code=404, detail="Task not found")
         
     task = tasks[task_id]
-    all_tasks = list(tasks.values())
     
-    # Remove the task itself from the list
-    other_tasks = [t for t in all_tasks if t.id != task_id]
+    # Shortlist related tasks so the prompt does not grow with the store.
+    # Existing dependencies and tasks that already depend on this one are left out.
+    # Scoring builds BM25 models and encodes tasks, so it runs off the event loop
+    shortlist = await run_in_threadpool(
+        task_retriever.shortlist,
+        task,
+        k=limit,
+        silo_id=silo_id,
+        exclude=set(task.dependencies) | set(task.dependents)
+    )
+    # A candidate may have been deleted while the shortlist was scored
+    candidates = [tasks[t_id] for t_id, _ in shortlist if t_id in tasks]
     
     # Get suggested dependencies
-    suggestions = task_processor.suggest_dependencies(task, other_tasks)
+    suggestions = await run_in_threadpool(task_processor.suggest_dependencies, task, candidates)
     
     return {
         "task_id": task_id,
+        "candidates": len(candidates),
         "suggestions": suggestions
     }
 
@@ -583,26 +1068,47 @@ async def breakdown_task(task_id: str):
         subtask.silo_id = task.silo_id
         subtask.add_relationship(task_id, TaskRelationship.CHILD_OF)
         tasks[subtask.id] = subtask
+        mark_tasks_changed(subtask.id)
         
         # Add to silo
         if subtask.silo_id in silos:
             silos[subtask.silo_id].add_task(subtask.id)
+            mark_silos_changed(subtask.silo_id)
             
         created_subtasks.append(subtask)
     
-    save_to_file()
+    await save_to_file()
     return created_subtasks
 
-@app.post("/api/ai/suggest-next-task")
+@app.get("/api/ai/cache-stats")
+async def get_cache_stats():
+    """Hit/miss counters for the model response cache"""
+    return task_processor.cache.stats()
+
+@app.get("/api/ai/health")
+async def get_ai_health():
+    """Cached Ollama availability from the background probe"""
+    return task_processor.health()
+
+@app.get("/api/ai/scheduler-stats")
+async def get_scheduler_stats():
+    """In-flight calls, queue depths and rejections per model lane"""
+    return task_processor.scheduler.stats()
+
+@app.get("/api/ai/research-stats")
+async def get_research_stats():
+    """How often the local research classifier answered without the model"""
+    return task_processor.research_classifier.stats()
+
+@app.post("/api/ai/suggest-next-task", dependencies=[Depends(indexes_ready)])
 async def suggest_next_task():
     """Suggest the next task to work on based on priority, dependencies, and due dates"""
     if not tasks:
         raise HTTPException(status_code=404, detail="No tasks available")
     
-    all_tasks = list(tasks.values())
-    suggested_task = task_processor.suggest_next_task(all_tasks)
-    
-    return suggested_task
+    # The dependency index keeps the ready set and its priority heap current
+    next_id = dependency_index.next_task_id()
+    return tasks[next_id] if next_id else None
 
 @app.post("/api/ai/batch-create")
 async def batch_create_tasks(text: str, silo_id: Optional[str] = None):
@@ -620,30 +1126,30 @@ async def batch_create_tasks(text: str, silo_id: Optional[str] = None):
     # Save tasks
     for task in created_tasks:
         tasks[task.id] = task
+        mark_tasks_changed(task.id)
         
         # Add to silo
         if task.silo_id and task.silo_id in silos:
             silos[task.silo_id].add_task(task.id)
+            mark_silos_changed(task.silo_id)
     
-    save_to_file()
+    await save_to_file()
     return created_tasks
 
-@app.route('/api/extract', methods=['POST'])
-def handle_extract():
-    data = request.get_json()
-    processor = TaskProcessor()
-    result = processor.extract_quotes(
-        data.get('content', ''),
-        data.get('thesis', '')
-    )
-    return jsonify(result)
-
-@app.route('/api/summarize', methods=['POST'])
-def handle_summarize():
-    data = request.get_json()
-    processor = TaskProcessor()
-    result = processor.summarize_content(data.get('content', ''))
-    return jsonify(result)
+class ExtractRequest(BaseModel):
+    content: str = ""
+    thesis: str = ""
+
+class SummarizeRequest(BaseModel):
+    content: str = ""
+
+@app.post("/api/extract")
+async def handle_extract(data: ExtractRequest):
+    return await run_in_threadpool(task_processor.extract_quotes, data.content, data.thesis)
+
+@app.post("/api/summarize")
+async def handle_summarize(data: SummarizeRequest):
+    return await run_in_threadpool(task_processor.summarize_content, data.content)
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,100 @@
+"""Compare memory per task: a dict of Pydantic Task models against CompactTaskStore.
+
+Both stores are built from the same JSON records, the way a snapshot is
+loaded, and measured with tracemalloc once the intermediate data is gone.
+
+Usage: python benchmarks/bench_memory.py [--tasks 100000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from compact_store import CompactTaskStore  # noqa: E402
+from task_model import Task, TaskPriority, TaskStatus  # noqa: E402
+
+
+def make_records(count: int) -> str:
+    """JSON for ``count`` tasks with a realistic mix of optional fields."""
+    rng = random.Random(42)
+    now = datetime.now()
+    silo_ids = [str(uuid.uuid4()) for _ in range(50)]
+    tags = ["research", "writing", "review", "urgent", "home", "work", "errand", "reading"]
+    ids = [str(uuid.uuid4()) for _ in range(count)]
+    records = []
+    for i, task_id in enumerate(ids):
+        task = Task(
+            id=task_id,
+            title=f"Task {i} {rng.choice(tags)}",
+            description=rng.choice(["No description provided", f"Details for task {i}: " + "x" * rng.randint(10, 80)]),
+            status=rng.choice(list(TaskStatus)),
+            priority=rng.choice(list(TaskPriority)),
+            due_date=now + timedelta(days=rng.randint(0, 60)) if rng.random() < 0.6 else None,
+            estimated_time=timedelta(minutes=rng.randint(15, 480)) if rng.random() < 0.7 else None,
+            tags=rng.sample(tags, rng.randint(0, 3)),
+            silo_id=rng.choice(silo_ids),
+            dependencies=[rng.choice(ids) for _ in range(rng.randint(0, 2))] if i else [],
+            completion_percentage=rng.choice([0, 0, 25, 50, 100])
+        )
+        if rng.random() < 0.2:
+            task.add_note(f"Note on task {i}")
+        records.append(task.model_dump(mode="json"))
+    return json.dumps(records)
+
+
+def measure(build):
+    """(result, bytes still allocated once ``build`` returns)."""
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return result, used
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tasks", type=int, default=100000)
+    args = parser.parse_args()
+
+    payload = make_records(args.tasks)
+
+    models, model_bytes = measure(
+        lambda: {r["id"]: Task.model_validate(r) for r in json.loads(payload)}
+    )
+    ids = list(models)
+    del models
+
+    store, compact_bytes = measure(
+        lambda: CompactTaskStore({r["id"]: Task.model_validate(r) for r in json.loads(payload)})
+    )
+
+    print(f"{args.tasks} tasks")
+    print(f"  dict of Task models: {model_bytes / args.tasks:8.0f} bytes/task ({model_bytes / 2 ** 20:7.1f} MiB)")
+    print(f"  CompactTaskStore:    {compact_bytes / args.tasks:8.0f} bytes/task ({compact_bytes / 2 ** 20:7.1f} MiB)")
+    print(f"  reduction:           {model_bytes / compact_bytes:8.1f}x")
+
+    sample = random.Random(1).sample(ids, min(10000, len(ids)))
+    start = time.perf_counter()
+    for task_id in sample:
+        store[task_id]
+    read = (time.perf_counter() - start) / len(sample) * 1e6
+    start = time.perf_counter()
+    for task_id in sample:
+        store.get_field(task_id, "estimated_time")
+    field = (time.perf_counter() - start) / len(sample) * 1e6
+    print(f"  materialize one Task: {read:6.1f} µs, read one column: {field:5.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
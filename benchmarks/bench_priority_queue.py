@@ -0,0 +1,111 @@
+"""Benchmark TaskPriorityQueue against sorting every task on each call.
+
+Usage: python benchmarks/bench_priority_queue.py [--tasks 100000] [--updates 1000] [--k 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_model import Task, TaskPriority  # noqa: E402
+from task_priority import TaskPriorityQueue, priority_score  # noqa: E402
+
+
+def make_tasks(count: int, now: datetime):
+    rng = random.Random(42)
+    priorities = list(TaskPriority)
+    tasks = []
+    for i in range(count):
+        due = now + timedelta(hours=rng.randint(-48, 24 * 30)) if rng.random() < 0.7 else None
+        task = Task(
+            title=f"Task {i}",
+            description="benchmark",
+            silo_id="bench",
+            priority=rng.choice(priorities),
+            due_date=due
+        )
+        if tasks and rng.random() < 0.3:
+            task.dependencies = [rng.choice(tasks).id]
+        tasks.append(task)
+    return tasks
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:10.2f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--updates", type=int, default=1000)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args()
+
+    now = datetime.now()
+    tasks = make_tasks(args.tasks, now)
+    print(f"{args.tasks} tasks, {args.updates} updates, top {args.k}\n")
+
+    def build():
+        queue = TaskPriorityQueue(clock=lambda: now)
+        for task in tasks:
+            queue.refresh(task.id, task)
+            queue.set_eligible(task.id, True)
+        return queue
+
+    queue = timed("build queue", build)
+
+    def full_sort():
+        return sorted(tasks, key=lambda task: priority_score(task, now), reverse=True)[:args.k]
+
+    expected = timed("full sort (previous behaviour)", full_sort)
+    top = timed("queue top_k", lambda: queue.top_k(args.k))
+    assert [priority_score(t, now) for t in expected] == [queue.score(t) for t in top]
+
+    rng = random.Random(7)
+    priorities = list(TaskPriority)
+    changed = [rng.choice(tasks) for _ in range(args.updates)]
+    for task in changed:
+        task.priority = rng.choice(priorities)
+
+    def resort_after_each_update():
+        for _ in changed:
+            full_sort()
+
+    def incremental_updates():
+        for task in changed:
+            queue.refresh(task.id, task)
+            queue.top_k(args.k)
+
+    rescored_before = queue.rescored
+    if args.updates <= 50:
+        timed(f"{args.updates} updates, full sort each", resort_after_each_update)
+    else:
+        sample = max(1, args.updates // 100)
+        start = time.perf_counter()
+        for _ in range(sample):
+            full_sort()
+        per_sort = (time.perf_counter() - start) / sample
+        print(f"{f'{args.updates} updates, full sort each (est.)':<40} {per_sort * args.updates * 1000:10.2f} ms")
+    timed(f"{args.updates} updates, incremental + top_k", incremental_updates)
+    print(f"\nscores recomputed for updates: {queue.rescored - rescored_before} "
+          f"(full sorts would recompute {args.updates * args.tasks})")
+
+    # A week passes: only tasks crossing a due-date band are rescored
+    later = now + timedelta(days=7)
+    queue.clock = lambda: later
+    rescored_before = queue.rescored
+    timed("top_k after a week of rollovers", lambda: queue.top_k(args.k))
+    print(f"scores recomputed by rollovers: {queue.rescored - rescored_before}")
+    expected = sorted(tasks, key=lambda task: priority_score(task, later), reverse=True)[:args.k]
+    assert [priority_score(t, later) for t in expected] == [queue.score(t) for t in queue.top_k(args.k)]
+
+
+if __name__ == "__main__":
+    main()
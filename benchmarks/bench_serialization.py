@@ -0,0 +1,104 @@
+"""Benchmark list serialization: FastAPI's response_model path against SerializedCache.
+
+The baseline runs what FastAPI does for ``response_model=List[Task]``:
+validate every object, then encode it through ``jsonable_encoder`` and
+``json.dumps``. The cached path joins per-task bytes that are encoded
+once and reused until a task changes.
+
+Usage: python benchmarks/bench_serialization.py [--tasks 10000] [--page 10000] [--changed 100]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from serialization import SerializedCache  # noqa: E402
+from task_model import Task, TaskPriority, TaskStatus  # noqa: E402
+
+
+def make_tasks(count: int) -> List[Task]:
+    rng = random.Random(42)
+    now = datetime.now()
+    tasks = []
+    for i in range(count):
+        task = Task(
+            title=f"Task {i}",
+            description="Benchmark task with a short description of the work",
+            silo_id=f"silo-{i % 20}",
+            status=rng.choice(list(TaskStatus)),
+            priority=rng.choice(list(TaskPriority)),
+            due_date=now + timedelta(days=rng.randint(0, 60)) if rng.random() < 0.6 else None,
+            estimated_time=timedelta(minutes=rng.randint(15, 480)),
+            tags=["bench", f"tag{i % 7}"]
+        )
+        for n in range(rng.randint(0, 3)):
+            task.add_note(f"Note {n} on task {i}")
+        tasks.append(task)
+    return tasks
+
+
+def timed(fn, repeat: int) -> float:
+    """Best of ``repeat`` runs, in ms."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--page", type=int, default=10000, help="Tasks per response")
+    parser.add_argument("--changed", type=int, default=100, help="Tasks modified between requests")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    page = tasks[:args.page]
+    store = {task.id: task for task in tasks}
+    page_ids = [task.id for task in page]
+    field = create_model_field(name="Response", type_=List[Task], mode="serialization")
+    cache = SerializedCache(Task)
+
+    def fastapi_path():
+        content = asyncio.run(serialize_response(field=field, response_content=page))
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode()
+
+    def cold_cache():
+        cache.clear()
+        return cache.encode_list(page_ids, store)
+
+    def warm_with_changes():
+        changed = random.sample(page, min(args.changed, len(page)))
+        cache.invalidate(*(task.id for task in changed))
+        return cache.encode_list(page_ids, store)
+
+    assert json.loads(fastapi_path()) == json.loads(cold_cache()), "encodings differ"
+
+    baseline = timed(fastapi_path, args.repeat)
+    cold = timed(cold_cache, args.repeat)
+    cache.encode_list(page_ids, store)
+    warm = timed(lambda: cache.encode_list(page_ids, store), args.repeat)
+    churn = timed(warm_with_changes, args.repeat)
+
+    print(f"{len(page)} of {args.tasks} tasks per response ({len(cold_cache()) / 1024:.0f} KiB)")
+    print(f"  response_model (validate + encode): {baseline:8.2f} ms")
+    print(f"  SerializedCache cold:               {cold:8.2f} ms  ({baseline / cold:5.1f}x)")
+    print(f"  SerializedCache warm:               {warm:8.2f} ms  ({baseline / warm:5.1f}x)")
+    print(f"  warm, {args.changed} tasks changed:        {churn:8.2f} ms  ({baseline / churn:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Compare startup load time: the JSON snapshot against the binary, memory-mapped one.
+
+Both files hold the same tasks. The JSON path parses and validates every
+task before the store is usable; the binary path maps the file and reads
+its index, and a task is decoded when first read. Time to first read is
+the open plus one task lookup.
+
+Usage: python benchmarks/bench_snapshot.py [--tasks 10000 100000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_memory import make_records  # noqa: E402
+from snapshot import write_snapshot  # noqa: E402
+from storage import StorageEngine  # noqa: E402
+from task_model import Silo, Task  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run(count: int, directory: str):
+    records = json.loads(make_records(count))
+    silo = Silo(name="Benchmark")
+    legacy_path = os.path.join(directory, f"legacy-{count}.json")
+    snapshot_path = os.path.join(directory, f"{count}.snapshot")
+    with open(legacy_path, "w", encoding="utf-8") as f:
+        json.dump({"tasks": {r["id"]: r for r in records}, "silos": {silo.id: silo.model_dump(mode="json")}}, f)
+    write_snapshot(
+        snapshot_path,
+        ((r["id"], None, Task.model_validate(r)) for r in records),
+        [(silo.id, silo)]
+    )
+    first_id = records[count // 2]["id"]
+    log_path = os.path.join(directory, "empty.log")
+
+    legacy = StorageEngine(os.path.join(directory, "missing"), log_path, legacy_snapshot_path=legacy_path)
+    (tasks, _), legacy_ms = timed(legacy.load)
+    _, legacy_read_ms = timed(lambda: tasks[first_id])
+
+    binary = StorageEngine(snapshot_path, log_path)
+    (tasks, _), binary_ms = timed(binary.load)
+    _, binary_read_ms = timed(lambda: tasks[first_id])
+
+    print(f"{count} tasks")
+    print(f"  JSON snapshot:   {os.path.getsize(legacy_path) / 2 ** 20:6.1f} MiB, load {legacy_ms:9.1f} ms, "
+          f"first read {legacy_ms + legacy_read_ms:9.1f} ms")
+    print(f"  binary snapshot: {os.path.getsize(snapshot_path) / 2 ** 20:6.1f} MiB, load {binary_ms:9.1f} ms, "
+          f"first read {binary_ms + binary_read_ms:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        for count in args.tasks:
+            run(count, directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measure how long `import app` takes and fail if it exceeds a budget.
+
+Each run imports the app in a fresh interpreter with ``-X importtime``.
+The script prints the median wall time and the slowest top-level
+packages by cumulative import time, then exits with status 1 when the
+median is over ``--budget`` milliseconds.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--budget 1000] [--top 15]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_once() -> Tuple[float, Dict[str, int]]:
+    """Wall time in ms for one cold import, and cumulative µs per top-level package."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    elapsed = (time.perf_counter() - start) * 1000
+    if result.returncode != 0:
+        raise SystemExit(f"import app failed:\n{result.stderr[-2000:]}")
+
+    # Lines look like "import time:  self | cumulative |   name", indented two spaces
+    # per level, with each module listed after the modules it imported
+    packages: Dict[str, int] = {}
+    children: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, raw_name = line[len("import time:"):].split("|")
+        level = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        name = raw_name.strip()
+        if level == 1:
+            top = name.split(".")[0]
+            children[top] = children.get(top, 0) + int(cumulative)
+        elif level == 0:
+            if name == "app":
+                packages = dict(children, app=int(cumulative))
+            children = {}
+    return elapsed, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=1000.0, help="Maximum median wall time in ms")
+    parser.add_argument("--top", type=int, default=15, help="Packages to list")
+    args = parser.parse_args()
+
+    timings = []
+    packages: Dict[str, int] = {}
+    for _ in range(args.runs):
+        elapsed, packages = import_once()
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"import app: median {median:.0f} ms over {args.runs} runs (min {min(timings):.0f}, max {max(timings):.0f})")
+    total = packages.pop("app", 0)
+    print(f"  module imports: {total / 1000:.0f} ms")
+    for name, micros in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"  {name:<28} {micros / 1000:8.1f} ms")
+
+    if median > args.budget:
+        print(f"FAIL: {median:.0f} ms exceeds the {args.budget:.0f} ms budget")
+        sys.exit(1)
+    print(f"OK: within the {args.budget:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import time
+from collections import deque
+from typing import AbstractSet, Deque, Dict, List, Optional, Tuple
+
+# Configuration
+CHANGE_LOG_SIZE = 10000  # Changed entities remembered for /api/changes
+
+TASK, SILO = "task", "silo"
+
+
+class ChangeFeed:
+    """Store version that rises on every mutation, with a bounded log of what changed.
+
+    Each call to ``record`` is one new version. The log keeps the latest
+    ``max_entries`` (version, kind, id) entries, so a client holding a
+    version can ask what changed since then instead of re-reading
+    everything; once entries it would need have been dropped, ``since``
+    says so and the client has to start over from a full read.
+
+    The first version is taken from the clock in microseconds, so versions
+    keep rising across restarts and a version handed out by an earlier
+    process is always older than anything this one can answer for.
+    """
+
+    def __init__(self, max_entries: int = CHANGE_LOG_SIZE):
+        self._log: Deque[Tuple[int, str, str]] = deque()
+        self._max_entries = max_entries
+        self._entity_versions: Dict[Tuple[str, str], int] = {}
+        self.version = 0
+        self.reset()
+
+    def reset(self):
+        """Forget every recorded change, for when the stores are reloaded."""
+        self.version = max(self.version + 1, time.time_ns() // 1000)
+        self._start = self.version  # Version of every entity unchanged since
+        self._floor = self.version  # Changes after this version are all in the log
+        self._log.clear()
+        self._entity_versions.clear()
+
+    def record(self, kind: str, *entity_ids: str, deleted: AbstractSet[str] = frozenset()) -> int:
+        """Start a new version in which the given entities changed (``deleted`` of them removed)."""
+        if not entity_ids:
+            return self.version
+        self.version += 1
+        for entity_id in entity_ids:
+            if len(self._log) >= self._max_entries:
+                self._floor = self._log.popleft()[0]
+            self._log.append((self.version, kind, entity_id))
+            if entity_id in deleted:
+                self._entity_versions.pop((kind, entity_id), None)
+            else:
+                self._entity_versions[(kind, entity_id)] = self.version
+        return self.version
+
+    def since(self, version: int) -> Optional[Dict[str, List[str]]]:
+        """Ids of each kind changed after ``version``, or None if the log no longer covers it."""
+        if version < self._floor or version > self.version:
+            return None
+        changed: Dict[str, Dict[str, None]] = {TASK: {}, SILO: {}}
+        # Newest entries are at the right; walk back only as far as needed
+        for entry_version, kind, entity_id in reversed(self._log):
+            if entry_version <= version:
+                break
+            changed[kind][entity_id] = None
+        return {kind: list(reversed(ids)) for kind, ids in changed.items()}  # Oldest change first
+
+    def etag(self) -> str:
+        """Validator for responses built from the whole store."""
+        return f'W/"{self.version}"'
+
+    def entity_etag(self, kind: str, entity_id: str) -> str:
+        """Validator for one entity: the version it last changed in."""
+        return f'W/"{self._entity_versions.get((kind, entity_id), self._start)}"'
+
+    def stats(self) -> Dict[str, int]:
+        return {"version": self.version, "oldest_version": self._floor, "entries": len(self._log)}
@@ -0,0 +1,87 @@
+from typing import Dict, List, MutableMapping, Optional, Set, Tuple
+
+from task_model import Silo, Task, TaskRelationship
+
+
+class ChangeSet:
+    """Task and silo edits staged against the live stores and applied together.
+
+    The first read of a task stages a private copy, and later reads
+    return that same copy, so edits are made in place and each step of a
+    batch sees the steps before it. Silo membership is staged as the task
+    ids to add or remove, so a write costs the same whatever the silo's
+    size. The stores are only written by ``apply``; a change set that is
+    dropped leaves them untouched, which is what lets a batch be validated
+    in full before any of it lands.
+
+    Relationships staged here are not in the relationship index until the
+    set is applied, so the set keeps its own reverse map of them:
+    ``referencing`` answers which staged tasks point at a task in
+    O(degree) rather than by a scan over every staged task.
+    """
+
+    def __init__(self, tasks: MutableMapping[str, Task], silos: MutableMapping[str, Silo]):
+        self._task_store = tasks
+        self._silo_store = silos
+        self._tasks: Dict[str, Optional[Task]] = {}  # None marks a staged delete
+        self._memberships: Dict[str, Dict[str, bool]] = {}  # Silo id -> task id -> added (True) or removed
+        self._references: Dict[str, Set[str]] = {}  # Target id -> staged tasks given a relationship to it
+
+    def has_task(self, task_id: str) -> bool:
+        if task_id in self._tasks:
+            return self._tasks[task_id] is not None
+        return task_id in self._task_store
+
+    def task(self, task_id: str) -> Task:
+        """Staged copy of a task, raising KeyError if it does not exist."""
+        if task_id not in self._tasks:
+            # The task store hands out copies already
+            self._tasks[task_id] = self._task_store[task_id]
+        task = self._tasks[task_id]
+        if task is None:
+            raise KeyError(task_id)
+        return task
+
+    def put_task(self, task: Task):
+        self._tasks[task.id] = task
+        targets = (*task.dependencies, *task.dependents, *task.related, task.parent_id)
+        for target_id in targets:
+            if target_id is not None:
+                self._references.setdefault(target_id, set()).add(task.id)
+
+    def add_relationship(self, task_id: str, related_task_id: str, relationship: TaskRelationship):
+        """Stage ``relationship`` from one task to another (one direction only)."""
+        self.task(task_id).add_relationship(related_task_id, relationship)
+        self._references.setdefault(related_task_id, set()).add(task_id)
+
+    def referencing(self, task_id: str) -> Set[str]:
+        """Ids of staged tasks that may hold a relationship to ``task_id`` not yet indexed."""
+        return self._references.get(task_id, set())
+
+    def delete_task(self, task_id: str):
+        self._tasks[task_id] = None
+
+    def has_silo(self, silo_id: str) -> bool:
+        return silo_id in self._silo_store
+
+    def add_to_silo(self, silo_id: str, task_id: str):
+        self._memberships.setdefault(silo_id, {})[task_id] = True
+
+    def remove_from_silo(self, silo_id: str, task_id: str):
+        self._memberships.setdefault(silo_id, {})[task_id] = False
+
+    def apply(self) -> Tuple[List[str], List[str]]:
+        """Write every staged edit to the stores; returns the changed task and silo ids."""
+        for task_id, task in self._tasks.items():
+            if task is not None:
+                self._task_store[task_id] = task
+            elif task_id in self._task_store:
+                del self._task_store[task_id]
+        for silo_id, members in self._memberships.items():
+            silo = self._silo_store[silo_id]
+            for task_id, added in members.items():
+                if added:
+                    silo.add_task(task_id)
+                else:
+                    silo.remove_task(task_id)
+        return list(self._tasks), list(self._memberships)
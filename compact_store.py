@@ -0,0 +1,290 @@
+import sys
+from array import array
+from itertools import chain
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Protocol, Tuple
+
+from pydantic import ValidationError
+
+from task_model import Task, TaskPriority, TaskStatus
+
+_NONE = -(2 ** 63)   # Integer column value for None
+_OTHER = _NONE + 1   # The value did not fit the column and is kept in the overflow dict
+_NO_CODE = -1        # Code column value for a value outside the enum
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_EMPTY: Tuple = ()
+
+_CODES = {
+    "status": list(TaskStatus),
+    "priority": list(TaskPriority),
+    "ai_generated": [False, True]
+}
+_TIME_FIELDS = ("created_at", "updated_at", "due_date")   # Naive datetimes, µs since the epoch
+_DURATION_FIELDS = ("estimated_time", "actual_time")     # µs
+_ID_FIELDS = ("silo_id", "parent_id")
+_ID_LIST_FIELDS = ("tags", "dependencies", "dependents", "related")
+_TEXT_FIELDS = ("title", "description")
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _encode_time(value) -> int:
+    if value is None:
+        return _NONE
+    if type(value) is datetime and value.tzinfo is None:
+        return (value - _EPOCH) // _MICROSECOND
+    return _OTHER
+
+
+def _encode_duration(value) -> int:
+    if value is None:
+        return _NONE
+    if type(value) is timedelta:
+        return value // _MICROSECOND
+    return _OTHER
+
+
+def _encode_int(value) -> int:
+    if type(value) is int and _OTHER < value < 2 ** 63:
+        return value
+    return _OTHER if value is not None else _NONE
+
+
+def _encode_notes(notes) -> Tuple:
+    # Notes are rare; keep each as a tuple of (interned key, value) pairs
+    if not notes:
+        return _EMPTY
+    return tuple(tuple((_intern(k), v) for k, v in note.items()) for note in notes)
+
+
+class RecordSource(Protocol):
+    """Where undecoded tasks live, such as a memory-mapped snapshot."""
+
+    def raw(self, slot: int) -> bytes: ...
+
+    def load_task(self, slot: int) -> Task: ...
+
+
+class CompactTaskStore(MutableMapping):
+    """Task store holding tasks as packed columns instead of Pydantic models.
+
+    Each task is a row. Hot scalar fields live in ``array`` columns: status
+    and priority as enum codes, timestamps and durations as integer
+    microseconds and completion as an int. Text and list fields live in
+    per-field lists, with IDs and tags interned and lists stored as
+    tuples. A ``Task`` is built only when one is read, so the API
+    boundary pays for the model and the store does not.
+
+    Reads return a fresh ``Task`` every time; like ``shelve`` without
+    writeback, changes must be written back with ``store[task_id] = task``.
+    Values a column cannot represent exactly (a timezone-aware due date,
+    an unknown status) are kept as objects in an overflow dict, so a
+    round trip always returns what was stored.
+
+    A store can also be backed by a ``RecordSource`` (``attach``): those
+    tasks stay undecoded in the source and are built from it on each read
+    until they are written, which packs them into rows like any other.
+    """
+
+    def __init__(self, tasks: Optional[Mapping[str, Task]] = None):
+        self._rows: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._free: List[int] = []
+        self._codes = {name: array("b") for name in _CODES}
+        self._ints = {name: array("q") for name in _TIME_FIELDS + _DURATION_FIELDS + ("completion_percentage",)}
+        self._objects: Dict[str, List[Any]] = {
+            name: [] for name in _TEXT_FIELDS + _ID_FIELDS + _ID_LIST_FIELDS + ("notes",)
+        }
+        self._overflow: Dict[Tuple[int, str], Any] = {}
+        self._source: Optional[RecordSource] = None
+        self._pending: Dict[str, int] = {}  # Task id -> slot in the source, for tasks not yet written
+        if tasks:
+            for task_id, task in tasks.items():
+                self[task_id] = task
+
+    # Mapping interface
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._pending)
+
+    def __iter__(self) -> Iterator[str]:
+        return chain(self._pending, self._rows)
+
+    def __contains__(self, task_id) -> bool:
+        return task_id in self._rows or task_id in self._pending
+
+    def __getitem__(self, task_id: str) -> Task:
+        row = self._rows.get(task_id)
+        if row is None:
+            slot = self._pending[task_id]
+            return self._source.load_task(slot)
+        return self._load(row)
+
+    def __setitem__(self, task_id: str, task: Task):
+        self._pending.pop(task_id, None)
+        row = self._rows.get(task_id)
+        if row is None:
+            row = self._allocate(sys.intern(task_id))
+        else:
+            self._drop_overflow(row)
+        self._pack(row, task)
+
+    def __delitem__(self, task_id: str):
+        if self._pending.pop(task_id, None) is not None:
+            return
+        row = self._rows.pop(task_id)
+        self._ids[row] = None
+        for column in self._objects.values():
+            column[row] = None  # Release the row's strings and tuples
+        self._drop_overflow(row)
+        self._free.append(row)
+
+    def copy(self) -> "CompactTaskStore":
+        """Independent copy of the columns, cheap enough to take on the event loop."""
+        clone = CompactTaskStore.__new__(CompactTaskStore)
+        clone._rows = dict(self._rows)
+        clone._ids = list(self._ids)
+        clone._free = list(self._free)
+        clone._codes = {name: column[:] for name, column in self._codes.items()}
+        clone._ints = {name: column[:] for name, column in self._ints.items()}
+        clone._objects = {name: list(column) for name, column in self._objects.items()}
+        clone._overflow = dict(self._overflow)
+        clone._source = self._source
+        clone._pending = dict(self._pending)
+        return clone
+
+    def attach(self, source: RecordSource, slots: Dict[str, int]):
+        """Serve the given tasks from ``source`` until they are written."""
+        self._source = source
+        self._pending = {task_id: slot for task_id, slot in slots.items() if task_id not in self._rows}
+
+    def reattach(self, source: RecordSource, slots: Dict[str, int]):
+        """Serve the tasks still unwritten from ``source`` instead, such as a
+        rewritten snapshot holding the same records under new slots."""
+        self._pending = {task_id: slots[task_id] for task_id in self._pending}
+        self._source = source
+
+    def raw_record(self, task_id: str) -> Optional[bytes]:
+        """The source's encoded bytes for a task that has not been written since, else None."""
+        slot = self._pending.get(task_id)
+        return self._source.raw(slot) if slot is not None else None
+
+    # Column access without building a Task
+
+    def get_field(self, task_id: str, name: str) -> Any:
+        """One field of a stored task, decoded from its column."""
+        row = self._rows.get(task_id)
+        if row is None:
+            return getattr(self[task_id], name)
+        if name == "id":
+            return self._ids[row]
+        return self._decode(row, name)
+
+    # Packing
+
+    def _allocate(self, task_id: str) -> int:
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = task_id
+        else:
+            row = len(self._ids)
+            self._ids.append(task_id)
+            for column in self._codes.values():
+                column.append(_NO_CODE)
+            for column in self._ints.values():
+                column.append(_NONE)
+            for column in self._objects.values():
+                column.append(None)
+        self._rows[task_id] = row
+        return row
+
+    def _drop_overflow(self, row: int):
+        if self._overflow:
+            for name in self._codes.keys() | self._ints.keys():
+                self._overflow.pop((row, name), None)
+
+    def _pack(self, row: int, task: Task):
+        values = task.__dict__
+        for name, column in self._codes.items():
+            value = values[name]
+            try:
+                column[row] = _CODES[name].index(value)
+            except ValueError:
+                column[row] = _NO_CODE
+                self._overflow[(row, name)] = value
+        for name, column in self._ints.items():
+            value = values[name]
+            if name in _TIME_FIELDS:
+                code = _encode_time(value)
+            elif name in _DURATION_FIELDS:
+                code = _encode_duration(value)
+            else:
+                code = _encode_int(value)
+            column[row] = code
+            if code == _OTHER:
+                self._overflow[(row, name)] = value
+        objects = self._objects
+        for name in _TEXT_FIELDS:
+            objects[name][row] = values[name]
+        for name in _ID_FIELDS:
+            objects[name][row] = _intern(values[name])
+        for name in _ID_LIST_FIELDS:
+            value = values[name]
+            objects[name][row] = tuple(_intern(v) for v in value) if value else _EMPTY
+        objects["notes"][row] = _encode_notes(values["notes"])
+
+    # Unpacking
+
+    def _decode(self, row: int, name: str) -> Any:
+        if name in self._codes:
+            code = self._codes[name][row]
+            return _CODES[name][code] if code != _NO_CODE else self._overflow[(row, name)]
+        if name in self._ints:
+            value = self._ints[name][row]
+            if value == _NONE:
+                return None
+            if value == _OTHER:
+                return self._overflow[(row, name)]
+            if name in _TIME_FIELDS:
+                return _EPOCH + timedelta(microseconds=value)
+            if name in _DURATION_FIELDS:
+                return timedelta(microseconds=value)
+            return value
+        value = self._objects[name][row]
+        if name in _ID_LIST_FIELDS:
+            return list(value)
+        if name == "notes":
+            return [dict(note) for note in value]
+        return value
+
+    def _load(self, row: int) -> Task:
+        values: Dict[str, Any] = {"id": self._ids[row]}
+        for name, column in self._codes.items():
+            code = column[row]
+            values[name] = _CODES[name][code] if code != _NO_CODE else self._overflow[(row, name)]
+        for name, column in self._ints.items():
+            value = column[row]
+            if value == _NONE:
+                values[name] = None
+            elif value == _OTHER:
+                values[name] = self._overflow[(row, name)]
+            elif name in _TIME_FIELDS:
+                values[name] = _EPOCH + timedelta(microseconds=value)
+            elif name in _DURATION_FIELDS:
+                values[name] = timedelta(microseconds=value)
+            else:
+                values[name] = value
+        for name, column in self._objects.items():
+            values[name] = column[row]  # Validation turns the tuples back into lists
+        values["notes"] = [dict(note) for note in values["notes"]]
+        try:
+            # Validating already-typed values is cheaper than model_construct
+            return Task.model_validate(values)
+        except ValidationError:
+            # Overflow values the model would reject were stored that way; keep them as is
+            return Task.model_construct(**{k: list(v) if type(v) is tuple else v for k, v in values.items()})
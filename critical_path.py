@@ -0,0 +1,220 @@
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+Edge = Tuple[str, str]  # (before, after): the first node must finish before the second starts
+
+
+class DependencyCycleError(ValueError):
+    """Raised when the dependency graph is not a DAG."""
+
+    def __init__(self, cycle: List[str]):
+        super().__init__(f"Dependency cycle: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+
+def _adjacency(nodes: Sequence[str], edges: Iterable[Edge]) -> Dict[str, List[str]]:
+    successors: Dict[str, List[str]] = {node: [] for node in nodes}
+    for before, after in edges:
+        if before in successors and after in successors and before != after:
+            successors[before].append(after)
+    return successors
+
+
+def topological_order(nodes: Sequence[str], edges: Iterable[Edge]) -> Tuple[List[str], List[str]]:
+    """Kahn's algorithm: return (order, leftover) where leftover nodes sit on or behind a cycle.
+
+    Ties are broken by the order of ``nodes`` so results are deterministic.
+    """
+    successors = _adjacency(nodes, edges)
+    indegree = {node: 0 for node in nodes}
+    for targets in successors.values():
+        for target in targets:
+            indegree[target] += 1
+
+    ready = deque(node for node in nodes if indegree[node] == 0)
+    order = []
+    while ready:
+        node = ready.popleft()
+        order.append(node)
+        for target in successors[node]:
+            indegree[target] -= 1
+            if indegree[target] == 0:
+                ready.append(target)
+
+    leftover = [node for node in nodes if indegree[node] > 0]
+    return order, leftover
+
+
+def find_cycle(nodes: Sequence[str], edges: Iterable[Edge]) -> Optional[List[str]]:
+    """Return one cycle as a closed path [a, b, ..., a], or None if the graph is acyclic."""
+    successors = _adjacency(nodes, edges)
+    state = {node: 0 for node in nodes}  # 0 = unvisited, 1 = on stack, 2 = done
+    for root in nodes:
+        if state[root]:
+            continue
+        stack = [(root, iter(successors[root]))]
+        path = [root]
+        state[root] = 1
+        while stack:
+            node, targets = stack[-1]
+            advanced = False
+            for target in targets:
+                if state[target] == 1:
+                    return path[path.index(target):] + [target]
+                if state[target] == 0:
+                    state[target] = 1
+                    stack.append((target, iter(successors[target])))
+                    path.append(target)
+                    advanced = True
+                    break
+            if not advanced:
+                state[node] = 2
+                stack.pop()
+                path.pop()
+    return None
+
+
+def strongly_connected_components(nodes: Sequence[str], edges: Iterable[Edge]) -> Dict[str, int]:
+    """Tarjan's algorithm, iterative: map each node to the id of its strongly connected component.
+
+    Two nodes share a component exactly when each can reach the other, so
+    every cycle lies inside a single component.
+    """
+    successors = _adjacency(nodes, edges)
+    index: Dict[str, int] = {}
+    lowlink: Dict[str, int] = {}
+    component: Dict[str, int] = {}
+    stack: List[str] = []
+    on_stack = set()
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors[root]))]
+        while work:
+            node, targets = work[-1]
+            advanced = False
+            for target in targets:
+                if target not in index:
+                    index[target] = lowlink[target] = len(index)
+                    stack.append(target)
+                    on_stack.add(target)
+                    work.append((target, iter(successors[target])))
+                    advanced = True
+                    break
+                if target in on_stack:
+                    lowlink[node] = min(lowlink[node], index[target])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                # node is the root of a component: pop it off the stack
+                component_id = index[node]
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component[member] = component_id
+                    if member == node:
+                        break
+    return component
+
+
+def acyclic_edges(nodes: Sequence[str], edges: Iterable[Edge]) -> Tuple[List[Edge], List[Edge]]:
+    """Split proposed edges into (kept, dropped) so the kept edges form a DAG.
+
+    Only edges inside a cycle are candidates for dropping: within each
+    strongly connected component, edges pointing backward in ``nodes``
+    order are dropped and the rest kept, which breaks every cycle in
+    linear time. Edges between components, including those into nodes
+    that merely sit downstream of a cycle, are always kept.
+    """
+    known = set(nodes)
+    edges = [(a, b) for a, b in edges if a in known and b in known and a != b]
+    component = strongly_connected_components(nodes, edges)
+    position = {node: i for i, node in enumerate(nodes)}
+    kept, dropped = [], []
+    for a, b in edges:
+        if component[a] == component[b] and position[a] > position[b]:
+            dropped.append((a, b))
+        else:
+            kept.append((a, b))
+    return kept, dropped
+
+
+def compute_critical_path(
+    nodes: Sequence[str],
+    edges: Iterable[Edge],
+    durations: Dict[str, float]
+) -> Dict:
+    """Critical path method over a dependency DAG, in O(V + E).
+
+    ``durations`` maps node ids to durations in any consistent unit
+    (missing nodes count as 0). Returns the critical path, the total
+    project duration and per-node earliest/latest start and finish plus
+    slack. Raises DependencyCycleError if the edges contain a cycle.
+    """
+    edges = list(edges)
+    order, leftover = topological_order(nodes, edges)
+    if leftover:
+        raise DependencyCycleError(find_cycle(leftover, edges) or leftover)
+
+    successors = _adjacency(nodes, edges)
+    predecessors: Dict[str, List[str]] = {node: [] for node in nodes}
+    for node, targets in successors.items():
+        for target in targets:
+            predecessors[target].append(node)
+
+    # Forward pass: earliest start/finish
+    earliest_start: Dict[str, float] = {}
+    earliest_finish: Dict[str, float] = {}
+    for node in order:
+        start = max((earliest_finish[p] for p in predecessors[node]), default=0.0)
+        earliest_start[node] = start
+        earliest_finish[node] = start + durations.get(node, 0.0)
+
+    project_duration = max(earliest_finish.values(), default=0.0)
+
+    # Backward pass: latest start/finish
+    latest_start: Dict[str, float] = {}
+    latest_finish: Dict[str, float] = {}
+    for node in reversed(order):
+        finish = min((latest_start[s] for s in successors[node]), default=project_duration)
+        latest_finish[node] = finish
+        latest_start[node] = finish - durations.get(node, 0.0)
+
+    schedule = {
+        node: {
+            "earliest_start": earliest_start[node],
+            "earliest_finish": earliest_finish[node],
+            "latest_start": latest_start[node],
+            "latest_finish": latest_finish[node],
+            "slack": latest_start[node] - earliest_start[node]
+        }
+        for node in order
+    }
+
+    # Walk one zero-slack chain from the start of the project to its end
+    epsilon = 1e-9
+    critical = [n for n in order if abs(schedule[n]["slack"]) <= epsilon]
+    path = []
+    current = next((n for n in critical if earliest_start[n] <= epsilon), None)
+    while current is not None:
+        path.append(current)
+        current = next(
+            (s for s in successors[current]
+             if abs(schedule[s]["slack"]) <= epsilon
+             and abs(earliest_start[s] - earliest_finish[current]) <= epsilon),
+            None
+        )
+
+    return {
+        "critical_path": path,
+        "duration": project_duration,
+        "order": order,
+        "schedule": schedule
+    }
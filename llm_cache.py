@@ -0,0 +1,211 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", 7 * 24 * 3600))  # Seconds
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", 50000))  # On disk
+MEMORY_ENTRIES = 1024  # In-memory LRU front
+CACHEABLE_TEMPERATURE = 0.1  # Calls at or below this are cached by default
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Content address of a model request: a hash over every generate() argument."""
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent cache of model responses keyed by the full request.
+
+    Lookups go through an in-memory LRU first and fall back to a SQLite
+    table on disk. Entries older than ``ttl`` seconds are treated as
+    misses, and the disk table is trimmed to ``max_entries`` by evicting
+    the least recently used rows.
+
+    Coroutines use ``aget``/``aput``: only the in-memory LRU is touched on
+    the event loop and SQLite runs in a worker thread. Hits served from
+    memory are noted and written to the rows' access times with the next
+    disk operation, so eviction never sees a hot entry as cold.
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl: float = CACHE_TTL,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        memory_entries: int = MEMORY_ENTRIES
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._touched: Dict[str, float] = {}  # Key -> time of memory hits not yet written to disk
+        self._lock = threading.Lock()     # Memory LRU, touches and counters; never held across disk I/O
+        self._db_lock = threading.Lock()  # The SQLite connection
+        self._db = None
+        self._disk_entries = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses(accessed_at)")
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return self._db
+
+    def get(self, key: str) -> Optional[str]:
+        response = self._get_memory(key)
+        if response is None:
+            response = self._get_disk(key)
+        return response
+
+    async def aget(self, key: str) -> Optional[str]:
+        """get() for coroutines: a memory miss is looked up on disk in a worker thread."""
+        response = self._get_memory(key)
+        if response is None:
+            response = await asyncio.to_thread(self._get_disk, key)
+        return response
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+        self._put_disk(key, response, now)
+
+    async def aput(self, key: str, response: str):
+        """put() for coroutines: the disk write runs in a worker thread."""
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+        await asyncio.to_thread(self._put_disk, key, response, now)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            created_at, response = entry
+            if now - created_at <= self.ttl:
+                self._memory.move_to_end(key)
+                self._touched[key] = now
+                self.memory_hits += 1
+                return response
+            del self._memory[key]
+            return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._db_lock:
+            try:
+                db = self._connect()
+                self._write_touches(db)
+                row = db.execute(
+                    "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    response, created_at = row
+                    if now - created_at <= self.ttl:
+                        db.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+                        db.commit()
+                        with self._lock:
+                            self._remember(key, created_at, response)
+                            self.disk_hits += 1
+                        return response
+                    db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._disk_entries -= 1
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Response cache read failed: {e}")
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put_disk(self, key: str, response: str, now: float):
+        with self._db_lock:
+            try:
+                db = self._connect()
+                # Eviction below must see the access times of memory hits
+                self._write_touches(db)
+                existed = db.execute("SELECT 1 FROM responses WHERE key = ?", (key,)).fetchone()
+                db.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, response, now, now)
+                )
+                if not existed:
+                    self._disk_entries += 1
+                if self._disk_entries > self.max_entries:
+                    excess = self._disk_entries - self.max_entries
+                    db.execute(
+                        "DELETE FROM responses WHERE key IN "
+                        "(SELECT key FROM responses ORDER BY accessed_at LIMIT ?)",
+                        (excess,)
+                    )
+                    self._disk_entries -= excess
+                db.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Response cache write failed: {e}")
+
+    def _write_touches(self, db: sqlite3.Connection):
+        """Stage the access times of memory hits; committed with the caller's transaction."""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            db.executemany(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in touched.items()]
+            )
+
+    def _remember(self, key: str, created_at: float, response: str):
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": self._disk_entries
+            }
+
+
+_shared_cache: Optional[ResponseCache] = None
+
+
+def shared_cache() -> ResponseCache:
+    """The process-wide cache used by every TaskProcessor."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = ResponseCache()
+    return _shared_cache
@@ -0,0 +1,249 @@
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lanes
+INTERACTIVE = "interactive"  # A user is waiting on a single call
+BATCH = "batch"              # Task dump pipelines and other bulk work
+LANES = (INTERACTIVE, BATCH)
+
+# Configuration
+MAX_IN_FLIGHT = int(os.getenv("OLLAMA_NUM_PARALLEL", 2))  # Match the local Ollama's parallelism
+MAX_QUEUED = {
+    INTERACTIVE: int(os.getenv("MODEL_QUEUE_LIMIT_INTERACTIVE", 8)),
+    BATCH: int(os.getenv("MODEL_QUEUE_LIMIT_BATCH", 32))
+}
+QUEUE_TIMEOUT = float(os.getenv("MODEL_QUEUE_TIMEOUT", 30))  # Seconds an interactive call may wait
+
+
+class ModelBusyError(RuntimeError):
+    """Raised when a model call is rejected because the scheduler is saturated."""
+
+    def __init__(self, message: str, retry_after: int, status_code: int = 429):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+class _Waiter:
+    __slots__ = ("lane", "wake", "granted", "queued_at")
+
+    def __init__(self, lane: str, wake: Callable[[], None]):
+        self.lane = lane
+        self.wake = wake
+        self.granted = False
+        self.queued_at = time.monotonic()
+
+
+class ModelScheduler:
+    """Admission control and priority queueing for every model call.
+
+    At most ``max_in_flight`` calls run at once. When a slot frees up,
+    interactive waiters are served before batch waiters, and batch work
+    never takes the last slot, so one large task dump cannot starve a
+    user creating a task. Callers over a lane's queue limit are rejected
+    at once with a retry hint instead of piling up.
+
+    Slots can be taken from threads (``slot``) and from coroutines
+    (``aslot``); both share one lock-protected queue.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = MAX_IN_FLIGHT,
+        max_queued: Optional[Dict[str, int]] = None,
+        queue_timeout: float = QUEUE_TIMEOUT
+    ):
+        self.max_in_flight = max(1, max_in_flight)
+        # Batch work leaves one slot free for interactive calls when it can
+        self.batch_limit = max(1, self.max_in_flight - 1)
+        self.max_queued = dict(max_queued or MAX_QUEUED)
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        self._in_flight = {lane: 0 for lane in LANES}
+        self._queues: Dict[str, Deque[_Waiter]] = {lane: deque() for lane in LANES}
+        self._service_time = 5.0  # Moving average of call duration in seconds, for retry hints
+        self._stats = {
+            lane: {"started": 0, "rejected": 0, "timed_out": 0, "max_queued": 0, "wait_total": 0.0}
+            for lane in LANES
+        }
+
+    # Admission
+
+    def _can_start(self, lane: str) -> bool:
+        if sum(self._in_flight.values()) >= self.max_in_flight:
+            return False
+        return lane == INTERACTIVE or self._in_flight[BATCH] < self.batch_limit
+
+    def _first_in_line(self, lane: str) -> bool:
+        if lane == BATCH and self._queues[INTERACTIVE]:
+            return False
+        return not self._queues[lane]
+
+    def retry_after(self, lane: str) -> int:
+        """Seconds until a new call in this lane would likely be served."""
+        ahead = len(self._queues[INTERACTIVE]) + (len(self._queues[BATCH]) if lane == BATCH else 0)
+        return max(1, math.ceil(self._service_time * (ahead + 1) / self.max_in_flight))
+
+    def _reject_if_full(self, lane: str):
+        if len(self._queues[lane]) >= self.max_queued[lane]:
+            self._stats[lane]["rejected"] += 1
+            raise ModelBusyError(
+                f"Model queue is full ({lane})", self.retry_after(lane), status_code=429
+            )
+
+    def admit(self, lane: str):
+        """Fail fast with ModelBusyError when the lane's queue is already full."""
+        with self._lock:
+            self._reject_if_full(lane)
+
+    def _start(self, lane: str, waited: float = 0.0):
+        self._in_flight[lane] += 1
+        self._stats[lane]["started"] += 1
+        self._stats[lane]["wait_total"] += waited
+
+    def _enqueue(self, waiter: _Waiter):
+        queue = self._queues[waiter.lane]
+        queue.append(waiter)
+        stats = self._stats[waiter.lane]
+        stats["max_queued"] = max(stats["max_queued"], len(queue))
+
+    def _dispatch(self):
+        """Hand free slots to waiters, interactive first. Call with the lock held."""
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue and self._can_start(lane):
+                waiter = queue.popleft()
+                waiter.granted = True
+                self._start(lane, time.monotonic() - waiter.queued_at)
+                waiter.wake()
+
+    def release(self, lane: str, duration: Optional[float] = None):
+        with self._lock:
+            self._in_flight[lane] -= 1
+            if duration is not None:
+                self._service_time = 0.8 * self._service_time + 0.2 * duration
+            self._dispatch()
+
+    # Thread callers
+
+    def acquire(self, lane: str = INTERACTIVE, timeout: Optional[float] = None):
+        """Wait for a slot from a thread; raises ModelBusyError when full or after ``timeout``."""
+        timeout = self.queue_timeout if timeout is None else timeout
+        with self._lock:
+            if self._can_start(lane) and self._first_in_line(lane):
+                self._start(lane)
+                return
+            self._reject_if_full(lane)
+            if _on_event_loop():
+                # Blocking here would stall the coroutines holding the slots
+                self._stats[lane]["rejected"] += 1
+                raise ModelBusyError("Model is busy", self.retry_after(lane), status_code=503)
+            event = threading.Event()
+            waiter = _Waiter(lane, event.set)
+            self._enqueue(waiter)
+
+        if event.wait(timeout):
+            return
+        with self._lock:
+            if waiter.granted:
+                return  # Granted just as the wait timed out
+            self._queues[lane].remove(waiter)
+            self._stats[lane]["timed_out"] += 1
+            retry_after = self.retry_after(lane)
+        raise ModelBusyError("Timed out waiting for the model", retry_after, status_code=503)
+
+    @contextmanager
+    def slot(self, lane: str = INTERACTIVE, timeout: Optional[float] = None):
+        self.acquire(lane, timeout)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(lane, time.monotonic() - start)
+
+    # Coroutine callers
+
+    async def aacquire(self, lane: str = BATCH):
+        """Wait for a slot from a coroutine. Admission is checked up front with ``admit``."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def wake():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        with self._lock:
+            if self._can_start(lane) and self._first_in_line(lane):
+                self._start(lane)
+                return
+            waiter = _Waiter(lane, wake)
+            self._enqueue(waiter)
+
+        try:
+            await future
+        except BaseException:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._queues[lane].remove(waiter)
+            if granted:
+                self.release(lane)
+            raise
+
+    @asynccontextmanager
+    async def aslot(self, lane: str = BATCH):
+        await self.aacquire(lane)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.release(lane, time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lanes = {}
+            for lane in LANES:
+                stats = self._stats[lane]
+                lanes[lane] = {
+                    "in_flight": self._in_flight[lane],
+                    "queued": len(self._queues[lane]),
+                    "max_queued": stats["max_queued"],
+                    "queue_limit": self.max_queued[lane],
+                    "started": stats["started"],
+                    "rejected": stats["rejected"],
+                    "timed_out": stats["timed_out"],
+                    "avg_wait_ms": round(stats["wait_total"] / stats["started"] * 1000, 1) if stats["started"] else 0.0
+                }
+            return {
+                "max_in_flight": self.max_in_flight,
+                "batch_limit": self.batch_limit,
+                "avg_call_seconds": round(self._service_time, 2),
+                "lanes": lanes
+            }
+
+
+def _on_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+_shared_scheduler: Optional[ModelScheduler] = None
+
+
+def shared_scheduler() -> ModelScheduler:
+    """The process-wide scheduler used by every TaskProcessor."""
+    global _shared_scheduler
+    if _shared_scheduler is None:
+        _shared_scheduler = ModelScheduler()
+    return _shared_scheduler
@@ -0,0 +1,232 @@
+"""Local classifier deciding whether a task needs external research resources.
+
+Trained on the yes/no answers the model gave for ``_requires_research``,
+which are appended to a JSONL decision log. Retrain from the log with:
+
+    python research_classifier.py train [--log research_decisions.jsonl] [--model research_classifier.joblib]
+    python research_classifier.py stats [--log research_decisions.jsonl]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+DECISION_LOG = os.getenv("RESEARCH_DECISION_LOG", "research_decisions.jsonl")
+MODEL_PATH = os.getenv("RESEARCH_CLASSIFIER_PATH", "research_classifier.joblib")
+CONFIDENCE = float(os.getenv("RESEARCH_CLASSIFIER_CONFIDENCE", 0.85))  # Below this, ask the model
+MIN_EXAMPLES = 20  # Per class, before a classifier is trained
+RELOAD_INTERVAL = 30.0  # Seconds between checks for a retrained model file
+
+
+def read_decisions(log_path: str = DECISION_LOG) -> List[Tuple[str, bool]]:
+    """(task text, needs research) pairs from the decision log; the latest answer per text wins."""
+    decisions: Dict[str, bool] = {}
+    try:
+        with open(log_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    decisions[record["text"]] = bool(record["label"])
+                except (ValueError, KeyError, TypeError):
+                    continue  # Skip torn or malformed lines
+    except FileNotFoundError:
+        return []
+    return list(decisions.items())
+
+
+def train(log_path: str = DECISION_LOG, model_path: str = MODEL_PATH) -> Dict[str, Any]:
+    """Fit TF-IDF + logistic regression on the decision log and save it."""
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import cross_val_score
+    from sklearn.pipeline import make_pipeline
+
+    decisions = read_decisions(log_path)
+    texts = [text for text, _ in decisions]
+    labels = [label for _, label in decisions]
+    positives = sum(labels)
+    negatives = len(labels) - positives
+    if min(positives, negatives) < MIN_EXAMPLES:
+        raise ValueError(
+            f"Need at least {MIN_EXAMPLES} logged decisions of each kind, "
+            f"have {positives} yes and {negatives} no"
+        )
+
+    def pipeline():
+        return make_pipeline(
+            TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=1),
+            LogisticRegression(C=10.0, class_weight="balanced", max_iter=1000)
+        )
+
+    folds = min(5, positives, negatives)
+    accuracy = cross_val_score(pipeline(), texts, labels, cv=folds).mean()
+    model = pipeline().fit(texts, labels)
+    joblib.dump(model, model_path)
+    return {
+        "examples": len(labels),
+        "yes": positives,
+        "no": negatives,
+        "cv_accuracy": round(float(accuracy), 3),
+        "model_path": model_path
+    }
+
+
+class _LinearScorer:
+    """Scores text with a fitted TF-IDF + logistic regression pipeline without sklearn's per-call overhead.
+
+    The vectorizer's analyzer, IDF weights and the regression coefficients
+    are copied into plain dicts, so one prediction is a few dict lookups.
+    """
+
+    def __init__(self, pipeline):
+        vectorizer, regression = pipeline[0], pipeline[-1]
+        self.analyzer = vectorizer.build_analyzer()
+        self.sublinear_tf = vectorizer.sublinear_tf
+        idf = vectorizer.idf_
+        coef = regression.coef_[0]
+        self.weights = {term: (idf[col], coef[col]) for term, col in vectorizer.vocabulary_.items()}
+        self.intercept = float(regression.intercept_[0])
+        # coef_ points towards classes_[1]
+        self.positive_is_true = bool(regression.classes_[1])
+
+    def probability_true(self, text: str) -> float:
+        counts: Dict[str, int] = {}
+        for term in self.analyzer(text):
+            if term in self.weights:
+                counts[term] = counts.get(term, 0) + 1
+        dot = norm = 0.0
+        for term, count in counts.items():
+            idf, coef = self.weights[term]
+            value = (1 + math.log(count) if self.sublinear_tf else count) * idf
+            dot += value * coef
+            norm += value * value
+        z = self.intercept + (dot / math.sqrt(norm) if norm else 0.0)
+        z = max(-50.0, min(50.0, z))
+        probability = 1 / (1 + math.exp(-z))
+        return probability if self.positive_is_true else 1 - probability
+
+
+class ResearchClassifier:
+    """Answers ``_requires_research`` locally when confident, and logs model answers for training.
+
+    ``predict`` returns None when no trained model exists or its probability
+    is below ``confidence``; the caller then asks the model and passes the
+    answer to ``record`` (``arecord`` on the event loop). A retrained
+    model file is picked up without a restart.
+    """
+
+    def __init__(
+        self,
+        model_path: str = MODEL_PATH,
+        log_path: str = DECISION_LOG,
+        confidence: float = CONFIDENCE
+    ):
+        self.model_path = model_path
+        self.log_path = log_path
+        self.confidence = confidence
+        self._model = None
+        self._model_mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+        self.local_decisions = 0
+        self.model_fallbacks = 0
+
+    def _current_model(self):
+        now = time.monotonic()
+        if now - self._checked_at < RELOAD_INTERVAL:
+            return self._model
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.model_path)
+        except OSError:
+            return self._model
+        if mtime != self._model_mtime:
+            try:
+                import joblib
+                self._model = _LinearScorer(joblib.load(self.model_path))
+                self._model_mtime = mtime
+                logger.info(f"Loaded research classifier from {self.model_path}")
+            except Exception as e:
+                logger.error(f"Could not load research classifier: {e}")
+                self._model_mtime = mtime  # Do not retry a broken file until it changes
+        return self._model
+
+    def predict(self, task_text: str) -> Optional[bool]:
+        """True/False when confident, otherwise None (and counted as a fallback)."""
+        model = self._current_model()
+        if model is not None:
+            try:
+                yes = model.probability_true(task_text)
+                if yes >= self.confidence or yes <= 1 - self.confidence:
+                    self.local_decisions += 1
+                    return bool(yes >= self.confidence)
+            except Exception as e:
+                logger.error(f"Research classifier failed: {e}")
+        self.model_fallbacks += 1
+        return None
+
+    def record(self, task_text: str, needs_research: bool):
+        """Append a model decision to the training log."""
+        line = json.dumps({"text": task_text, "label": needs_research, "at": time.time()})
+        with self._lock:
+            try:
+                with open(self.log_path, "a", encoding="utf-8") as f:
+                    f.write(line + "\n")
+            except OSError as e:
+                logger.error(f"Could not log research decision: {e}")
+
+    async def arecord(self, task_text: str, needs_research: bool):
+        """record() for coroutines: the file append runs in a worker thread."""
+        await asyncio.to_thread(self.record, task_text, needs_research)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.local_decisions + self.model_fallbacks
+        return {
+            "trained": self._model is not None,
+            "local_decisions": self.local_decisions,
+            "model_fallbacks": self.model_fallbacks,
+            "fallback_rate": round(self.model_fallbacks / total, 3) if total else 0.0
+        }
+
+
+_shared_classifier: Optional[ResearchClassifier] = None
+
+
+def shared_classifier() -> ResearchClassifier:
+    """The process-wide classifier used by every TaskProcessor."""
+    global _shared_classifier
+    if _shared_classifier is None:
+        _shared_classifier = ResearchClassifier()
+    return _shared_classifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train or inspect the local research classifier")
+    parser.add_argument("command", choices=["train", "stats"])
+    parser.add_argument("--log", default=DECISION_LOG, help="JSONL decision log")
+    parser.add_argument("--model", default=MODEL_PATH, help="Where to write the trained model")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        decisions = read_decisions(args.log)
+        positives = sum(label for _, label in decisions)
+        print(json.dumps({"examples": len(decisions), "yes": positives, "no": len(decisions) - positives}))
+        return
+
+    try:
+        print(json.dumps(train(args.log, args.model)))
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+if __name__ == "__main__":
+    main()
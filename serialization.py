@@ -0,0 +1,79 @@
+import gzip
+from typing import Dict, Generic, Iterable, Mapping, Optional, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+from starlette.requests import Request
+from starlette.responses import Response
+
+# Configuration
+GZIP_MIN_BYTES = 16 * 1024  # Smaller bodies are sent uncompressed
+GZIP_LEVEL = 5  # Close to the best ratio at a fraction of level 9's cost
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class SerializedCache(Generic[M]):
+    """JSON bytes for each stored entity, encoded once and reused until it changes.
+
+    Listing endpoints join the cached bytes of a page instead of running
+    FastAPI's validate-then-encode over every object on every request.
+    Entries are keyed by id and dropped through ``invalidate`` from the
+    same hooks that keep the other indexes current, so a mutation costs
+    one re-encode on the next read.
+    """
+
+    def __init__(self, model: Type[M]):
+        self._adapter = TypeAdapter(model)
+        self._bytes: Dict[str, bytes] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, *entity_ids: str):
+        for entity_id in entity_ids:
+            self._bytes.pop(entity_id, None)
+
+    def clear(self):
+        self._bytes.clear()
+
+    def encode(self, entity_id: str, store: Mapping[str, M]) -> bytes:
+        """Bytes for one entity, read from ``store`` only on a miss."""
+        data = self._bytes.get(entity_id)
+        if data is None:
+            data = self._bytes[entity_id] = self._adapter.dump_json(store[entity_id])
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data
+
+    def encode_list(self, entity_ids: Iterable[str], store: Mapping[str, M]) -> bytes:
+        return b"[" + b",".join(self.encode(entity_id, store) for entity_id in entity_ids) + b"]"
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._bytes), "hits": self.hits, "misses": self.misses}
+
+
+def json_response(
+    request: Request,
+    body: bytes,
+    headers: Optional[Dict[str, str]] = None
+) -> Response:
+    """Send pre-encoded JSON, gzipped when the body is large and the client accepts it."""
+    headers = dict(headers or {})
+    if len(body) >= GZIP_MIN_BYTES:
+        headers["Vary"] = "Accept-Encoding"
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """A 304 response when the request's If-None-Match already names ``etag``, else None."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+import os
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from task_model import Silo, Task
+
+if TYPE_CHECKING:
+    import numpy as np  # Imported on first encode to keep startup fast
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+EMBEDDING_MODEL = os.getenv("SILO_EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+MATCH_THRESHOLD = float(os.getenv("SILO_MATCH_THRESHOLD", 0.35))  # Minimum cosine similarity to trust
+MATCH_MARGIN = float(os.getenv("SILO_MATCH_MARGIN", 0.05))  # Minimum lead over the runner-up
+MEMBER_TITLES = 20  # Task titles included in each silo's document
+
+Encoder = Callable[[List[str]], "np.ndarray"]
+
+
+_encoders: Dict[str, Optional[Encoder]] = {}
+
+
+def shared_encoder(model_name: str = EMBEDDING_MODEL) -> Optional[Encoder]:
+    """Process-wide sentence-transformers encoder, loaded on first use (None if unavailable)."""
+    if model_name not in _encoders:
+        try:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(model_name)
+            _encoders[model_name] = lambda texts: model.encode(
+                texts, normalize_embeddings=True, convert_to_numpy=True
+            )
+        except Exception as e:
+            logger.error(f"Could not load embedding model {model_name}: {e}")
+            _encoders[model_name] = None
+    return _encoders[model_name]
+
+
+def task_query(task: Task) -> str:
+    """Text used to match a task against silo documents."""
+    parts = [task.title]
+    if task.description and task.description != "No description provided":
+        parts.append(task.description)
+    if task.tags:
+        parts.append(", ".join(task.tags))
+    return "\n".join(parts)
+
+
+class SiloEmbeddingIndex:
+    """Vector index over silos for suggesting where a task belongs.
+
+    Each silo is embedded from its name, description and the titles of
+    its first few tasks. Changes only mark a silo stale; stale silos are
+    re-encoded in one batch on the next query, so bursts of task creation
+    cost a single encode. The sentence-transformers model is loaded on
+    first use, and if it cannot be loaded the index reports no matches
+    and callers fall back to the model prompt.
+
+    ``arank`` is the form for the event loop: loading the model and
+    encoding run in a worker thread, while the index state they read and
+    write is only touched on the loop.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, encoder: Optional[Encoder] = None):
+        self.model_name = model_name
+        self._encoder = encoder
+        self._silos: Dict[str, Tuple[str, str]] = {}         # silo id -> (name, description)
+        self._titles: Dict[str, Dict[str, str]] = {}         # silo id -> task id -> title, in insertion order
+        self._task_keys: Dict[str, Tuple[str, str]] = {}     # task id -> (silo id, title)
+        self._stale = set()
+        self._documents: Dict[str, str] = {}                 # Text each row was encoded from
+        self._row: Dict[str, int] = {}
+        self._ids: List[str] = []
+        self._matrix: Optional["np.ndarray"] = None
+        self._lock = asyncio.Lock()  # One arank at a time, so each sees the rows the last one stored
+
+    def rebuild(self, silos: Dict[str, Silo], tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch (encoding waits for the first query)."""
+        self.__init__(self.model_name, self._encoder)
+        for silo_id, silo in silos.items():
+            self.refresh_silo(silo_id, silo)
+        for task_id, task in tasks.items():
+            self.refresh_task(task_id, task)
+
+    def refresh_silo(self, silo_id: str, silo: Optional[Silo]):
+        if silo is None:
+            self._silos.pop(silo_id, None)
+        else:
+            self._silos[silo_id] = (silo.name, silo.description)
+        self._stale.add(silo_id)
+
+    def refresh_task(self, task_id: str, task: Optional[Task]):
+        old_key = self._task_keys.get(task_id)
+        new_key = (task.silo_id, task.title) if task is not None else None
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._titles.get(old_key[0], {}).pop(task_id, None)
+            self._stale.add(old_key[0])
+            del self._task_keys[task_id]
+        if new_key is not None:
+            self._titles.setdefault(new_key[0], {})[task_id] = new_key[1]
+            self._stale.add(new_key[0])
+            self._task_keys[task_id] = new_key
+
+    def _document(self, silo_id: str) -> str:
+        name, description = self._silos[silo_id]
+        titles = list(self._titles.get(silo_id, {}).values())[:MEMBER_TITLES]
+        parts = [name]
+        if description:
+            parts.append(description)
+        if titles:
+            parts.append("Tasks: " + "; ".join(titles))
+        return "\n".join(parts)
+
+    def _encode(self, texts: List[str]) -> Optional["np.ndarray"]:
+        import numpy as np
+        encoder = self._encoder or shared_encoder(self.model_name)
+        if encoder is None:
+            return None
+        return np.asarray(encoder(texts), dtype=np.float32)
+
+    def _collect(self) -> Dict[str, str]:
+        """Drop deleted silos and take the documents of stale silos that changed."""
+        removed = [s for s in self._stale if s not in self._silos and s in self._row]
+        for silo_id in removed:
+            self._remove_row(silo_id)
+
+        changed = {}
+        for silo_id in self._stale:
+            if silo_id in self._silos:
+                document = self._document(silo_id)
+                if self._documents.get(silo_id) != document:
+                    changed[silo_id] = document
+        self._stale.clear()
+        return changed
+
+    def _store(self, changed: Dict[str, str], vectors: "np.ndarray"):
+        for (silo_id, document), vector in zip(changed.items(), vectors):
+            self._set_row(silo_id, vector)
+            self._documents[silo_id] = document
+
+    def _sync(self) -> bool:
+        """Re-encode stale silos; False if no encoder is available."""
+        changed = self._collect()
+        if changed:
+            vectors = self._encode(list(changed.values()))
+            if vectors is None:
+                self._stale.update(changed)  # Try again on the next query
+                return False
+            self._store(changed, vectors)
+        return self._matrix is not None or not self._silos
+
+    def _set_row(self, silo_id: str, vector: "np.ndarray"):
+        import numpy as np
+        if self._matrix is None:
+            self._matrix = np.empty((0, vector.shape[0]), dtype=np.float32)
+        if silo_id in self._row:
+            self._matrix[self._row[silo_id]] = vector
+        else:
+            self._row[silo_id] = len(self._ids)
+            self._ids.append(silo_id)
+            self._matrix = np.vstack([self._matrix, vector[None, :]])
+
+    def _remove_row(self, silo_id: str):
+        # Move the last row into the freed slot
+        row = self._row.pop(silo_id)
+        last_id = self._ids.pop()
+        if last_id != silo_id:
+            self._matrix[row] = self._matrix[len(self._ids)]
+            self._ids[row] = last_id
+            self._row[last_id] = row
+        self._matrix = self._matrix[:len(self._ids)]
+        self._documents.pop(silo_id, None)
+
+    def rank(self, text: str, silo_ids: Optional[Iterable[str]] = None, k: int = 3) -> List[Tuple[str, float]]:
+        """Up to k (silo id, cosine similarity) pairs, best first; empty if the index is unavailable."""
+        if not self._sync() or not self._ids:
+            return []
+        query = self._encode([text])
+        if query is None:
+            return []
+        return self._score(query[0], silo_ids, k)
+
+    async def arank(self, text: str, silo_ids: Optional[Iterable[str]] = None, k: int = 3) -> List[Tuple[str, float]]:
+        """rank() without blocking the event loop: stale silos and the query are encoded in one worker-thread batch."""
+        async with self._lock:
+            if not self._silos and not self._ids:
+                return []
+            changed = self._collect()
+            vectors = await asyncio.to_thread(self._encode, list(changed.values()) + [text])
+            if vectors is None:
+                self._stale.update(changed)
+                return []
+            # Silos changed during the encode were marked stale again and are redone next time
+            self._store(changed, vectors[:-1])
+            if not self._ids:
+                return []
+            return self._score(vectors[-1], silo_ids, k)
+
+    def _score(self, query: "np.ndarray", silo_ids: Optional[Iterable[str]], k: int) -> List[Tuple[str, float]]:
+        scores = self._matrix @ query
+        if silo_ids is not None:
+            rows = [self._row[s] for s in silo_ids if s in self._row]
+        else:
+            rows = range(len(self._ids))
+        ranked = sorted(rows, key=lambda row: scores[row], reverse=True)[:k]
+        return [(self._ids[row], float(scores[row])) for row in ranked]
+
+
+def confident_match(ranked: Sequence[Tuple[str, float]]) -> Optional[str]:
+    """The top silo if it clears the threshold and leads the runner-up by the margin."""
+    if not ranked:
+        return None
+    best_id, best_score = ranked[0]
+    runner_up = ranked[1][1] if len(ranked) > 1 else -1.0
+    if best_score >= MATCH_THRESHOLD and best_score - runner_up >= MATCH_MARGIN:
+        return best_id
+    return None
@@ -0,0 +1,232 @@
+import logging
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+
+from task_model import Silo, Task
+
+logger = logging.getLogger(__name__)
+
+Contribution = Tuple[str, float, int]  # (status, estimated seconds, completion percentage)
+
+
+class Rollup:
+    """Aggregates over a set of tasks that can be updated by adding or removing one task."""
+    __slots__ = ("task_count", "by_status", "estimated_seconds", "completion_total")
+
+    def __init__(self):
+        self.task_count = 0
+        self.by_status: Dict[str, int] = {}
+        self.estimated_seconds = 0.0
+        self.completion_total = 0
+
+    def add(self, contribution: Contribution, sign: int = 1):
+        status, seconds, completion = contribution
+        self.task_count += sign
+        self.by_status[status] = self.by_status.get(status, 0) + sign
+        if not self.by_status[status]:
+            del self.by_status[status]
+        self.estimated_seconds += sign * seconds
+        self.completion_total += sign * completion
+
+    def merge(self, other: "Rollup", sign: int = 1):
+        self.task_count += sign * other.task_count
+        for status, count in other.by_status.items():
+            self.by_status[status] = self.by_status.get(status, 0) + sign * count
+            if not self.by_status[status]:
+                del self.by_status[status]
+        self.estimated_seconds += sign * other.estimated_seconds
+        self.completion_total += sign * other.completion_total
+
+    def copy(self) -> "Rollup":
+        rollup = Rollup()
+        rollup.merge(self)
+        return rollup
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "task_count": self.task_count,
+            "by_status": dict(self.by_status),
+            "estimated_hours": round(self.estimated_seconds / 3600, 4),
+            "average_completion": round(self.completion_total / self.task_count, 2) if self.task_count else 0.0
+        }
+
+
+def _contribution(task: Task) -> Contribution:
+    seconds = task.estimated_time.total_seconds() if task.estimated_time else 0.0
+    return (task.status.value, seconds, task.completion_percentage or 0)
+
+
+class SiloHierarchy:
+    """Materialized silo tree with ancestor paths and per-subtree task rollups.
+
+    Every silo stores its root-first ancestor path, plus the same ids as a
+    frozenset so "is ancestor" is a single set lookup. Reparenting a silo
+    rewrites the paths below it and moves its subtree rollup from the old
+    ancestors to the new ones. A task change applies the difference in its
+    contribution to its silo and that silo's ancestors, so a rollup update
+    costs O(depth).
+
+    ``parent_id`` is the source of truth. A silo whose parent is unknown,
+    or whose parent would close a cycle, sits at the root until the data
+    makes sense again.
+    """
+
+    def __init__(self):
+        self._parent: Dict[str, Optional[str]] = {}       # Effective parent of each known silo
+        self._declared_parent: Dict[str, Optional[str]] = {}  # parent_id as stored on each known silo
+        self._declared: Dict[str, Dict[str, None]] = {}   # parent_id -> child ids, including unknown parents
+        self._path: Dict[str, Tuple[str, ...]] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        self._own: Dict[Optional[str], Rollup] = {}      # Tasks directly in a silo, known or not
+        self._subtree: Dict[str, Rollup] = {}
+        self._task_keys: Dict[str, Tuple[Optional[str], Contribution]] = {}
+
+    def rebuild(self, silos: Dict[str, Silo], tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch."""
+        self.__init__()
+        for silo_id, silo in silos.items():
+            self.refresh_silo(silo_id, silo)
+        for task_id, task in tasks.items():
+            self.refresh_task(task_id, task)
+
+    # Structure
+
+    def refresh_silo(self, silo_id: str, silo: Optional[Silo]):
+        """Bring the tree in line with a silo's current parent (None if deleted)."""
+        if silo is None:
+            self._remove_silo(silo_id)
+            return
+
+        declared = silo.parent_id
+        if silo_id not in self._parent:
+            self._add_silo(silo_id, declared)
+            return
+
+        old_declared = self._declared_parent[silo_id]
+        if old_declared == declared:
+            return
+        self._detach(silo_id)
+        self._declared[old_declared].pop(silo_id, None)
+        self._declared.setdefault(declared, {})[silo_id] = None
+        self._declared_parent[silo_id] = declared
+        self._parent[silo_id] = self._effective_parent(silo_id, declared)
+        self._attach(silo_id)
+
+    def _effective_parent(self, silo_id: str, declared: Optional[str]) -> Optional[str]:
+        if declared is None or declared not in self._parent:
+            return None
+        if declared == silo_id or silo_id in self._ancestors[declared]:
+            logger.warning(f"Ignoring parent {declared} of silo {silo_id}: it would create a cycle")
+            return None
+        return declared
+
+    def _add_silo(self, silo_id: str, declared: Optional[str]):
+        self._declared.setdefault(declared, {})[silo_id] = None
+        self._declared_parent[silo_id] = declared
+        parent = self._effective_parent(silo_id, declared)
+        self._parent[silo_id] = parent
+        path = self._path[parent] + (parent,) if parent is not None else ()
+
+        # Adopt silos that were waiting at the root for this parent to appear
+        subtree = self._own.get(silo_id, Rollup()).copy()
+        for child_id in self._declared.get(silo_id, ()):
+            if child_id in self._parent and self._parent[child_id] is None and child_id not in path and child_id != silo_id:
+                self._parent[child_id] = silo_id
+                subtree.merge(self._subtree[child_id])
+        self._subtree[silo_id] = subtree
+        self._attach(silo_id)
+
+    def _remove_silo(self, silo_id: str):
+        if silo_id not in self._parent:
+            return
+        self._detach(silo_id)
+        self._declared[self._declared_parent[silo_id]].pop(silo_id, None)
+        orphans = self._effective_children(silo_id)
+        for store in (self._parent, self._declared_parent, self._path, self._ancestors, self._subtree):
+            del store[silo_id]
+        # Children still pointing at the deleted silo become roots
+        for child_id in orphans:
+            self._parent[child_id] = None
+            self._attach(child_id)
+
+    def _effective_children(self, silo_id: str) -> List[str]:
+        return [
+            child_id for child_id in self._declared.get(silo_id, ())
+            if self._parent.get(child_id) == silo_id
+        ]
+
+    def _detach(self, silo_id: str):
+        for ancestor_id in self._path[silo_id]:
+            self._subtree[ancestor_id].merge(self._subtree[silo_id], -1)
+
+    def _attach(self, silo_id: str):
+        parent = self._parent[silo_id]
+        self._path[silo_id] = self._path[parent] + (parent,) if parent is not None else ()
+        self._ancestors[silo_id] = frozenset(self._path[silo_id])
+        # Rewrite the paths of everything below
+        stack = [silo_id]
+        while stack:
+            current = stack.pop()
+            for child_id in self._effective_children(current):
+                self._path[child_id] = self._path[current] + (current,)
+                self._ancestors[child_id] = frozenset(self._path[child_id])
+                stack.append(child_id)
+        for ancestor_id in self._path[silo_id]:
+            self._subtree[ancestor_id].merge(self._subtree[silo_id])
+
+    # Rollups
+
+    def refresh_task(self, task_id: str, task: Optional[Task]):
+        """Apply the change in a task's contribution to its silo and that silo's ancestors."""
+        old_key = self._task_keys.get(task_id)
+        new_key = (task.silo_id, _contribution(task)) if task is not None else None
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._apply(old_key, -1)
+            del self._task_keys[task_id]
+        if new_key is not None:
+            self._apply(new_key, 1)
+            self._task_keys[task_id] = new_key
+
+    def _apply(self, key: Tuple[Optional[str], Contribution], sign: int):
+        silo_id, contribution = key
+        self._own.setdefault(silo_id, Rollup()).add(contribution, sign)
+        if silo_id in self._parent:
+            self._subtree[silo_id].add(contribution, sign)
+            for ancestor_id in self._path[silo_id]:
+                self._subtree[ancestor_id].add(contribution, sign)
+
+    # Queries
+
+    def __contains__(self, silo_id: str) -> bool:
+        return silo_id in self._parent
+
+    def is_ancestor(self, ancestor_id: str, silo_id: str) -> bool:
+        """Whether ``ancestor_id`` is a strict ancestor of ``silo_id``, in O(1)."""
+        return ancestor_id in self._ancestors.get(silo_id, ())
+
+    def path(self, silo_id: str) -> List[str]:
+        """Ancestor ids from the root down to the silo's parent."""
+        return list(self._path.get(silo_id, ()))
+
+    def rollup(self, silo_id: str) -> Dict[str, Any]:
+        """Task rollup over the silo and all of its descendants."""
+        return self._subtree[silo_id].to_dict()
+
+    def own_rollup(self, silo_id: str) -> Dict[str, Any]:
+        """Task rollup over the tasks directly in the silo."""
+        return self._own.get(silo_id, Rollup()).to_dict()
+
+    def subtree(self, silo_id: str, max_depth: Optional[int] = None) -> Dict[str, Any]:
+        """Nested ``{"id", "rollup", "children"}`` tree rooted at a silo."""
+        root = {"id": silo_id, "rollup": self.rollup(silo_id), "children": []}
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for child_id in self._effective_children(node["id"]):
+                child = {"id": child_id, "rollup": self.rollup(child_id), "children": []}
+                node["children"].append(child)
+                stack.append((child, depth + 1))
+        return root
@@ -0,0 +1,136 @@
+"""Binary snapshot file holding every task and silo, read lazily through mmap.
+
+Layout (little-endian):
+
+    header   magic b"DUNOTE\\x00\\x00", u16 version, u16 reserved,
+             u64 task count, u64 silo count, u64 index offset
+    records  for each entity: u32 length, then its JSON
+    index    u8 kind per entity (0 task, 1 silo), u64 record offset per
+             entity, u32 record length per entity, then the ids as one
+             UTF-8 blob separated by newlines
+
+The index is a handful of flat arrays, so opening a snapshot costs a few
+bulk copies no matter how large the records are, and a record is only
+decoded when something reads it.
+"""
+import mmap
+import os
+import struct
+from array import array
+from typing import Dict, Iterable, Optional, Tuple
+
+from pydantic import BaseModel
+
+from task_model import Silo, Task
+
+MAGIC = b"DUNOTE\x00\x00"
+VERSION = 1
+_HEADER = struct.Struct("<8sHHQQQ")
+_LENGTH = struct.Struct("<I")
+
+TASK, SILO = 0, 1
+
+
+class SnapshotFormatError(ValueError):
+    """Raised when a file is not a snapshot this version can read."""
+
+
+def write_snapshot(
+    path: str,
+    tasks: Iterable[Tuple[str, Optional[bytes], Optional[BaseModel]]],
+    silos: Iterable[Tuple[str, Silo]]
+):
+    """Write a snapshot to ``path``.
+
+    ``tasks`` yields (id, raw JSON or None, model or None): records still
+    undecoded from the previous snapshot are copied through as bytes.
+    """
+    kinds = array("B")
+    offsets = array("Q")
+    lengths = array("I")
+    ids = []
+    with open(path, "wb") as f:
+        f.write(b"\x00" * _HEADER.size)
+        offset = _HEADER.size
+
+        def add(kind: int, entity_id: str, data: bytes):
+            nonlocal offset
+            f.write(_LENGTH.pack(len(data)))
+            f.write(data)
+            kinds.append(kind)
+            offsets.append(offset + _LENGTH.size)
+            lengths.append(len(data))
+            ids.append(entity_id)
+            offset += _LENGTH.size + len(data)
+
+        task_count = 0
+        for task_id, raw, task in tasks:
+            add(TASK, task_id, raw if raw is not None else task.model_dump_json().encode())
+            task_count += 1
+        silo_count = 0
+        for silo_id, silo in silos:
+            add(SILO, silo_id, silo.model_dump_json().encode())
+            silo_count += 1
+
+        index_offset = offset
+        f.write(kinds.tobytes())
+        f.write(offsets.tobytes())
+        f.write(lengths.tobytes())
+        f.write("\n".join(ids).encode())
+
+        f.seek(0)
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, task_count, silo_count, index_offset))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class SnapshotReader:
+    """Memory-mapped snapshot; opening it reads only the header and index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size:
+            raise SnapshotFormatError(f"{path} is too short to be a snapshot")
+        magic, version, _, task_count, silo_count, index_offset = _HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise SnapshotFormatError(f"{path} is not a snapshot")
+        if version != VERSION:
+            raise SnapshotFormatError(f"{path} has snapshot version {version}, expected {VERSION}")
+
+        self.task_count = task_count
+        count = task_count + silo_count
+        position = index_offset
+        self.kinds = array("B", self._map[position:position + count])
+        position += count
+        self.offsets = array("Q")
+        self.offsets.frombytes(self._map[position:position + 8 * count])
+        position += 8 * count
+        self.lengths = array("I")
+        self.lengths.frombytes(self._map[position:position + 4 * count])
+        position += 4 * count
+        self.ids = self._map[position:].decode().split("\n") if count else []
+        if len(self.ids) != count:
+            raise SnapshotFormatError(f"{path} has a damaged index")
+
+    def close(self):
+        """Release the mapping; the file can then be replaced on every platform."""
+        self._map.close()
+
+    def task_slots(self) -> Dict[str, int]:
+        """Id to index slot for every task (tasks are written before silos)."""
+        return dict(zip(self.ids[:self.task_count], range(self.task_count)))
+
+    def raw(self, slot: int) -> bytes:
+        offset = self.offsets[slot]
+        return self._map[offset:offset + self.lengths[slot]]
+
+    def load_task(self, slot: int) -> Task:
+        return Task.model_validate_json(self.raw(slot))
+
+    def load_silos(self) -> Dict[str, Silo]:
+        return {
+            entity_id: Silo.model_validate_json(self.raw(slot))
+            for slot, entity_id in enumerate(self.ids[self.task_count:], self.task_count)
+        }
@@ -0,0 +1,309 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Optional, Tuple
+
+from task_model import Task, Silo
+from compact_store import CompactTaskStore
+from snapshot import SnapshotFormatError, SnapshotReader, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SNAPSHOT_PATH = "data.snapshot"
+LEGACY_SNAPSHOT_PATH = "data.json"  # JSON snapshots written by earlier versions
+LOG_PATH = "data.log"
+COMPACT_EVERY = 5000  # Log records written before the snapshot is rewritten
+
+# "request": a write endpoint responds only after its change is fsync'd
+# "group": changes are fsync'd in the background with the next batch
+DURABILITY = os.getenv("STORAGE_DURABILITY", "group")
+FLUSH_INTERVAL = float(os.getenv("STORAGE_FLUSH_INTERVAL", "0.05"))  # Seconds to collect a batch
+
+
+def put_record(kind: str, entity) -> Dict:
+    """Build a log record that stores the full current state of a task or silo."""
+    return {
+        "op": "put",
+        "kind": kind,
+        "id": entity.id,
+        "data": entity.model_dump(mode="json")
+    }
+
+
+def delete_record(kind: str, entity_id: str) -> Dict:
+    """Build a log record that removes a task or silo."""
+    return {"op": "delete", "kind": kind, "id": entity_id}
+
+
+class StorageEngine:
+    """Snapshot plus append-only mutation log for the task and silo stores.
+
+    Every change is appended to the log as a single JSON line holding the
+    full state of the entity that changed, so the cost of a write depends on
+    the size of the change and not on the size of the store. Once the log
+    grows past ``compact_every`` records the whole store is written to a new
+    snapshot and the log starts over.
+
+    Records are idempotent (a put replaces the entity, a delete removes it),
+    so replaying a log over a snapshot that already contains some of its
+    records still produces the latest state.
+
+    Snapshots use the binary format in ``snapshot``: loading maps the file
+    and reads its index, and each task is decoded when first read. A JSON
+    snapshot from an earlier version is still loaded (in full) and is
+    replaced by a binary one at the next compaction.
+
+    The loaded store keeps reading from the snapshot's mapping, so a
+    compaction is two steps: ``write_compacted`` writes the new snapshot
+    to a temporary file (slow, fine on a worker thread), then
+    ``install_snapshot`` closes the old mapping, moves the new file into
+    place and points the store's unread tasks at it. Windows refuses to
+    replace a mapped file, and the store must never see a closed mapping,
+    so the second step runs on the thread that reads the store.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = SNAPSHOT_PATH,
+        log_path: str = LOG_PATH,
+        compact_every: int = COMPACT_EVERY,
+        legacy_snapshot_path: str = LEGACY_SNAPSHOT_PATH
+    ):
+        self.snapshot_path = snapshot_path
+        self.legacy_snapshot_path = legacy_snapshot_path
+        self.log_path = log_path
+        self.compact_every = compact_every
+        self.log_records = 0
+        self._reader: Optional[SnapshotReader] = None  # Mapping the loaded store reads from
+
+    def load(self) -> Tuple[CompactTaskStore, Dict[str, Silo]]:
+        """Open the snapshot and replay the log tail on top of it."""
+        tasks = CompactTaskStore()
+        silos: Dict[str, Silo] = {}
+        migrate = False
+
+        if os.path.exists(self.snapshot_path):
+            try:
+                reader = SnapshotReader(self.snapshot_path)
+            except SnapshotFormatError as e:
+                raise RuntimeError(f"Cannot load {self.snapshot_path}: {e}") from e
+            if self._reader is not None:
+                self._reader.close()  # The store loaded before is being replaced
+            self._reader = reader
+            tasks.attach(reader, reader.task_slots())
+            silos = reader.load_silos()
+        elif os.path.exists(self.legacy_snapshot_path):
+            with open(self.legacy_snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for k, v in data.get("tasks", {}).items():
+                tasks[k] = Task.model_validate(v)
+            silos = {k: Silo.model_validate(v) for k, v in data.get("silos", {}).items()}
+            migrate = True
+
+        self.log_records = self._replay_log(tasks, silos)
+        if migrate:
+            # Rewrite as a binary snapshot at the next flush
+            self.log_records = max(self.log_records, self.compact_every)
+        return tasks, silos
+
+    def _replay_log(self, tasks: CompactTaskStore, silos: Dict[str, Silo]) -> int:
+        """Apply every complete log record to the loaded stores."""
+        if not os.path.exists(self.log_path):
+            return 0
+
+        applied = 0
+        valid_end = 0
+        with open(self.log_path, "rb") as f:
+            for line in f:
+                # A torn final line means the process died mid-append;
+                # everything before it is intact. A record is only complete
+                # with its newline: without it the next append would land
+                # on the same line and corrupt both.
+                try:
+                    record = json.loads(line) if line.endswith(b"\n") else None
+                except json.JSONDecodeError:
+                    record = None
+                if record is None:
+                    logger.warning(f"Ignoring incomplete record at offset {valid_end} of {self.log_path}")
+                    break
+                self._apply(record, tasks, silos)
+                applied += 1
+                valid_end += len(line)
+
+        # Drop the torn tail so the next append starts on a clean line
+        if valid_end < os.path.getsize(self.log_path):
+            with open(self.log_path, "r+b") as f:
+                f.truncate(valid_end)
+
+        return applied
+
+    @staticmethod
+    def _apply(record: Dict, tasks: CompactTaskStore, silos: Dict[str, Silo]):
+        store, model = (tasks, Task) if record["kind"] == "task" else (silos, Silo)
+        if record["op"] == "put":
+            store[record["id"]] = model.model_validate(record["data"])
+        elif record["op"] == "delete":
+            store.pop(record["id"], None)
+
+    def append(self, records: List[Dict], fsync: bool = False):
+        """Append a batch of records to the mutation log."""
+        if not records:
+            return
+        payload = "".join(json.dumps(record, default=str) + "\n" for record in records)
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(payload)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        self.log_records += len(records)
+
+    def needs_compaction(self) -> bool:
+        return self.log_records >= self.compact_every
+
+    def compact(self, tasks: CompactTaskStore, silos: Dict[str, Silo]):
+        """Write a fresh snapshot of the full store and empty the log."""
+        self.install_snapshot(self.write_compacted(tasks, silos), tasks)
+
+    def write_compacted(self, tasks: CompactTaskStore, silos: Dict[str, Silo]) -> str:
+        """Write a snapshot of the given stores to a temporary file and return its path."""
+        def task_records():
+            for task_id in tasks:
+                # Tasks untouched since the last snapshot are copied without decoding
+                raw = tasks.raw_record(task_id)
+                yield task_id, raw, tasks[task_id] if raw is None else None
+
+        tmp_path = self.snapshot_path + ".tmp"
+        write_snapshot(tmp_path, task_records(), silos.items())
+        return tmp_path
+
+    def install_snapshot(self, tmp_path: str, tasks: CompactTaskStore):
+        """Replace the snapshot with one from ``write_compacted`` and empty the log.
+
+        ``tasks`` is the live store; its unread tasks are served from the
+        new file afterwards.
+        """
+        if self._reader is not None:
+            self._reader.close()
+        try:
+            os.replace(tmp_path, self.snapshot_path)
+        finally:
+            # The new snapshot, or the old one again if it could not be replaced
+            self._reader = None
+            if os.path.exists(self.snapshot_path):
+                self._reader = SnapshotReader(self.snapshot_path)
+                tasks.reattach(self._reader, self._reader.task_slots())
+
+        # The snapshot now covers every logged record
+        with open(self.log_path, "w", encoding="utf-8"):
+            pass
+        self.log_records = 0
+
+
+class PersistenceWorker:
+    """Background task that batches store changes and writes them off the event loop.
+
+    Handlers call ``commit()`` after mutating the store. The worker waits
+    ``flush_interval`` seconds to collect changes from concurrent requests,
+    builds their log records on the event loop (so each record is a
+    consistent view of its entity) and then appends and fsyncs the whole
+    batch from a worker thread. Compaction writes the new snapshot on a
+    worker thread too, from copies of the stores taken on the event loop,
+    and installs it back on the loop.
+
+    With ``durability="request"`` ``commit()`` returns once the batch holding
+    the caller's change is on disk; with ``"group"`` it returns immediately.
+    """
+
+    def __init__(
+        self,
+        engine: StorageEngine,
+        collect_records: Callable[[], List[Dict]],
+        get_stores: Callable[[], Tuple[CompactTaskStore, Dict[str, Silo]]],
+        durability: str = DURABILITY,
+        flush_interval: float = FLUSH_INTERVAL
+    ):
+        if durability not in ("request", "group"):
+            raise ValueError(f"Unknown durability mode: {durability}")
+        self.engine = engine
+        self.collect_records = collect_records
+        self.get_stores = get_stores
+        self.durability = durability
+        self.flush_interval = flush_interval
+        self._pending = None
+        self._waiters: List[asyncio.Future] = []
+        self._unwritten: List[Dict] = []
+        self._stopping = False
+        self._task = None
+
+    def start(self):
+        self._pending = asyncio.Event()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the worker after writing any outstanding changes."""
+        if self._task:
+            self._stopping = True
+            self._pending.set()
+            await self._task
+            self._task = None
+        await self._flush()
+
+    async def commit(self):
+        """Schedule the collected changes to be written."""
+        if self._task is None:
+            # Not running inside the server (scripts, tests): write inline
+            await self._flush()
+            return
+
+        if self.durability == "request":
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self._pending.set()
+            await waiter
+        else:
+            self._pending.set()
+
+    async def _run(self):
+        while not self._stopping:
+            await self._pending.wait()
+            if not self._stopping:
+                # Give concurrent requests a moment to join this batch
+                await asyncio.sleep(self.flush_interval)
+            self._pending.clear()
+            try:
+                await self._flush()
+            except Exception as e:
+                logger.error(f"Persisting changes failed: {e}")
+
+    async def _flush(self):
+        waiters, self._waiters = self._waiters, []
+        records = self._unwritten + self.collect_records()
+        self._unwritten = []
+        try:
+            await asyncio.to_thread(self.engine.append, records, True)
+        except Exception as e:
+            # Keep the records so the next batch retries them
+            self._unwritten = records
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            raise
+
+        # The records are durable now, whatever happens to compaction
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+        if self.engine.needs_compaction():
+            tasks, silos = self.get_stores()
+            # Handlers keep mutating the live silos while the snapshot is written
+            silos = {silo_id: silo.model_copy(deep=True) for silo_id, silo in silos.items()}
+            try:
+                tmp_path = await asyncio.to_thread(self.engine.write_compacted, tasks.copy(), silos)
+                self.engine.install_snapshot(tmp_path, tasks)
+            except Exception as e:
+                # The log still holds every record; compaction is retried after the next append
+                logger.error(f"Compacting {self.engine.snapshot_path} failed: {e}")
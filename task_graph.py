@@ -0,0 +1,179 @@
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from task_model import Task, TaskRelationship, TaskStatus
+from task_priority import TaskPriorityQueue
+
+CLOSED_STATUSES = (TaskStatus.COMPLETED, TaskStatus.ARCHIVED)
+
+
+class DependencyIndex:
+    """Maintained dependency graph for choosing the next task to work on.
+
+    Keeps each task's dependencies, the reverse edge map and a count of
+    unmet dependencies (dependencies that exist and are not completed, the
+    same rule ``TaskProcessor.suggest_next_task`` applies). A status change
+    only touches the dependents of the task that changed, and tasks with no
+    unmet dependencies are marked eligible in a ``TaskPriorityQueue``, so
+    the next task is a heap peek.
+    """
+
+    def __init__(self):
+        self._status: Dict[str, TaskStatus] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        self._dependents: Dict[str, Set[str]] = {}  # Includes ids of tasks that do not exist (yet)
+        self._unmet: Dict[str, int] = {}
+        self.ready: Set[str] = set()
+        self.queue = TaskPriorityQueue()
+
+    def rebuild(self, tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch."""
+        self.__init__()
+        for task_id, task in tasks.items():
+            self.refresh(task_id, task)
+
+    def _blocking(self, task_id: str) -> bool:
+        status = self._status.get(task_id)
+        return status is not None and status != TaskStatus.COMPLETED
+
+    def refresh(self, task_id: str, task: Optional[Task]):
+        """Bring the index in line with a task's current state (None if deleted)."""
+        was_blocking = self._blocking(task_id)
+        if task is None:
+            self._status.pop(task_id, None)
+        else:
+            self._status[task_id] = task.status
+
+        # Tasks waiting on this one gain or lose an unmet dependency
+        is_blocking = self._blocking(task_id)
+        if was_blocking != is_blocking:
+            delta = 1 if is_blocking else -1
+            for dependent_id in self._dependents.get(task_id, ()):
+                if dependent_id in self._unmet and dependent_id in self._status:
+                    self._unmet[dependent_id] += delta
+                    self._update_ready(dependent_id)
+
+        old_deps = self._deps.get(task_id, ())
+        new_deps = tuple(dict.fromkeys(task.dependencies)) if task is not None else ()
+        if new_deps != old_deps:
+            for dep_id in old_deps:
+                dependents = self._dependents.get(dep_id)
+                if dependents is not None:
+                    dependents.discard(task_id)
+                    if not dependents:
+                        del self._dependents[dep_id]
+            for dep_id in new_deps:
+                self._dependents.setdefault(dep_id, set()).add(task_id)
+
+        if task is None:
+            self._deps.pop(task_id, None)
+            self._unmet.pop(task_id, None)
+            self.ready.discard(task_id)
+            self.queue.remove(task_id)
+            return
+
+        self._deps[task_id] = new_deps
+        self._unmet[task_id] = sum(1 for dep_id in new_deps if self._blocking(dep_id))
+        self.queue.refresh(task_id, task)
+        self._update_ready(task_id)
+
+    def _update_ready(self, task_id: str):
+        is_ready = self._status[task_id] not in CLOSED_STATUSES and self._unmet[task_id] == 0
+        if is_ready:
+            self.ready.add(task_id)
+        else:
+            self.ready.discard(task_id)
+        self.queue.set_eligible(task_id, is_ready)
+
+    def unmet_dependencies(self, task_id: str) -> int:
+        return self._unmet.get(task_id, 0)
+
+    def next_task_id(self) -> Optional[str]:
+        """Highest-scoring ready task, ties broken by store order."""
+        return self.queue.peek()
+
+    def top_ready(self, k: int) -> List[str]:
+        """The k highest-scoring ready tasks, best first."""
+        return self.queue.top_k(k)
+
+
+Relationship = Tuple[TaskRelationship, str]  # (type, other task id)
+
+
+def _task_relationships(task: Task) -> FrozenSet[Relationship]:
+    edges = set()
+    for dep_id in task.dependencies:
+        edges.add((TaskRelationship.DEPENDS_ON, dep_id))
+    for dependent_id in task.dependents:
+        edges.add((TaskRelationship.BLOCKS, dependent_id))
+    for related_id in task.related:
+        edges.add((TaskRelationship.RELATED_TO, related_id))
+    if task.parent_id:
+        edges.add((TaskRelationship.CHILD_OF, task.parent_id))
+    return frozenset(edges)
+
+
+class RelationshipStore:
+    """Forward and reverse adjacency over every task-to-task relationship.
+
+    Edges are read from each task's ``dependencies``, ``dependents``,
+    ``related`` and ``parent_id`` fields. The reverse map answers "which
+    tasks point at this one" in O(degree), which is what deletes and
+    graph queries need, instead of a scan over the whole store.
+    """
+
+    def __init__(self):
+        self._outgoing: Dict[str, FrozenSet[Relationship]] = {}
+        self._incoming: Dict[str, Set[Relationship]] = {}  # Includes ids of tasks that do not exist (yet)
+
+    def rebuild(self, tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch."""
+        self.__init__()
+        for task_id, task in tasks.items():
+            self.refresh(task_id, task)
+
+    def refresh(self, task_id: str, task: Optional[Task]):
+        """Bring the adjacency in line with a task's current state (None if deleted)."""
+        old_edges = self._outgoing.get(task_id, frozenset())
+        new_edges = _task_relationships(task) if task is not None else frozenset()
+        if old_edges == new_edges:
+            return
+
+        for rel_type, other_id in old_edges - new_edges:
+            incoming = self._incoming.get(other_id)
+            if incoming is not None:
+                incoming.discard((rel_type, task_id))
+                if not incoming:
+                    del self._incoming[other_id]
+        for rel_type, other_id in new_edges - old_edges:
+            self._incoming.setdefault(other_id, set()).add((rel_type, task_id))
+
+        if new_edges:
+            self._outgoing[task_id] = new_edges
+        else:
+            self._outgoing.pop(task_id, None)
+
+    def outgoing(self, task_id: str) -> FrozenSet[Relationship]:
+        return self._outgoing.get(task_id, frozenset())
+
+    def incoming(self, task_id: str) -> Set[Relationship]:
+        return self._incoming.get(task_id, set())
+
+    def referencing(self, task_id: str) -> Set[str]:
+        """Ids of the other tasks that hold a relationship to this one."""
+        return {source_id for _, source_id in self.incoming(task_id) if source_id != task_id}
+
+    def children(self, task_id: str) -> List[str]:
+        return sorted(
+            source_id for rel_type, source_id in self.incoming(task_id)
+            if rel_type == TaskRelationship.CHILD_OF
+        )
+
+    def describe(self, task_id: str) -> Dict[str, Dict[str, List[str]]]:
+        """Relationships of a task grouped by direction and type."""
+        result: Dict[str, Dict[str, List[str]]] = {"outgoing": {}, "incoming": {}}
+        for direction, edges in (("outgoing", self.outgoing(task_id)), ("incoming", self.incoming(task_id))):
+            for rel_type, other_id in edges:
+                result[direction].setdefault(rel_type.value, []).append(other_id)
+            for ids in result[direction].values():
+                ids.sort()
+        return result
@@ -0,0 +1,169 @@
+import math
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from task_model import Task
+
+
+def _due_key(task: Task) -> Optional[float]:
+    return task.due_date.timestamp() if task.due_date else None
+
+
+class TaskIndex:
+    """Secondary indexes over the task store for filtered, paginated listing.
+
+    Every task gets a sequence number in store insertion order, and each
+    index is a sorted list of sequence numbers, so listing order matches
+    iterating the ``tasks`` dict. A query walks the smallest matching list
+    and checks the remaining filters against the stored keys, which makes a
+    page cost proportional to its size rather than to the whole store. Due
+    dates are kept sorted, so a due range is found by binary search and,
+    when it is the narrowest filter, its tasks drive the query.
+
+    Cursors are the sequence number of the last task on a page; the next
+    page starts with a binary search instead of rescanning from offset 0.
+    """
+
+    def __init__(self):
+        self._seq: Dict[str, int] = {}       # task id -> sequence number
+        self._ids: Dict[int, str] = {}       # sequence number -> task id
+        self._keys: Dict[str, Tuple] = {}    # task id -> (silo_id, status, priority, due)
+        self._next_seq = 0
+        self._all: List[int] = []
+        self._by_silo: Dict[str, List[int]] = {}
+        self._by_status: Dict[str, List[int]] = {}
+        self._by_priority: Dict[str, List[int]] = {}
+        self._by_due: List[Tuple[float, int]] = []
+
+    def rebuild(self, tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch."""
+        self.__init__()
+        for task_id, task in tasks.items():
+            self.refresh(task_id, task)
+
+    def refresh(self, task_id: str, task: Optional[Task]):
+        """Bring the indexes in line with a task's current state (None if deleted)."""
+        old_keys = self._keys.get(task_id)
+        new_keys = None
+        if task is not None:
+            new_keys = (task.silo_id, task.status.value, task.priority.value, _due_key(task))
+        if old_keys == new_keys:
+            return
+
+        if old_keys is not None:
+            seq = self._seq[task_id]
+            self._unlink(seq, old_keys)
+            if new_keys is None:
+                _remove(self._all, seq)
+                del self._seq[task_id], self._ids[seq], self._keys[task_id]
+                return
+        else:
+            seq = self._next_seq
+            self._next_seq += 1
+            self._seq[task_id] = seq
+            self._ids[seq] = task_id
+            self._all.append(seq)
+
+        self._keys[task_id] = new_keys
+        silo_id, status, priority, due = new_keys
+        insort(self._by_silo.setdefault(silo_id, []), seq)
+        insort(self._by_status.setdefault(status, []), seq)
+        insort(self._by_priority.setdefault(priority, []), seq)
+        if due is not None:
+            insort(self._by_due, (due, seq))
+
+    def _unlink(self, seq: int, keys: Tuple):
+        silo_id, status, priority, due = keys
+        _remove(self._by_silo[silo_id], seq)
+        _remove(self._by_status[status], seq)
+        _remove(self._by_priority[priority], seq)
+        if due is not None:
+            _remove(self._by_due, (due, seq))
+
+    def ids_for_silo(self, silo_id: str) -> List[str]:
+        return [self._ids[seq] for seq in self._by_silo.get(silo_id, [])]
+
+    def query(
+        self,
+        silo_id: Optional[str] = None,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        due_after: Optional[datetime] = None,
+        due_before: Optional[datetime] = None,
+        skip: int = 0,
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[str], Optional[str]]:
+        """Return one page of matching task ids and the cursor for the next page.
+
+        Raises ValueError for a malformed cursor.
+        """
+        candidates = [self._all]
+        if silo_id:
+            candidates.append(self._by_silo.get(silo_id, []))
+        if status:
+            candidates.append(self._by_status.get(status, []))
+        if priority:
+            candidates.append(self._by_priority.get(priority, []))
+        driver = min(candidates, key=len)
+
+        lo = due_after.timestamp() if due_after else None
+        hi = due_before.timestamp() if due_before else None
+        ranged = lo is not None or hi is not None
+        if ranged:
+            first = bisect_left(self._by_due, (lo,)) if lo is not None else 0
+            last = bisect_right(self._by_due, (hi, math.inf)) if hi is not None else len(self._by_due)
+            if last - first < len(driver):
+                # Fewer tasks fall in the due range than match any other filter
+                driver = sorted(seq for _, seq in self._by_due[first:last])
+
+        start = 0
+        if cursor is not None:
+            start = bisect_right(driver, int(cursor))
+
+        filters = len(candidates) - 1 + ranged
+        # The driver alone is the result set when it is the only filter
+        needs_check = filters > 1 or (filters == 1 and driver is self._all)
+
+        # One task past the page tells whether another page follows
+        if not needs_check:
+            # The driver list is exactly the result set: jump straight to the page
+            page = driver[start + skip:start + skip + limit + 1]
+        else:
+            page = []
+            to_skip = skip
+            for seq in _iter_from(driver, start):
+                silo, stat, prio, due = self._keys[self._ids[seq]]
+                if silo_id and silo != silo_id:
+                    continue
+                if status and stat != status:
+                    continue
+                if priority and prio != priority:
+                    continue
+                if lo is not None and (due is None or due < lo):
+                    continue
+                if hi is not None and (due is None or due > hi):
+                    continue
+                if to_skip:
+                    to_skip -= 1
+                    continue
+                page.append(seq)
+                if len(page) > limit:
+                    break
+
+        has_more = len(page) > limit
+        page = page[:limit]
+        next_cursor = str(page[-1]) if has_more and page else None
+        return [self._ids[seq] for seq in page], next_cursor
+
+
+def _remove(sorted_list: List, item):
+    i = bisect_left(sorted_list, item)
+    if i < len(sorted_list) and sorted_list[i] == item:
+        del sorted_list[i]
+
+
+def _iter_from(sorted_list: List[int], start: int) -> Iterable[int]:
+    for i in range(start, len(sorted_list)):
+        yield sorted_list[i]
@@ -1,5 +1,7 @@
-from typing import List, Dict, Optional, Union
-from pydantic import BaseModel, Field
+from collections.abc import MutableSet
+from typing import Any, Iterable, Iterator, List, Dict, Optional, Union
+from pydantic import BaseModel, Field, GetCoreSchemaHandler
+from pydantic_core import core_schema
 from datetime import datetime, timedelta
 from enum import Enum
 import uuid
@@ -20,6 +22,52 @@ class TaskPriority(Enum):
     URGENT = "urgent"
 
 
+class OrderedIdSet(MutableSet):
+    """Insertion-ordered set of ids that validates from and serializes to a JSON list.
+
+    Membership checks, adds and removes are O(1), while the API and the
+    stored data keep seeing a plain list of ids.
+    """
+
+    def __init__(self, ids: Iterable[str] = ()):
+        self._ids: Dict[str, None] = dict.fromkeys(ids)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, item: str):
+        self._ids[item] = None
+
+    def discard(self, item: str):
+        self._ids.pop(item, None)
+
+    def __repr__(self) -> str:
+        return f"OrderedIdSet({list(self._ids)!r})"
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: GetCoreSchemaHandler):
+        from_list = core_schema.no_info_after_validator_function(
+            cls, core_schema.list_schema(core_schema.str_schema())
+        )
+        return core_schema.json_or_python_schema(
+            json_schema=from_list,
+            python_schema=core_schema.union_schema([
+                # Copy existing sets so models never share one
+                core_schema.no_info_after_validator_function(cls, core_schema.is_instance_schema(cls)),
+                from_list
+            ]),
+            serialization=core_schema.plain_serializer_function_ser_schema(
+                list, return_schema=core_schema.list_schema(core_schema.str_schema())
+            )
+        )
+
+
 class Task(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     title: str
@@ -27,6 +75,7 @@ class Task(BaseModel):
     status: TaskStatus = TaskStatus.NOT_STARTED
     priority: TaskPriority = TaskPriority.MEDIUM
     created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = None
     due_date: Optional[datetime] = None
     estimated_time: Optional[timedelta] = None
     actual_time: Optional[timedelta] = None
@@ -35,6 +84,7 @@ class Task(BaseModel):
     silo_id: str
     dependencies: List[str] = []  # IDs of tasks this task depends on
     dependents: List[str] = []    # IDs of tasks that depend on this task
+    related: List[str] = []       # IDs of loosely related tasks
     ai_generated: bool = False
     completion_percentage: int = 0
     notes: List[Dict[str, Union[str, datetime]]] = []
@@ -55,6 +105,26 @@ class Task(BaseModel):
         if task_id in self.dependents:
             self.dependents.remove(task_id)
     
+    def add_relationship(self, task_id: str, relationship: "TaskRelationship"):
+        if relationship == TaskRelationship.DEPENDS_ON:
+            self.add_dependency(task_id)
+        elif relationship == TaskRelationship.BLOCKS:
+            self.add_dependent(task_id)
+        elif relationship == TaskRelationship.RELATED_TO:
+            if task_id not in self.related:
+                self.related.append(task_id)
+        elif relationship == TaskRelationship.CHILD_OF:
+            self.parent_id = task_id
+    
+    def remove_relationship(self, task_id: str):
+        """Drop every relationship this task has to another task"""
+        self.remove_dependency(task_id)
+        self.remove_dependent(task_id)
+        if task_id in self.related:
+            self.related.remove(task_id)
+        if self.parent_id == task_id:
+            self.parent_id = None
+    
     def add_note(self, content: str):
         self.notes.append({
             "content": content,
@@ -67,30 +137,36 @@ class Silo(BaseModel):
     name: str
     description: str = ""
     created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: Optional[datetime] = None
     color: str = "#4f46e5"  # Default indigo color
-    tasks: List[str] = []  # List of task IDs
+    tasks: OrderedIdSet = Field(default_factory=OrderedIdSet)  # Task IDs, in insertion order
     parent_id: Optional[str] = None
-    children: List[str] = []  # List of child silo IDs
+    children: OrderedIdSet = Field(default_factory=OrderedIdSet)  # Child silo IDs, in insertion order
     icon: Optional[str] = None
     
     def add_task(self, task_id: str):
-        if task_id not in self.tasks:
-            self.tasks.append(task_id)
+        self.tasks.add(task_id)
             
     def remove_task(self, task_id: str):
-        if task_id in self.tasks:
-            self.tasks.remove(task_id)
+        self.tasks.discard(task_id)
     
     def add_child(self, silo_id: str):
-        if silo_id not in self.children:
-            self.children.append(silo_id)
+        self.children.add(silo_id)
             
     def remove_child(self, silo_id: str):
-        if silo_id in self.children:
-            self.children.remove(silo_id)
+        self.children.discard(silo_id)
 
 
 class TaskRelationship(str, Enum):
     DEPENDS_ON = "depends_on"
     BLOCKS = "blocks"
-    RELATED_TO = "related_to"
\ No newline at end of file
+    RELATED_TO = "related_to"
+    CHILD_OF = "child_of"
+
+
+# The relationship recorded on the other task when one is created
+INVERSE_RELATIONSHIPS = {
+    TaskRelationship.DEPENDS_ON: TaskRelationship.BLOCKS,
+    TaskRelationship.BLOCKS: TaskRelationship.DEPENDS_ON,
+    TaskRelationship.RELATED_TO: TaskRelationship.RELATED_TO
+}
\ No newline at end of file
@@ -0,0 +1,209 @@
+import heapq
+import math
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from task_model import Task, TaskPriority
+
+PRIORITY_SCORES = {
+    TaskPriority.LOW: 1,
+    TaskPriority.MEDIUM: 2,
+    TaskPriority.HIGH: 3,
+    TaskPriority.URGENT: 4
+}
+
+_DAY = 24 * 60 * 60
+
+
+def base_score(task: Task) -> int:
+    """Score from priority and dependencies, which does not change with time."""
+    score = PRIORITY_SCORES.get(task.priority, 2) * 10
+
+    # Tasks with no dependencies should be prioritized
+    if not task.dependencies:
+        score += 15
+
+    # Tasks that are blocking many others should be prioritized
+    score += len(task.dependents) * 5
+    return score
+
+
+def _due_timestamp(task: Task) -> Optional[float]:
+    # Epoch seconds, so naive (local) and timezone-aware due dates compare
+    return task.due_date.timestamp() if task.due_date else None
+
+
+def due_date_score(task: Task, now: datetime) -> int:
+    """Urgency bonus from how close the task is to its due date."""
+    due = _due_timestamp(task)
+    return _band_score(due, now.timestamp()) if due is not None else 0
+
+
+def _band_score(due: float, now: float) -> int:
+    days_until_due = math.floor((due - now) / _DAY)
+    if days_until_due < 0:  # Overdue
+        return 50
+    elif days_until_due == 0:  # Due today
+        return 40
+    elif days_until_due <= 2:  # Due in next 2 days
+        return 30
+    elif days_until_due <= 7:  # Due in next week
+        return 20
+    return 10
+
+
+def priority_score(task: Task, now: Optional[datetime] = None) -> int:
+    """Score used to order tasks by importance, urgency and dependencies."""
+    return base_score(task) + due_date_score(task, now or datetime.now())
+
+
+# Due-date score bands change once the time left (in seconds) drops below one of these
+_DUE_BOUNDARIES = (8 * _DAY, 3 * _DAY, _DAY, 0)
+
+
+def next_due_rollover(task: Task, now: datetime) -> Optional[float]:
+    """Moment (epoch seconds) after which due_date_score(task) next changes, or None if it never will."""
+    due = _due_timestamp(task)
+    return _next_boundary(due, now.timestamp()) if due is not None else None
+
+
+def _next_boundary(due: float, now: float) -> Optional[float]:
+    for boundary in _DUE_BOUNDARIES:
+        moment = due - boundary
+        if moment >= now:
+            return moment
+    return None
+
+
+class TaskPriorityQueue:
+    """Persistent priority structure over ``priority_score``.
+
+    A task is rescored only when an input to its score changes: priority,
+    due date, whether it has dependencies, or its number of dependents.
+    Due-date bands are handled by a rollover heap holding the next moment
+    (epoch seconds) each task's band changes; queries first rescore the tasks whose
+    rollover has passed. Scores live in a max-heap with lazy invalidation,
+    so top-K costs O(K log N) instead of a full sort.
+
+    Only tasks marked eligible (e.g. ready to start) are returned.
+    """
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now):
+        self.clock = clock
+        self._inputs: Dict[str, Tuple] = {}
+        self._base: Dict[str, int] = {}
+        self._scores: Dict[str, int] = {}
+        self._due: Dict[str, Optional[float]] = {}  # Epoch seconds
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._eligible: Set[str] = set()
+        self._heap: List[Tuple[int, int, str]] = []
+        self._rollovers: List[Tuple[float, int, str]] = []
+        self._next_rollover: Dict[str, float] = {}
+        self.rescored = 0  # Score computations, for benchmarking
+
+    def __len__(self) -> int:
+        return len(self._eligible)
+
+    def refresh(self, task_id: str, task: Optional[Task]):
+        """Rescore a task if an input to its score changed (None removes it)."""
+        if task is None:
+            self.remove(task_id)
+            return
+
+        inputs = (task.priority, task.due_date, bool(task.dependencies), len(task.dependents))
+        if self._inputs.get(task_id) == inputs:
+            return
+        if task_id not in self._seq:
+            self._seq[task_id] = self._next_seq
+            self._next_seq += 1
+
+        now = self.clock()
+        self._inputs[task_id] = inputs
+        self._base[task_id] = base_score(task)
+        self._due[task_id] = _due_timestamp(task)
+        self._set_score(task_id, self._base[task_id] + due_date_score(task, now))
+
+        self._schedule_rollover(task_id, next_due_rollover(task, now))
+
+    def _schedule_rollover(self, task_id: str, moment: Optional[float]):
+        if moment is None:
+            self._next_rollover.pop(task_id, None)
+            return
+        self._next_rollover[task_id] = moment
+        heapq.heappush(self._rollovers, (moment, self._seq[task_id], task_id))
+
+    def remove(self, task_id: str):
+        for store in (self._inputs, self._base, self._scores, self._due, self._seq, self._next_rollover):
+            store.pop(task_id, None)
+        self._eligible.discard(task_id)
+
+    def set_eligible(self, task_id: str, eligible: bool):
+        if not eligible:
+            self._eligible.discard(task_id)
+        elif task_id not in self._eligible and task_id in self._scores:
+            self._eligible.add(task_id)
+            self._push(task_id)
+
+    def score(self, task_id: str) -> Optional[int]:
+        self._roll_over()
+        return self._scores.get(task_id)
+
+    def _set_score(self, task_id: str, score: int):
+        self.rescored += 1
+        if self._scores.get(task_id) == score:
+            return
+        self._scores[task_id] = score
+        if task_id in self._eligible:
+            self._push(task_id)
+
+    def _push(self, task_id: str):
+        heapq.heappush(self._heap, (-self._scores[task_id], self._seq[task_id], task_id))
+        if len(self._heap) > 4 * len(self._eligible) + 64:
+            # Too many stale entries: rebuild from the eligible set
+            self._heap = [(-self._scores[t], self._seq[t], t) for t in self._eligible]
+            heapq.heapify(self._heap)
+
+    def _roll_over(self):
+        """Rescore tasks whose due-date band has changed since they were scored."""
+        now = self.clock().timestamp()
+        while self._rollovers and self._rollovers[0][0] < now:
+            moment, seq, task_id = heapq.heappop(self._rollovers)
+            if self._next_rollover.get(task_id) != moment or self._seq.get(task_id) != seq:
+                continue  # Superseded by a later refresh, or the task was removed
+            # Recompute only the time-dependent part
+            due = self._due[task_id]
+            self._set_score(task_id, self._base[task_id] + _band_score(due, now))
+            self._schedule_rollover(task_id, _next_boundary(due, now))
+
+    def _valid(self, entry: Tuple[int, int, str]) -> bool:
+        neg_score, seq, task_id = entry
+        return (
+            task_id in self._eligible
+            and self._scores.get(task_id) == -neg_score
+            and self._seq.get(task_id) == seq
+        )
+
+    def peek(self) -> Optional[str]:
+        """Highest-scoring eligible task, ties broken by insertion order."""
+        self._roll_over()
+        while self._heap:
+            if self._valid(self._heap[0]):
+                return self._heap[0][2]
+            heapq.heappop(self._heap)
+        return None
+
+    def top_k(self, k: int) -> List[str]:
+        """The k highest-scoring eligible tasks, best first."""
+        self._roll_over()
+        taken = []
+        seen = set()
+        while self._heap and len(taken) < k:
+            entry = heapq.heappop(self._heap)
+            if self._valid(entry) and entry[2] not in seen:
+                seen.add(entry[2])
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return [task_id for _, _, task_id in taken]
+
@@ -1,15 +1,25 @@
+import asyncio
+import heapq
 import json
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, AsyncIterator, List, Dict, Any, Optional, Sequence, Tuple
 from datetime import datetime, timedelta
-import ollama
-from ollama import Client
 import re
-from jsoncomment import JsonComment
 import urllib.parse
 
 
 from task_model import Task, Silo, TaskStatus, TaskPriority
+from llm_cache import ResponseCache, CACHEABLE_TEMPERATURE, request_key, shared_cache
+from critical_path import acyclic_edges, compute_critical_path
+from task_priority import priority_score
+from silo_embeddings import confident_match
+from research_classifier import ResearchClassifier, shared_classifier
+from model_scheduler import BATCH, INTERACTIVE, ModelScheduler, shared_scheduler
+
+if TYPE_CHECKING:
+    from ollama import AsyncClient, Client
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,64 +28,256 @@ logger = logging.getLogger(__name__)
 MODEL_NAME = "deepseek-r1:1.5b"  # Defined in Modelfile
 CONTEXT_WINDOW = 4096
 MAX_TOKENS = 1024
+MAX_CONCURRENT_CALLS = 4  # Model calls in flight per task dump
+DEFAULT_TASK_HOURS = 1.0  # Duration assumed for critical paths (dumps and stored tasks) when a task gives none
+MAX_CANDIDATE_CHARS = 160  # Description characters per task in dependency prompts
+MAX_BATCH_ITEMS = 16  # Bullets per batched title/research prompt
+BATCH_ITEM_OUTPUT_TOKENS = 32  # Expected answer size per bullet in a batch
+BATCH_PROMPT_TOKENS = 300  # Instructions around the bullets in a batch prompt
+OLLAMA_HOST = "http://localhost:11434"
+HEALTH_CHECK_INTERVAL = 30.0  # Seconds between background availability probes
+HEALTH_CHECK_TIMEOUT = 2.0  # Seconds before a probe gives up on a cold host
+
+
+class PipelineRun:
+    """Per-request state for the async task dump pipeline.
+
+    Bounds how many model calls the run keeps in flight, records the
+    end-to-end latency of each stage (queueing for a slot included), counts
+    model calls and memoizes stages shared by several consumers.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_CALLS, lane: str = BATCH):
+        self.slots = asyncio.Semaphore(max_concurrent)
+        self.lane = lane  # Scheduler lane for this run's model calls
+        self.started = time.perf_counter()
+        self.timings: Dict[str, List[float]] = {}
+        self.model_calls = 0   # Requests sent to Ollama
+        self.cached_calls = 0  # Requests answered from the response cache
+        self.research_local = 0      # Research checks answered by the local classifier
+        self.research_fallbacks = 0  # Research checks that needed the model
+        self.analyses: Dict[Tuple[str, ...], asyncio.Task] = {}
+
+    @asynccontextmanager
+    async def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings.setdefault(name, []).append(time.perf_counter() - start)
+
+    def report(self) -> Dict[str, Any]:
+        stages = {
+            name: {
+                "calls": len(durations),
+                "total_ms": round(sum(durations) * 1000, 1),
+                "max_ms": round(max(durations) * 1000, 1)
+            }
+            for name, durations in self.timings.items()
+        }
+        research_checks = self.research_local + self.research_fallbacks
+        return {
+            "stages": stages,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "model_calls": self.model_calls,
+            "cached_calls": self.cached_calls,
+            "research_checks": {
+                "local": self.research_local,
+                "model_fallbacks": self.research_fallbacks,
+                "fallback_rate": round(self.research_fallbacks / research_checks, 3) if research_checks else 0.0
+            }
+        }
+
+
+def _node_order(node: Dict) -> Tuple[int, int]:
+    """Sort key placing task_<i> before its resources res_<i>_<j>."""
+    parts = node["id"].split("_")
+    if parts[0] == "task":
+        return int(parts[1]), -1
+    return int(parts[1]), int(parts[2])
+
 
 class TaskProcessor:
-    def __init__(self):
-        self.client = Client(host='http://localhost:11434')
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        research_classifier: Optional[ResearchClassifier] = None,
+        scheduler: Optional[ModelScheduler] = None
+    ):
+        self.cache = cache or shared_cache()
+        self.research_classifier = research_classifier or shared_classifier()
+        self.scheduler = scheduler or shared_scheduler()
         self.model = "deepseek-r1:1.5b"  # Without :latest suffix
-        
+        self._client: Optional["Client"] = None
+        self._async_client: Optional["AsyncClient"] = None
+        # Model availability, unknown until the first probe
+        self.available: Optional[bool] = None
+        self.last_error: Optional[str] = None
+        self.checked_at: Optional[datetime] = None
+
+    # Clients are created on first use so construction never touches the network,
+    # and ollama (with httpx) is only imported once a model call is made
+    @property
+    def client(self) -> "Client":
+        if self._client is None:
+            from ollama import Client
+            self._client = Client(host=OLLAMA_HOST)
+        return self._client
+
+    @property
+    def async_client(self) -> "AsyncClient":
+        if self._async_client is None:
+            from ollama import AsyncClient
+            self._async_client = AsyncClient(host=OLLAMA_HOST)
+        return self._async_client
+
+    def check_health(self) -> bool:
+        """Probe Ollama for the model and cache the answer."""
         try:
-            models = self.client.list()
-            if not any(m['model'] == "deepseek-r1:1.5b" for m in models['models']):
-                raise ValueError("deepseek-r1:1.5b model not found in Ollama")
-            
-            logger.info("Connected to Ollama with deepseek-r1:1.5b model")
-            
+            from ollama import Client
+            models = Client(host=OLLAMA_HOST, timeout=HEALTH_CHECK_TIMEOUT).list()
+            if not any(m['model'] == self.model for m in models['models']):
+                raise ValueError(f"{self.model} model not found in Ollama")
+            if self.available is not True:
+                logger.info(f"Connected to Ollama with {self.model} model")
+            self.available, self.last_error = True, None
         except Exception as e:
-            logger.error(f"Ollama connection failed: {str(e)}")
-            raise RuntimeError("AI service unavailable") from e
+            if self.available is not False:
+                logger.error(f"Ollama connection failed: {str(e)}")
+            self.available, self.last_error = False, str(e)
+        self.checked_at = datetime.now()
+        return self.available
+
+    async def monitor_health(self, interval: float = HEALTH_CHECK_INTERVAL):
+        """Re-probe in the background until cancelled."""
+        while True:
+            await asyncio.to_thread(self.check_health)
+            await asyncio.sleep(interval)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "available": self.available,
+            "last_error": self.last_error,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None
+        }
+
     def process(self, tasks):
         prompt = self.create_prompt(tasks)
         result = self.client.generate(model="TaskModel", prompt=prompt)
         return result
 
+    def _model_request(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3
+    ) -> Dict[str, Any]:
+        """Build the generate() arguments shared by the sync and async model calls."""
+        # Add explicit instruction to avoid <think> pattern
+        if system_prompt:
+            enhanced_system = system_prompt + "\nDO NOT include any thinking, reasoning process, or explanations unless asked."
+        else:
+            enhanced_system = "Respond concisely and directly. DO NOT include any thinking, reasoning process, or explanations unless asked."
+        
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "system": enhanced_system,
+            "options": {
+                "temperature": temperature,
+                "top_p": 0.9,
+                "top_k": 40,
+                "num_predict": MAX_TOKENS,
+                # Add any other options like stop tokens if supported:
+                # "stop": ["<think>"]
+            }
+        }
+
+    @staticmethod
+    def _clean_response(result: str) -> str:
+        """Remove thinking patterns from a model response."""
+        result = re.sub(r'<think>.*?</think>', '', result, flags=re.DOTALL)
+        result = re.sub(r'<think>.*', '', result, flags=re.DOTALL)
+        return result
+
+    def _cache_key(self, request: Dict[str, Any], cache: Optional[bool]) -> Optional[str]:
+        """Cache key for a request, or None when the call should not be cached.
+
+        Near-deterministic calls (temperature <= CACHEABLE_TEMPERATURE) are
+        cached unless ``cache=False``; ``cache=True`` forces caching.
+        """
+        if cache is None:
+            cache = request["options"]["temperature"] <= CACHEABLE_TEMPERATURE
+        return request_key(request) if cache else None
+
     def _call_model(
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
-        temperature: float = 0.3
+        temperature: float = 0.3,
+        cache: Optional[bool] = None,
+        lane: str = INTERACTIVE
     ) -> str:
-        """Call the LLM model with the given prompt."""
+        """Call the LLM model with the given prompt.
+
+        Raises ModelBusyError when the scheduler cannot fit the call in.
+        """
+        request = self._model_request(prompt, system_prompt, temperature)
+        key = self._cache_key(request, cache)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        if self.available is False:
+            logger.error(f"Skipping model call, Ollama unavailable: {self.last_error}")
+            return ""
+        
+        with self.scheduler.slot(lane):
+            try:
+                response = self.client.generate(**request)
+                result = self._clean_response(response['response'])
+            except Exception as e:
+                logger.error(f"Error calling model: {e}")
+                return ""
+        
+        if key and result:
+            self.cache.put(key, result)
+        return result
+
+    async def _acall_model(
+        self,
+        run: PipelineRun,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.3,
+        cache: Optional[bool] = None
+    ) -> str:
+        """Call the LLM model without blocking the event loop, within the run's concurrency limit."""
+        request = self._model_request(prompt, system_prompt, temperature)
+        key = self._cache_key(request, cache)
+        if key:
+            cached = await self.cache.aget(key)
+            if cached is not None:
+                run.cached_calls += 1
+                return cached
+        if self.available is False:
+            logger.error(f"Skipping model call, Ollama unavailable: {self.last_error}")
+            return ""
+        
         try:
-            # Add explicit instruction to avoid <think> pattern
-            if system_prompt:
-                enhanced_system = system_prompt + "\nDO NOT include any thinking, reasoning process, or explanations unless asked."
-            else:
-                enhanced_system = "Respond concisely and directly. DO NOT include any thinking, reasoning process, or explanations unless asked."
-            
-            response = ollama.generate(
-                model=self.model,
-                prompt=prompt,
-                system=enhanced_system,
-                options={
-                    "temperature": temperature,
-                    "top_p": 0.9,
-                    "top_k": 40,
-                    "num_predict": MAX_TOKENS,
-                    # Add any other options like stop tokens if supported:
-                    # "stop": ["<think>"]
-                }
-            )
-            
-            # Clean the response to remove thinking patterns
-            result = response['response']
-            result = re.sub(r'<think>.*?</think>', '', result, flags=re.DOTALL)
-            result = re.sub(r'<think>.*', '', result, flags=re.DOTALL)
-            
-            return result
+            async with run.slots, self.scheduler.aslot(run.lane):
+                run.model_calls += 1
+                response = await self.async_client.generate(**request)
+            result = self._clean_response(response['response'])
         except Exception as e:
             logger.error(f"Error calling model: {e}")
             return ""
+        
+        if key and result:
+            await self.cache.aput(key, result)
+        return result
     def create_prompt(self, tasks):
         # Build your prompt from tasks
         return "\n".join(tasks)
@@ -181,6 +383,78 @@ class TaskProcessor:
     # task_processor.py
     def process_task_dump(self, tasks_input) -> Dict:
         """Process tasks with proper naming and child nodes"""
+        return asyncio.run(self.process_task_dump_async(tasks_input))
+
+    async def process_task_dump_async(self, tasks_input) -> Dict:
+        """Process tasks with proper naming and child nodes, running model calls concurrently"""
+        nodes = []
+        edges = []
+        result = {}
+        
+        async for event in self.stream_task_dump(tasks_input):
+            kind = event["event"]
+            if kind == "node":
+                nodes.append(event["node"])
+            elif kind == "edge":
+                edges.append(event["edge"])
+            elif kind == "critical_path":
+                result["critical_path"] = event["critical_path"]
+                result["duration_hours"] = event["duration_hours"]
+                result["schedule"] = event["schedule"]
+            elif kind == "error":
+                return {
+                    "error": event["detail"],
+                    "nodes": [],
+                    "dependencies": [],
+                    "critical_path": []
+                }
+            elif kind == "done":
+                result["warning"] = event.get("warning")
+                result["timings"] = event.get("timings")
+                result["model_calls"] = event.get("model_calls")
+        
+        # Nodes arrive in completion order; keep each task next to its resources
+        nodes.sort(key=_node_order)
+        
+        # Task nodes are streamed before the schedule exists
+        schedule = result.get("schedule", {})
+        for node in nodes:
+            if node["type"] == "task" and node["id"] in schedule:
+                slot = schedule[node["id"]]
+                node["data"]["duration_hours"] = slot["earliest_finish"] - slot["earliest_start"]
+        
+        logger.debug("Final nodes structure:")
+        for node in nodes:
+            logger.debug(json.dumps(node, indent=2))
+        
+        logger.debug("Edges to create:")
+        for edge in edges:
+            logger.debug(f"{edge['source']} -> {edge['target']}")
+        
+        return {
+            "nodes": nodes,
+            "edges": edges,
+            "critical_path": result.get("critical_path", []),
+            "duration_hours": result.get("duration_hours", 0.0),
+            "schedule": schedule,
+            "warning": result.get("warning"),
+            "timings": result.get("timings"),
+            "model_calls": result.get("model_calls")
+        }
+
+    async def stream_task_dump(self, tasks_input) -> AsyncIterator[Dict]:
+        """Process a task dump, yielding graph events as soon as they are ready.
+
+        Events, in order of arrival:
+        - {"event": "node", "node": {...}} for a task node, once its title exists
+        - {"event": "node", "node": {...}, "parent": task_id} for each research resource
+        - {"event": "edge", "edge": {...}} for resource links, then dependencies
+        - {"event": "critical_path", "critical_path": [...]}
+        - {"event": "done", "warning": ..., "timings": {...}}
+        An unusable dump yields a single {"event": "error", "detail": ...}.
+        """
+        run = PipelineRun()
+        
         # Normalize input to handle both strings and lists
         task_text = '\n'.join(tasks_input) if isinstance(tasks_input, list) else tasks_input
         
@@ -188,138 +462,191 @@ class TaskProcessor:
         tasks = self._robust_parse_tasks(task_text)
         
         if not tasks:
-            return {
-                "error": "Couldn't identify tasks. Use clear bullet points (-) with one task per line",
-                "nodes": [],
-                "dependencies": [],
-                "critical_path": []
+            yield {
+                "event": "error",
+                "detail": "Couldn't identify tasks. Use clear bullet points (-) with one task per line"
             }
+            return
+        
+        # Dependency analysis only needs the bullet text, so it runs
+        # alongside the per-task stages instead of after them
+        analysis_job = self._dependency_analysis(run, tasks)
+        
+        # Titles and research flags are asked for a few bullets per prompt;
+        # each bullet then pushes its events onto the queue as they complete
+        batches = self._plan_batches(tasks)
+        triage_jobs = [asyncio.create_task(self._atriage_batch(run, tasks, batch)) for batch in batches]
+        triage_for = {idx: job for job, batch in zip(triage_jobs, batches) for idx in batch}
+        events: asyncio.Queue = asyncio.Queue()
+        task_nodes: List[Dict] = []
+        bullets = [
+            asyncio.create_task(self._astream_bullet(run, idx, task, events, triage_for[idx]))
+            for idx, task in enumerate(tasks)
+        ]
+        pending = set(bullets)
         
+        try:
+            while pending or not events.empty():
+                if events.empty():
+                    # Wake up on the next event or when a bullet finishes
+                    getter = asyncio.ensure_future(events.get())
+                    done, _ = await asyncio.wait(pending | {getter}, return_when=asyncio.FIRST_COMPLETED)
+                    pending -= done
+                    if getter not in done:
+                        getter.cancel()
+                        continue
+                    event = getter.result()
+                else:
+                    event = events.get_nowait()
+                if event["event"] == "node" and event["node"]["type"] == "task":
+                    task_nodes.append(event["node"])
+                yield event
+            
+            # Surface failures from the bullet stages
+            for bullet in bullets:
+                bullet.result()
+            
+            # Create parent-child connections
+            for node in sorted(task_nodes, key=_node_order):
+                for child_id in node["children"]:
+                    yield {"event": "edge", "edge": {
+                        "source": node["id"],
+                        "target": child_id,
+                        "type": "resource"
+                    }}
+            
+            # The single analysis result feeds both the dependency edges
+            # and the critical path
+            analysis = await analysis_job
+            for dep in analysis["dependencies"]:
+                yield {"event": "edge", "edge": {
+                    "source": dep[0],
+                    "target": dep[1],
+                    "type": "dependency"
+                }}
+            
+            yield {
+                "event": "critical_path",
+                "critical_path": analysis["critical_path"],
+                "duration_hours": analysis["duration_hours"],
+                "schedule": analysis["schedule"]
+            }
+            
+            timings = run.report()
+            logger.info(f"Task dump pipeline timings: {timings}")
+            yield {
+                "event": "done",
+                "warning": analysis.get("error"),
+                "timings": timings,
+                "model_calls": run.model_calls
+            }
+        finally:
+            # Stop outstanding model calls if the consumer went away early
+            for job in bullets + triage_jobs + [analysis_job]:
+                job.cancel()
+
+    def _dependency_analysis(self, run: PipelineRun, tasks: List[str]) -> asyncio.Task:
+        """Start the dependency analysis for these bullets, or reuse the run's existing one."""
+        key = tuple(tasks)
+        if key not in run.analyses:
+            run.analyses[key] = asyncio.create_task(self._aenhanced_analysis(run, tasks))
+        return run.analyses[key]
+
+    async def _astream_bullet(
+        self,
+        run: PipelineRun,
+        idx: int,
+        task_text: str,
+        events: asyncio.Queue,
+        triage: Optional[asyncio.Task] = None
+    ):
+        """Generate the node and research resources for one bullet, pushing events as they are ready.
+
+        ``triage`` is the batch job answering this bullet; anything it could
+        not answer validly is asked for individually.
+        """
         base_x = 100
         base_y = 100
         x_offset = 300
         y_offset = 150
         
-        # Create nodes with proper hierarchy
-        nodes = []
-        edges = []  # Initialize edges array to store connections
+        title, batch_research = (await triage).get(idx, (None, None)) if triage else (None, None)
         
-        for idx, task in enumerate(tasks):
-            # Generate meaningful title using AI
-            title = self._generate_task_title(task)
-            
-            # Generate position
-            position = {
-                "x": base_x + (idx % 3) * x_offset,
-                "y": base_y + (idx // 3) * y_offset
+        # Research detection runs while the title is generated
+        needs_research = asyncio.create_task(self._arequires_research(run, task_text, batch_research))
+        try:
+            if title is None:
+                title = await self._agenerate_task_title(run, task_text)
+        except BaseException:
+            needs_research.cancel()
+            raise
+        
+        # Generate position
+        position = {
+            "x": base_x + (idx % 3) * x_offset,
+            "y": base_y + (idx // 3) * y_offset
+        }
+        
+        # Create task node
+        task_id = f"task_{idx}"
+        task_node = {
+            "id": task_id,
+            "type": "task",
+            "position": position,
+            "data": {  # Move title into data object
+                "title": title,
+                "label": title,
+                "original_text": task_text
+            },
+            "children": [],
+            "metadata": {
+                "ai_generated": True,
+                "created_at": datetime.now().isoformat()
             }
+        }
+        await events.put({"event": "node", "node": task_node})
+        
+        # Generate research children with validation
+        if not await needs_research:
+            return
+        resources = await self._agenerate_research_sources(run, task_text)
+        for res_idx, resource in enumerate(resources):
+            resource_id = f"res_{idx}_{res_idx}"
+            task_node["children"].append(resource_id)
+            
+            # Validate URL format
+            if not re.match(r'^https?://', resource["url"]):
+                resource["url"] = "#invalid-url"
             
-            # Create task node
-            task_id = f"task_{idx}"
-            task_node = {
-                "id": task_id,
-                "type": "task",
-                "position": position,
-                "data": {  # Move title into data object
-                    "title": title,
-                    "label": title,
-                    "original_text": task
+            # Create source node
+            resource_node = {
+                "id": resource_id,
+                "type": "resource",
+                "position": {
+                    "x": position["x"] + 150,
+                    "y": position["y"] + (res_idx * 100)
+                },
+                "data": {  # Move all data into data property
+                    "title": resource["title"][:100],
+                    "url": resource["url"],
+                    "summary": resource["summary"][:200],
+                    "key_points": resource["key_points"][:3]
                 },
-                "children": [],
                 "metadata": {
                     "ai_generated": True,
-                    "created_at": datetime.now().isoformat()
+                    "verified": False
                 }
             }
-            nodes.append(task_node)
+            await events.put({"event": "node", "node": resource_node, "parent": task_id})
             
-            # Generate research children with validation
-            if self._requires_research(task):
-                resources = self._generate_research_sources(task)
-                for res_idx, resource in enumerate(resources):
-                    resource_id = f"res_{idx}_{res_idx}"
-                    task_node["children"].append(resource_id)
-                    
-                    # Validate URL format
-                    if not re.match(r'^https?://', resource["url"]):
-                        resource["url"] = "#invalid-url"
-                    
-                    # Create source node
-# In task_processor.py
-                    resource_node = {
-                        "id": resource_id,
-                        "type": "resource",
-                        "position": {
-                            "x": position["x"] + 150,
-                            "y": position["y"] + (res_idx * 100)
-                        },
-                        "data": {  # Move all data into data property
-                            "title": resource["title"][:100],
-                            "url": resource["url"],
-                            "summary": resource["summary"][:200],
-                            "key_points": resource["key_points"][:3]
-                        },
-                        "metadata": {
-                            "ai_generated": True,
-                            "verified": False
-                        }
-                    }
-                    nodes.append(resource_node)
-                    
-                    # Create connection from task to resource
-                    edges.append({
-                        "source": task_id,
-                        "target": resource_id,
-                        "type": "uses_resource"
-                    })
-
-        # Improved dependency analysis
-        analysis = self._enhanced_analysis(tasks, nodes)
-        
-        # Add task dependencies as connections
-        for dep in analysis.get("dependencies", []):
-            if len(dep) == 2:
-                edges.append({
-                    "source": dep[0],
-                    "target": dep[1],
-                    "type": "dependency" if dep[1].startswith("task_") else "resource"
-                })
-
-            # Create parent-child connections
-        for node in nodes:
-            if node["type"] == "task" and node.get("children"):
-                for child_id in node["children"]:
-                    edges.append({
-                        "source": node["id"],
-                        "target": child_id,
-                        "type": "resource"
-                    })
-
-        # Add task dependencies AFTER resource connections
-        analysis = self._enhanced_analysis(tasks, nodes)
-        for dep in analysis.get("dependencies", []):
-            edges.append({
-                "source": dep[0],
-                "target": dep[1],
-                "type": "dependency"
-            })
-        
-        
-        logger.debug("Final nodes structure:")
-        for node in nodes:
-            logger.debug(json.dumps(node, indent=2))
-        
-        logger.debug("Edges to create:")
-        for edge in edges:
-            logger.debug(f"{edge['source']} -> {edge['target']}")
-        
-        return {
-            "nodes": nodes,
-            "edges": edges,
-            "critical_path": analysis["critical_path"],
-            "warning": analysis.get("error")
-        }
+            # Create connection from task to resource
+            await events.put({"event": "edge", "edge": {
+                "source": task_id,
+                "target": resource_id,
+                "type": "uses_resource"
+            }})
     
+
     def _robust_parse_tasks(self, text: str) -> List[str]:
         """Improved task parsing with multiple fallbacks"""
         # First try standard bullet point parsing
@@ -335,9 +662,8 @@ class TaskProcessor:
         
         return tasks
 
-    def _generate_task_title(self, task_text: str) -> str:
-        """Generate meaningful titles with validation"""
-        prompt = f"""Generate a concise, descriptive title (2-4 words) following these rules:
+    def _title_prompt(self, task_text: str) -> str:
+        return f"""Generate a concise, descriptive title (2-4 words) following these rules:
         1. Use title case
         2. No ending punctuation
         3. Include key verbs/nouns
@@ -345,13 +671,16 @@ class TaskProcessor:
         
         Input: "{task_text}"
         Title:"""
-        
-        response = self._call_model(prompt, temperature=0.1).strip()
-        
-        # Validate and clean response
-        clean_title = re.sub(r'^["\']?(.*?)["\']?$', r'\1', response)  # Remove quotes
+
+    @staticmethod
+    def _normalize_title(response: str) -> str:
+        clean_title = re.sub(r'^["\']?(.*?)["\']?$', r'\1', response.strip())  # Remove quotes
         clean_title = re.sub(r'[^a-zA-Z0-9\s\-]', '', clean_title)     # Remove special chars
-        clean_title = clean_title[:50].strip()
+        return clean_title[:50].strip()
+
+    def _clean_title(self, response: str, task_text: str) -> str:
+        # Validate and clean response
+        clean_title = self._normalize_title(response)
         
         # Fallback to intelligent truncation
         if len(clean_title.split()) < 2:
@@ -360,14 +689,18 @@ class TaskProcessor:
         
         return clean_title
 
-    def _requires_research(self, task_text: str) -> bool:
-        """Strict research requirement detection"""
-        # Check for explicit resource requests
-        if re.search(r'\b(sources?|references?|materials|resources?)\b', task_text, re.I):
-            return True
-        
-        # Strict AI verification with negative examples
-        prompt = f"""Should this task require EXTERNAL RESOURCES? Answer ONLY yes/no.
+    def _generate_task_title(self, task_text: str) -> str:
+        """Generate meaningful titles with validation"""
+        response = self._call_model(self._title_prompt(task_text), temperature=0.1)
+        return self._clean_title(response, task_text)
+
+    async def _agenerate_task_title(self, run: PipelineRun, task_text: str) -> str:
+        async with run.stage("title"):
+            response = await self._acall_model(run, self._title_prompt(task_text), temperature=0.1)
+        return self._clean_title(response, task_text)
+
+    def _research_prompt(self, task_text: str) -> str:
+        return f"""Should this task require EXTERNAL RESOURCES? Answer ONLY yes/no.
         Examples that need resources:
         - "Research vaccine efficacy studies"
         - "Find sources about climate change"
@@ -378,27 +711,165 @@ class TaskProcessor:
         - "Create presentation"
         
         Task: {task_text}"""
+
+    @staticmethod
+    def _mentions_resources(task_text: str) -> bool:
+        """Check for explicit resource requests"""
+        return bool(re.search(r'\b(sources?|references?|materials|resources?)\b', task_text, re.I))
+
+    @staticmethod
+    def _research_answer(response: str) -> Optional[bool]:
+        """The model's yes/no, or None when it gave no answer (which is not logged)."""
+        if not response.strip():
+            return None
+        return response.strip().lower().startswith('yes')
+
+    def _requires_research(self, task_text: str) -> bool:
+        """Strict research requirement detection"""
+        if self._mentions_resources(task_text):
+            return True
+        
+        # Local classifier first; the model only when it is unsure
+        decision = self.research_classifier.predict(task_text)
+        if decision is not None:
+            return decision
         
-        response = self._call_model(prompt, temperature=0.1).strip().lower()
-        return response.startswith('yes')
+        # Strict AI verification with negative examples
+        response = self._call_model(self._research_prompt(task_text), temperature=0.1)
+        needs_research = self._research_answer(response)
+        if needs_research is None:
+            return False
+        # Logged as training data for the local classifier
+        self.research_classifier.record(task_text, needs_research)
+        return needs_research
 
-    def _generate_research_sources(self, task_text: str) -> List[Dict]:
-        """Generate quality research sources with validation"""
-        system_prompt = """Generate 3 relevant, real-world research sources in STRICT JSON array format. Each source MUST have:
+    async def _arequires_research(
+        self,
+        run: PipelineRun,
+        task_text: str,
+        batch_answer: Optional[bool] = None
+    ) -> bool:
+        """Research check; ``batch_answer`` is the model's answer from a batched prompt, if any."""
+        if self._mentions_resources(task_text):
+            return True
+        decision = self.research_classifier.predict(task_text)
+        if decision is not None:
+            run.research_local += 1
+            return decision
+        run.research_fallbacks += 1
+        needs_research = batch_answer
+        if needs_research is None:
+            async with run.stage("research_check"):
+                response = await self._acall_model(run, self._research_prompt(task_text), temperature=0.1)
+            needs_research = self._research_answer(response)
+            if needs_research is None:
+                return False
+        await self.research_classifier.arecord(task_text, needs_research)
+        return needs_research
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (about four characters per token)."""
+        return len(text) // 4 + 1
+
+    def _plan_batches(self, tasks: List[str]) -> List[List[int]]:
+        """Group bullet indexes so each batched prompt and its answer fit the context window."""
+        input_budget = CONTEXT_WINDOW - MAX_TOKENS - BATCH_PROMPT_TOKENS
+        # Leave half of the answer budget for the model's reasoning preamble
+        max_items = max(1, min(MAX_BATCH_ITEMS, (MAX_TOKENS // 2) // BATCH_ITEM_OUTPUT_TOKENS))
+        
+        batches: List[List[int]] = []
+        current: List[int] = []
+        used = 0
+        for idx, task_text in enumerate(tasks):
+            cost = self._estimate_tokens(task_text) + 4  # Numbering and newline
+            if current and (len(current) >= max_items or used + cost > input_budget):
+                batches.append(current)
+                current, used = [], 0
+            current.append(idx)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    _TRIAGE_SYSTEM_PROMPT = """For each numbered task, return an object with:
+        - "index": the task number
+        - "title": a concise, descriptive title of 2-4 words in title case, no ending punctuation,
+          using key verbs/nouns and avoiding generic terms like "Task" or "Work"
+        - "needs_research": true only if the task needs EXTERNAL RESOURCES (e.g. "Research vaccine
+          efficacy studies", "Find sources about climate change"), false otherwise (e.g. "Study for
+          chemistry test", "Finish math homework", "Create presentation")
+        Respond ONLY with a JSON array containing one object per task."""
+
+    def _triage_prompt(self, tasks: List[str], batch: List[int]) -> str:
+        lines = "\n".join(f"{n}. {tasks[idx]}" for n, idx in enumerate(batch, 1))
+        return f"Tasks:\n{lines}"
+
+    def _parse_triage(self, response: str, batch: List[int]) -> Dict[int, Tuple[Optional[str], Optional[bool]]]:
+        """Map bullet index -> (title, needs_research), with None for anything missing or invalid."""
+        results: Dict[int, Tuple[Optional[str], Optional[bool]]] = {}
+        try:
+            json_start = response.find('[')
+            json_end = response.rfind(']') + 1
+            items = json.loads(response[json_start:json_end]) if 0 <= json_start < json_end else []
+        except ValueError as e:
+            logger.warning(f"Unparseable batch answer, asking per task: {e}")
+            items = []
+        
+        for item in items if isinstance(items, list) else []:
+            if not isinstance(item, dict):
+                continue
+            try:
+                number = int(item.get("index"))
+            except (TypeError, ValueError):
+                continue
+            if not 1 <= number <= len(batch) or batch[number - 1] in results:
+                continue
+            
+            title = item.get("title")
+            title = self._normalize_title(title) if isinstance(title, str) else ""
+            needs_research = item.get("needs_research")
+            if isinstance(needs_research, str) and needs_research.strip().lower() in ("yes", "no", "true", "false"):
+                needs_research = needs_research.strip().lower() in ("yes", "true")
+            results[batch[number - 1]] = (
+                title if len(title.split()) >= 2 else None,
+                needs_research if isinstance(needs_research, bool) else None
+            )
+        return results
+
+    async def _atriage_batch(
+        self,
+        run: PipelineRun,
+        tasks: List[str],
+        batch: List[int]
+    ) -> Dict[int, Tuple[Optional[str], Optional[bool]]]:
+        """Titles and research flags for a batch of bullets from a single model call."""
+        if len(batch) == 1:
+            return {}  # A batch of one is no cheaper than the individual prompts
+        async with run.stage("triage_batch"):
+            response = await self._acall_model(
+                run,
+                self._triage_prompt(tasks, batch),
+                self._TRIAGE_SYSTEM_PROMPT,
+                temperature=0.1
+            )
+        results = self._parse_triage(response, batch)
+        failed = sum(1 for idx in batch if None in results.get(idx, (None, None)))
+        if failed:
+            logger.info(f"Batch answer incomplete for {failed} of {len(batch)} tasks, asking them individually")
+        return results
+
+    _SOURCES_SYSTEM_PROMPT = """Generate 3 relevant, real-world research sources in STRICT JSON array format. Each source MUST have:
         - "title": string
         - "url": VALID URL string
         - "summary": string
         - "key_points": array of strings
         Example: [{"title": "...", "url": "https://real-site.com", "summary": "...", "key_points": ["..."]}]"""
-        
+
+    def _parse_research_sources(self, response: str) -> List[Dict]:
         try:
-            response = self._call_model(
-                f"Generate research sources for: {task_text}",
-                system_prompt,
-                temperature=0.3  # Lower temperature for consistency
-            )
-            
             # Use JSON parser with comments
+            from jsoncomment import JsonComment
             parser = JsonComment()
             try:
                 sources = parser.loads(response)
@@ -432,20 +903,66 @@ class TaskProcessor:
             logger.error(f"Research generation failed: {str(e)}\nResponse: {response}")
             return []
 
-    def _enhanced_analysis(self, tasks: List[str], nodes: List[Dict]) -> Dict:
-        """Robust critical path analysis with validation"""
-        system_prompt = """Analyze task dependencies and return JSON with:
-        - "dependencies": array of [task_index, depends_on_index]
-        - "critical_path": array of task indexes
-        Example: {"dependencies": [[0,1]], "critical_path": [0,1]}"""
-        
+    def _generate_research_sources(self, task_text: str) -> List[Dict]:
+        """Generate quality research sources with validation"""
+        response = self._call_model(
+            f"Generate research sources for: {task_text}",
+            self._SOURCES_SYSTEM_PROMPT,
+            temperature=0.3  # Lower temperature for consistency
+        )
+        return self._parse_research_sources(response)
+
+    async def _agenerate_research_sources(self, run: PipelineRun, task_text: str) -> List[Dict]:
+        async with run.stage("research_sources"):
+            response = await self._acall_model(
+                run,
+                f"Generate research sources for: {task_text}",
+                self._SOURCES_SYSTEM_PROMPT,
+                temperature=0.3
+            )
+        return self._parse_research_sources(response)
+
+    _ANALYSIS_SYSTEM_PROMPT = """Analyze task dependencies and return JSON with:
+        - "dependencies": array of [before_index, after_index] pairs, where the first task must be finished before the second can start
+        Example: {"dependencies": [[0,1]]}"""
+
+    def _analysis_prompt(self, tasks: List[str]) -> str:
         task_list = "\n".join([f"{i}: {task}" for i, task in enumerate(tasks)])
-        prompt = f"""Analyze these tasks:
+        return f"""Analyze these tasks:
         {task_list}
-        Return ONLY valid JSON with dependencies and critical path:"""
-        
-        response = self._call_model(prompt, system_prompt, temperature=0.1)
-        
+        Return ONLY valid JSON with dependencies:"""
+
+    @staticmethod
+    def _estimate_hours(task_text: str) -> float:
+        """Duration stated in a bullet ("2 hours", "30 min"), or DEFAULT_TASK_HOURS."""
+        hours_match = re.search(r'\b(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)\b', task_text, re.IGNORECASE)
+        if hours_match:
+            return float(hours_match.group(1))
+        minutes_match = re.search(r'\b(\d+)\s*(?:minutes?|mins?)\b', task_text, re.IGNORECASE)
+        if minutes_match:
+            return int(minutes_match.group(1)) / 60
+        return DEFAULT_TASK_HOURS
+
+    def _critical_path_analysis(self, tasks: List[str], dependencies: List[List[str]]) -> Dict:
+        """Schedule the bullets with the critical path method.
+
+        The model only proposes edges; edges that would close a cycle are
+        dropped and the critical path, slack and total duration are computed
+        deterministically from the remaining graph.
+        """
+        task_ids = [f"task_{i}" for i in range(len(tasks))]
+        durations = {task_id: self._estimate_hours(task) for task_id, task in zip(task_ids, tasks)}
+        kept, dropped = acyclic_edges(task_ids, dependencies)
+        cpm = compute_critical_path(task_ids, kept, durations)
+        return {
+            "dependencies": [list(edge) for edge in kept],
+            "dropped_dependencies": [list(edge) for edge in dropped],
+            "critical_path": cpm["critical_path"],
+            "duration_hours": cpm["duration"],
+            "schedule": cpm["schedule"]
+        }
+
+    def _parse_enhanced_analysis(self, response: str, tasks: List[str]) -> Dict:
         # Parse JSON response
         try:
             analysis = json.loads(response)
@@ -462,14 +979,23 @@ class TaskProcessor:
                 if source != target:
                     valid_deps.append([source, target])
 
-        # Process critical path
-        valid_cp = [f"task_{i}" for i in analysis.get("critical_path", range(len(tasks)))]
+        result = self._critical_path_analysis(tasks, valid_deps)
+        result["error"] = "AI analysis failed" if not valid_deps else None
+        if result["dropped_dependencies"]:
+            result["error"] = f"Ignored {len(result['dropped_dependencies'])} dependencies that formed a cycle"
+        return result
 
-        return {
-            "dependencies": valid_deps,
-            "critical_path": valid_cp,
-            "error": "AI analysis failed" if not valid_deps else None
-        }
+    def _enhanced_analysis(self, tasks: List[str], nodes: List[Dict]) -> Dict:
+        """Robust critical path analysis with validation"""
+        response = self._call_model(self._analysis_prompt(tasks), self._ANALYSIS_SYSTEM_PROMPT, temperature=0.1)
+        return self._parse_enhanced_analysis(response, tasks)
+
+    async def _aenhanced_analysis(self, run: PipelineRun, tasks: List[str]) -> Dict:
+        async with run.stage("analysis"):
+            response = await self._acall_model(
+                run, self._analysis_prompt(tasks), self._ANALYSIS_SYSTEM_PROMPT, temperature=0.1
+            )
+        return self._parse_enhanced_analysis(response, tasks)
 
     def _parse_task_string(self, task_string: str) -> list:
         """Parse a string containing multiple tasks into a list of individual tasks."""
@@ -616,12 +1142,11 @@ class TaskProcessor:
         system_prompt = """You are a task dependency analyzer. Your job is to determine 
         relationships between tasks.
         
-        Return ONLY valid JSON with these fields:
-        - dependencies: array of task INDEX PAIRS [[0,1], [1,2]] showing which tasks depend on others
-        - critical_path: array of task INDEXES in execution order [0,1,2,3]
+        Return ONLY valid JSON with this field:
+        - dependencies: array of task INDEX PAIRS [[0,1], [1,2]] where the first task must be finished before the second can start
         
         DO NOT include any explanation, reasoning, or thinking. ONLY return JSON like:
-        {"dependencies": [[0,1], [1,2]], "critical_path": [0,1,2,3]}
+        {"dependencies": [[0,1], [1,2]]}
         """
         
         task_list = "\n".join([f"{i}. {task}" for i, task in enumerate(tasks)])
@@ -668,8 +1193,6 @@ class TaskProcessor:
             # Create default values if keys are missing
             if "dependencies" not in analysis:
                 analysis["dependencies"] = []
-            if "critical_path" not in analysis:
-                analysis["critical_path"] = list(range(len(tasks)))
                 
             # Process and validate dependencies
             max_index = len(tasks) - 1
@@ -686,24 +1209,11 @@ class TaskProcessor:
                         # Skip invalid indices
                         continue
             
-            # Process and validate critical path
-            valid_cp = []
-            for idx in analysis.get("critical_path", []):
-                try:
-                    idx_int = int(idx) if isinstance(idx, str) else idx
-                    if 0 <= idx_int <= max_index:
-                        valid_cp.append(f"task_{idx_int}")
-                except (ValueError, TypeError):
-                    # Skip invalid indices
-                    continue
-            
-            # Ensure critical path isn't empty
-            if not valid_cp:
-                valid_cp = [f"task_{i}" for i in range(len(tasks))]
-            
+            # The critical path comes from the validated edges, not the model
+            schedule = self._critical_path_analysis(tasks, valid_deps)
             return {
-                "dependencies": valid_deps,
-                "critical_path": valid_cp
+                "dependencies": schedule["dependencies"],
+                "critical_path": schedule["critical_path"]
             }
                     
         except Exception as e:
@@ -719,14 +1229,33 @@ class TaskProcessor:
             return None
 
     
-    def suggest_silo(self, task: Task, available_silos: List[Silo]) -> str:
-        """Suggest the most appropriate silo for a task."""
+    def suggest_silo(
+        self,
+        task: Task,
+        available_silos: List[Silo],
+        ranked: Optional[Sequence[Tuple[str, float]]] = None
+    ) -> str:
+        """Suggest the most appropriate silo for a task.
+
+        With ``ranked`` silos from the embedding index (SiloEmbeddingIndex.arank)
+        the answer comes from vector similarity; the model is only asked to
+        break ties among the closest silos.
+        """
         if not available_silos:
             return ""
             
         # If there's only one silo, use that
         if len(available_silos) == 1:
             return available_silos[0].id
+        
+        if ranked is not None:
+            match = confident_match(ranked)
+            if match:
+                return match
+            if len(ranked) > 1:
+                # Let the model choose among the closest silos only
+                by_id = {silo.id: silo for silo in available_silos}
+                available_silos = [by_id[silo_id] for silo_id, _ in ranked]
             
         # Prepare silo information
         silos_info = []
@@ -855,7 +1384,65 @@ class TaskProcessor:
                                 break
         
         return subtasks
-    
+
+    def suggest_dependencies(self, task: Task, candidates: List[Task]) -> List[Dict]:
+        """Suggest which candidate tasks must be finished before the given task.
+
+        Candidates should already be shortlisted (see ``TaskRetriever``) so the
+        prompt stays the same size however many tasks are stored.
+        """
+        if not candidates:
+            return []
+
+        system_prompt = """
+        Decide which of the numbered candidate tasks must be finished before the main task can start.
+        Respond only with a JSON array of objects like {"index": 1, "reason": "short reason"}.
+        Respond with [] if none of them are prerequisites.
+        """
+
+        listing = "\n".join(
+            f"{i}. {candidate.title} - {candidate.description[:MAX_CANDIDATE_CHARS]}"
+            for i, candidate in enumerate(candidates, 1)
+        )
+        prompt = f"""
+        Main task: {task.title}
+        Description: {task.description[:MAX_CANDIDATE_CHARS]}
+
+        Candidate tasks:
+        {listing}
+        """
+
+        response = self._call_model(prompt, system_prompt, temperature=0.1)
+
+        try:
+            json_start = response.find('[')
+            json_end = response.rfind(']') + 1
+            if json_start < 0 or json_end <= json_start:
+                return []
+            picks = json.loads(response[json_start:json_end])
+        except Exception as e:
+            logger.error(f"Error parsing dependency suggestions: {e}")
+            return []
+
+        suggestions = []
+        seen = set()
+        for pick in picks:
+            if not isinstance(pick, dict):
+                continue
+            try:
+                index = int(pick.get("index"))
+            except (TypeError, ValueError):
+                continue
+            if 1 <= index <= len(candidates) and index not in seen:
+                seen.add(index)
+                candidate = candidates[index - 1]
+                suggestions.append({
+                    "task_id": candidate.id,
+                    "title": candidate.title,
+                    "reason": str(pick.get("reason", ""))
+                })
+        return suggestions
+
     def estimate_completion_time(self, task: Task, user_history: Optional[List[Dict]] = None) -> timedelta:
         """Estimate time to complete a task based on its description and user history."""
         if task.estimated_time:
@@ -898,80 +1485,45 @@ class TaskProcessor:
         # Default to 1 hour if no valid time format is found
         return timedelta(hours=1)
     
-    def prioritize_tasks(self, tasks: List[Task]) -> List[Task]:
-        """Prioritize a list of tasks based on importance, urgency, and dependencies."""
+    def prioritize_tasks(self, tasks: List[Task], limit: Optional[int] = None) -> List[Task]:
+        """Prioritize a list of tasks based on importance, urgency, and dependencies.
+
+        With ``limit`` only the top tasks are returned, in O(n log limit).
+        """
         if not tasks:
             return []
-            
-        # Calculate a priority score for each task
-        task_scores = []
-        for task in tasks:
-            score = 0
-            
-            # Priority factor
-            priority_scores = {
-                TaskPriority.LOW: 1,
-                TaskPriority.MEDIUM: 2,
-                TaskPriority.HIGH: 3,
-                TaskPriority.URGENT: 4
-            }
-            score += priority_scores.get(task.priority, 2) * 10
-            
-            # Due date factor
-            if task.due_date:
-                days_until_due = (task.due_date - datetime.now()).days
-                if days_until_due < 0:  # Overdue
-                    score += 50
-                elif days_until_due == 0:  # Due today
-                    score += 40
-                elif days_until_due <= 2:  # Due in next 2 days
-                    score += 30
-                elif days_until_due <= 7:  # Due in next week
-                    score += 20
-                else:
-                    score += 10
-            
-            # Dependency factor
-            # Tasks with no dependencies should be prioritized
-            if not task.dependencies:
-                score += 15
-            
-            # Tasks that are blocking many others should be prioritized
-            score += len(task.dependents) * 5
-            
-            task_scores.append((task, score))
         
-        # Sort by score in descending order
-        sorted_tasks = [t for t, s in sorted(task_scores, key=lambda x: x[1], reverse=True)]
-        return sorted_tasks
+        # Score every task against the same clock and sort by score in descending order
+        now = datetime.now()
+        if limit is not None:
+            return heapq.nlargest(limit, tasks, key=lambda task: priority_score(task, now))
+        return sorted(tasks, key=lambda task: priority_score(task, now), reverse=True)
     
     def suggest_next_task(self, tasks: List[Task]) -> Optional[Task]:
         """Suggest the next task to work on from a list of tasks."""
         if not tasks:
             return None
+        
+        status_by_id = {t.id: t.status for t in tasks}
             
         # Filter to non-completed, non-blocked tasks
         available_tasks = [t for t in tasks if t.status != TaskStatus.COMPLETED 
                            and t.status != TaskStatus.ARCHIVED]
         
         # Further filter to tasks that are not blocked by dependencies
-        unblocked_tasks = []
-        for task in available_tasks:
-            is_blocked = False
-            for dep_id in task.dependencies:
-                # Find the dependency task
-                dep_task = next((t for t in tasks if t.id == dep_id), None)
-                if dep_task and dep_task.status != TaskStatus.COMPLETED:
-                    is_blocked = True
-                    break
-            if not is_blocked:
-                unblocked_tasks.append(task)
+        unblocked_tasks = [
+            task for task in available_tasks
+            if not any(
+                dep_id in status_by_id and status_by_id[dep_id] != TaskStatus.COMPLETED
+                for dep_id in task.dependencies
+            )
+        ]
         
         if not unblocked_tasks:
             return None
             
         # Prioritize the unblocked tasks
-        prioritized_tasks = self.prioritize_tasks(unblocked_tasks)
+        prioritized_tasks = self.prioritize_tasks(unblocked_tasks, limit=1)
         return prioritized_tasks[0] if prioritized_tasks else None
     
     def analyze_task_completion(self, task: Task, completion_text: str) -> Tuple[bool, str]:
@@ -1003,25 +1555,46 @@ class TaskProcessor:
         return is_completed, explanation
 
 
-def extract_quotes(content: str, thesis: str) -> dict:
-    """Extract relevant quotes using Deepseek"""
-    prompt = f"""Extract 3-5 most relevant quotes from this content that support the thesis: {thesis}
-    
-    Content:
-    {content[:3000]}  # Truncate to fit context window
-    
-    Respond in JSON format: {{ "quotes": [], "thesis": "...", "analysis": "..." }}"""
-    
-    response = self._call_model(prompt)
-    return self._parse_json(response)
+    def _parse_json(self, response: str) -> dict:
+        """First JSON object in a model response, or an error payload."""
+        from jsoncomment import JsonComment
+        match = re.search(r'\{.*\}', response, re.DOTALL)
+        try:
+            return JsonComment().loads(match.group(0) if match else response)
+        except Exception as e:
+            logger.error(f"Invalid JSON from model: {e}")
+            return {"error": "Could not parse model response"}
 
-def summarize_content(content: str) -> dict:
-    """Generate summary using Deepseek"""
-    prompt = f"""Summarize this content into 3 key points:
-    
-    {content[:3000]}
-    
-    Respond in JSON format: {{ "summary": "...", "key_points": [] }}"""
-    
-    response = self._call_model(prompt)
-    return self._parse_json(response)
\ No newline at end of file
+    def extract_quotes(self, content: str, thesis: str) -> dict:
+        """Extract relevant quotes using Deepseek"""
+        prompt = f"""Extract 3-5 most relevant quotes from this content that support the thesis: {thesis}
+        
+        Content:
+        {content[:3000]}
+        
+        Respond in JSON format: {{ "quotes": [], "thesis": "...", "analysis": "..." }}"""
+        
+        response = self._call_model(prompt)
+        return self._parse_json(response)
+
+    def summarize_content(self, content: str) -> dict:
+        """Generate summary using Deepseek"""
+        prompt = f"""Summarize this content into 3 key points:
+        
+        {content[:3000]}
+        
+        Respond in JSON format: {{ "summary": "...", "key_points": [] }}"""
+        
+        response = self._call_model(prompt)
+        return self._parse_json(response)
+
+
+_shared_processor: Optional[TaskProcessor] = None
+
+
+def shared_processor() -> TaskProcessor:
+    """The process-wide TaskProcessor used by every endpoint."""
+    global _shared_processor
+    if _shared_processor is None:
+        _shared_processor = TaskProcessor()
+    return _shared_processor
@@ -0,0 +1,161 @@
+import logging
+import os
+import re
+import threading
+from typing import TYPE_CHECKING, Collection, Dict, List, Optional, Tuple
+
+from task_model import Task, TaskStatus
+from silo_embeddings import EMBEDDING_MODEL, Encoder, shared_encoder, task_query
+
+if TYPE_CHECKING:
+    # numpy and rank_bm25 are imported on the first shortlist to keep startup fast
+    import numpy as np
+    from rank_bm25 import BM25Okapi
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", 12))  # Candidates handed to the model
+LEXICAL_WEIGHT = float(os.getenv("RETRIEVAL_LEXICAL_WEIGHT", 0.5))  # BM25 share of the hybrid score
+EXCLUDED_STATUSES = (TaskStatus.ARCHIVED,)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+class TaskRetriever:
+    """Shortlists candidate tasks for a target task before any prompt is built.
+
+    Candidates come from the target's silo (or a given one) and are scored
+    by BM25 plus embedding cosine similarity, each scaled to [0, 1] and
+    mixed by ``LEXICAL_WEIGHT``. BM25 models are built per silo on demand
+    and dropped when a task in that silo changes; task embeddings are
+    cached by text, so only new or edited tasks are encoded. Without an
+    embedding model the score is BM25 alone.
+
+    ``refresh`` runs on the event loop and ``shortlist`` in a worker
+    thread. A shortlist works from a snapshot of its silo taken under a
+    short lock, and a BM25 model built from a snapshot that a refresh has
+    since invalidated is used once but not cached.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, encoder: Optional[Encoder] = None):
+        self.model_name = model_name
+        self._encoder = encoder
+        self._docs: Dict[str, Tuple[Optional[str], TaskStatus, str]] = {}  # task id -> (silo id, status, text)
+        self._by_silo: Dict[Optional[str], Dict[str, None]] = {}
+        self._silo_versions: Dict[Optional[str], int] = {}  # Bumped whenever a silo's cached model goes stale
+        self._bm25: Dict[Optional[str], Tuple[List[Tuple[str, TaskStatus, str]], "BM25Okapi"]] = {}
+        self._vectors: Dict[str, Tuple[str, "np.ndarray"]] = {}  # task id -> (text, embedding)
+        self._lock = threading.Lock()  # Guards the dicts above; never held while scoring
+
+    def rebuild(self, tasks: Dict[str, Task]):
+        """Index a freshly loaded store from scratch."""
+        self.__init__(self.model_name, self._encoder)
+        for task_id, task in tasks.items():
+            self.refresh(task_id, task)
+
+    def refresh(self, task_id: str, task: Optional[Task]):
+        new_doc = (task.silo_id, task.status, task_query(task)) if task is not None else None
+        with self._lock:
+            old_doc = self._docs.get(task_id)
+            if old_doc == new_doc:
+                return
+            if old_doc is not None:
+                self._by_silo.get(old_doc[0], {}).pop(task_id, None)
+                self._invalidate(old_doc[0])
+                del self._docs[task_id]
+            if new_doc is not None:
+                self._by_silo.setdefault(new_doc[0], {})[task_id] = None
+                self._invalidate(new_doc[0])
+                self._docs[task_id] = new_doc
+            else:
+                self._vectors.pop(task_id, None)
+
+    def _invalidate(self, silo_id: Optional[str]):
+        self._bm25.pop(silo_id, None)
+        self._silo_versions[silo_id] = self._silo_versions.get(silo_id, 0) + 1
+
+    def _silo_bm25(self, silo_id: Optional[str]) -> Tuple[List[Tuple[str, TaskStatus, str]], Optional["BM25Okapi"]]:
+        """The silo's (task id, status, text) rows and their BM25 model."""
+        with self._lock:
+            cached = self._bm25.get(silo_id)
+            if cached is not None:
+                return cached
+            rows = [(t, self._docs[t][1], self._docs[t][2]) for t in self._by_silo.get(silo_id, ())]
+            version = self._silo_versions.get(silo_id, 0)
+        if not rows:
+            return [], None
+
+        from rank_bm25 import BM25Okapi
+        bm25 = BM25Okapi([_tokenize(text) for _, _, text in rows])
+        with self._lock:
+            if self._silo_versions.get(silo_id, 0) == version:
+                self._bm25[silo_id] = (rows, bm25)
+        return rows, bm25
+
+    def _embeddings(self, rows: List[Tuple[str, TaskStatus, str]], encoder: Encoder) -> "np.ndarray":
+        import numpy as np
+        with self._lock:
+            cached = {task_id: self._vectors.get(task_id) for task_id, _, _ in rows}
+        missing = [(task_id, text) for task_id, _, text in rows if (cached[task_id] or ("",))[0] != text]
+        if missing:
+            vectors = np.asarray(encoder([text for _, text in missing]), dtype=np.float32)
+            with self._lock:
+                for (task_id, text), vector in zip(missing, vectors):
+                    cached[task_id] = (text, vector)
+                    if task_id in self._docs:
+                        self._vectors[task_id] = (text, vector)
+        return np.stack([cached[task_id][1] for task_id, _, _ in rows])
+
+    def shortlist(
+        self,
+        task: Task,
+        k: int = RETRIEVAL_TOP_K,
+        silo_id: Optional[str] = None,
+        exclude: Collection[str] = (),
+        excluded_statuses: Collection[TaskStatus] = EXCLUDED_STATUSES
+    ) -> List[Tuple[str, float]]:
+        """Up to k (task id, score) pairs most related to ``task``, best first.
+
+        Builds BM25 models and encodes tasks as needed, so call it from a
+        worker thread rather than the event loop.
+        """
+        import numpy as np
+
+        silo_id = silo_id if silo_id is not None else task.silo_id
+        rows, bm25 = self._silo_bm25(silo_id)
+        if bm25 is None:
+            return []
+
+        keep = [
+            i for i, (t_id, status, _) in enumerate(rows)
+            if t_id != task.id and t_id not in exclude and status not in excluded_statuses
+        ]
+        if not keep:
+            return []
+
+        query = task_query(task)
+        lexical = bm25.get_scores(_tokenize(query))[keep]
+        top = lexical.max()
+        scores = lexical / top if top > 0 else np.zeros_like(lexical)
+
+        candidates = [rows[i] for i in keep]
+        encoder = self._encoder or shared_encoder(self.model_name)
+        vectors = None
+        if encoder is not None:
+            try:
+                vectors = self._embeddings(candidates, encoder)
+                query_vector = np.asarray(encoder([query]), dtype=np.float32)[0]
+            except Exception as e:
+                logger.error(f"Embedding candidates failed, using BM25 only: {e}")
+                vectors = None
+        if vectors is not None:
+            semantic = np.clip(vectors @ query_vector, 0.0, 1.0)
+            scores = LEXICAL_WEIGHT * scores + (1 - LEXICAL_WEIGHT) * semantic
+
+        order = np.argsort(-scores, kind="stable")[:k]
+        return [(candidates[i][0], float(scores[i])) for i in order]
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """TestClient over an empty store kept in a temporary directory.
+
+    The lifespan is not run, so no model host is contacted and the
+    persistence worker writes each commit inline.
+    """
+    from fastapi.testclient import TestClient
+
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    app.load_from_file()
+    return TestClient(app.app)
+
+
+@pytest.fixture
+def silo_id(client):
+    return client.post("/api/silos", json={"name": "Work"}).json()["id"]
+
+
+class FakeAsyncClient:
+    """Stands in for ollama.AsyncClient: answers generate() from ``answer(prompt, system)``.
+
+    Records every prompt and the most calls it ever had in flight at once.
+    """
+
+    def __init__(self, answer, delay: float = 0.0):
+        self.answer = answer
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, model, prompt, system=None, options=None):
+        import asyncio
+
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            return {"response": self.answer(prompt, system)}
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """TaskProcessor with a private cache, an untrained classifier and Ollama marked available.
+
+    Set ``processor._async_client = FakeAsyncClient(...)`` to answer model calls.
+    """
+    from llm_cache import ResponseCache
+    from model_scheduler import ModelScheduler
+    from research_classifier import ResearchClassifier
+    from task_processor import TaskProcessor
+
+    processor = TaskProcessor(
+        cache=ResponseCache(path=str(tmp_path / "cache.sqlite3")),
+        research_classifier=ResearchClassifier(
+            model_path=str(tmp_path / "classifier.joblib"), log_path=str(tmp_path / "decisions.jsonl")
+        ),
+        scheduler=ModelScheduler()
+    )
+    processor.available = True
+    return processor
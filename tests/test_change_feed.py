@@ -0,0 +1,70 @@
+from change_feed import SILO, TASK, ChangeFeed
+
+
+def test_since_lists_each_changed_id_once_oldest_first():
+    feed = ChangeFeed()
+    start = feed.version
+    feed.record(TASK, "a", "b")
+    middle = feed.version
+    feed.record(TASK, "a")
+    feed.record(SILO, "s")
+    assert feed.since(start) == {TASK: ["b", "a"], SILO: ["s"]}
+    assert feed.since(middle) == {TASK: ["a"], SILO: ["s"]}
+    assert feed.since(feed.version) == {TASK: [], SILO: []}
+    assert feed.since(feed.version + 1) is None
+
+
+def test_versions_trimmed_from_the_log_are_refused():
+    feed = ChangeFeed(max_entries=2)
+    start = feed.version
+    for task_id in "abc":
+        feed.record(TASK, task_id)
+    assert feed.since(start) is None
+    assert feed.since(start + 1) == {TASK: ["b", "c"], SILO: []}
+
+
+def test_versions_keep_rising_across_a_reset():
+    feed = ChangeFeed()
+    feed.record(TASK, "a")
+    before = feed.version
+    feed.reset()
+    assert feed.version > before
+    assert feed.since(before) is None
+    assert feed.entity_etag(TASK, "a") == feed.etag()
+
+
+def test_version_zero_is_a_full_resync(client, silo_id):
+    fresh = client.get("/api/changes", params={"since": 0})
+    assert fresh.status_code == 200
+    assert fresh.json()["silos"][0]["id"] == silo_id
+
+    task_id = client.post(
+        "/api/tasks", json={"title": "t", "description": "d", "silo_id": silo_id, "parse_with_ai": False}
+    ).json()["id"]
+    body = client.get("/api/changes", params={"since": 0}).json()
+    assert [task["id"] for task in body["tasks"]] == [task_id]
+    assert body["deleted"] == {"tasks": [], "silos": []}
+
+    # The returned version picks up from there
+    assert client.delete(f"/api/tasks/{task_id}").status_code == 200
+    body = client.get("/api/changes", params={"since": body["version"]}).json()
+    assert body["tasks"] == [] and body["deleted"]["tasks"] == [task_id]
+
+    assert client.get("/api/changes", params={"since": 1}).status_code == 410
+
+
+def test_unchanged_lists_and_entities_answer_304(client, silo_id):
+    listing = client.get("/api/tasks")
+    etag = listing.headers["ETag"]
+    assert client.get("/api/tasks", headers={"If-None-Match": etag}).status_code == 304
+
+    task_id = client.post(
+        "/api/tasks", json={"title": "t", "description": "d", "silo_id": silo_id, "parse_with_ai": False}
+    ).json()["id"]
+    assert client.get("/api/tasks", headers={"If-None-Match": etag}).status_code == 200
+
+    task_etag = client.get(f"/api/tasks/{task_id}").headers["ETag"]
+    assert client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": task_etag}).status_code == 304
+    client.put(f"/api/tasks/{task_id}", json={"title": "renamed"})
+    changed = client.get(f"/api/tasks/{task_id}", headers={"If-None-Match": task_etag})
+    assert changed.status_code == 200 and changed.json()["title"] == "renamed"
@@ -0,0 +1,165 @@
+import os
+
+from changeset import ChangeSet
+from compact_store import CompactTaskStore
+from task_model import Silo, Task, TaskRelationship
+
+
+def make_stores():
+    silo = Silo(name="Work")
+    tasks = [Task(title=f"t{i}", silo_id=silo.id) for i in range(3)]
+    for task in tasks:
+        silo.add_task(task.id)
+    return CompactTaskStore({task.id: task for task in tasks}), {silo.id: silo}, silo, tasks
+
+
+def test_dropped_change_set_leaves_the_stores_untouched():
+    store, silos, silo, tasks = make_stores()
+    before = {task_id: store[task_id] for task_id in store}
+
+    changes = ChangeSet(store, silos)
+    changes.task(tasks[0].id).title = "renamed"
+    changes.delete_task(tasks[1].id)
+    changes.remove_from_silo(silo.id, tasks[1].id)
+    changes.put_task(Task(title="new", silo_id=silo.id))
+
+    assert {task_id: store[task_id] for task_id in store} == before
+    assert list(silo.tasks) == [task.id for task in tasks]
+
+
+def test_reads_see_earlier_staged_edits():
+    store, silos, _, tasks = make_stores()
+    changes = ChangeSet(store, silos)
+    changes.task(tasks[0].id).title = "renamed"
+    assert changes.task(tasks[0].id).title == "renamed"
+
+    changes.delete_task(tasks[0].id)
+    assert not changes.has_task(tasks[0].id)
+    new = Task(title="new", silo_id="s")
+    changes.put_task(new)
+    assert changes.has_task(new.id)
+
+
+def test_apply_writes_tasks_and_membership_in_place():
+    store, silos, silo, tasks = make_stores()
+    changes = ChangeSet(store, silos)
+    new = Task(title="new", silo_id=silo.id)
+    changes.put_task(new)
+    changes.add_to_silo(silo.id, new.id)
+    changes.delete_task(tasks[0].id)
+    changes.remove_from_silo(silo.id, tasks[0].id)
+
+    task_ids, silo_ids = changes.apply()
+
+    assert set(task_ids) == {new.id, tasks[0].id}
+    assert silo_ids == [silo.id]
+    assert silos[silo.id] is silo  # Not replaced by a copy
+    assert list(silo.tasks) == [tasks[1].id, tasks[2].id, new.id]
+    assert tasks[0].id not in store and store[new.id].title == "new"
+
+
+def create_task(client, silo_id, title="t"):
+    return client.post(
+        "/api/tasks", json={"title": title, "description": "d", "silo_id": silo_id, "parse_with_ai": False}
+    ).json()["id"]
+
+
+def test_failed_batch_applies_nothing(client, silo_id):
+    import app
+
+    task_id = create_task(client, silo_id)
+    log_size = os.path.getsize(app.storage.log_path)
+    version = app.change_feed.version
+
+    response = client.post("/api/tasks/bulk", json={
+        "creates": [{"title": "ok", "silo_id": silo_id}],
+        "updates": [{"id": task_id, "title": "renamed"}, {"id": task_id, "status": "bogus"}],
+        "deletes": ["missing"]
+    })
+
+    assert response.status_code == 400
+    errors = response.json()["detail"]["errors"]
+    assert [(e["operation"], e["index"], e["status_code"]) for e in errors] == [("updates", 1, 400), ("deletes", 0, 404)]
+    assert list(app.tasks) == [task_id]
+    assert app.tasks[task_id].title == "t"
+    assert list(app.silos[silo_id].tasks) == [task_id]
+    assert os.path.getsize(app.storage.log_path) == log_size
+    assert app.change_feed.version == version
+
+
+def test_batch_is_applied_with_one_commit(client, silo_id, monkeypatch):
+    import app
+
+    commits = []
+    commit = app.persistence.commit
+
+    async def counting_commit():
+        commits.append(1)
+        await commit()
+
+    monkeypatch.setattr(app.persistence, "commit", counting_commit)
+    response = client.patch("/api/tasks/bulk", json={
+        "creates": [{"ref": "a", "title": "A", "silo_id": silo_id}, {"ref": "b", "title": "B", "silo_id": silo_id}],
+        "updates": [{"id": "a", "status": "in_progress"}],
+        "relationships": [{"task_id": "b", "related_task_id": "a", "relationship_type": "depends_on"}]
+    })
+
+    assert response.status_code == 200
+    assert commits == [1]
+    a, b = (item["id"] for item in response.json()["results"]["creates"])
+    assert app.tasks[b].dependencies == [a] and app.tasks[a].dependents == [b]
+    assert app.tasks[a].status.value == "in_progress"
+    assert list(app.silos[silo_id].tasks) == [a, b]
+    assert app.dependency_index.top_ready(10) == [a]
+
+
+def test_deleting_a_task_drops_relationships_staged_in_the_same_batch(client, silo_id):
+    import app
+
+    task_id = create_task(client, silo_id)
+    response = client.post("/api/tasks/bulk", json={
+        "creates": [{"ref": "p", "title": "P", "silo_id": silo_id}],
+        "relationships": [{"task_id": task_id, "related_task_id": "p", "relationship_type": "related_to"}],
+        "deletes": ["p"]
+    })
+
+    assert response.status_code == 200
+    assert app.tasks[task_id].related == []
+    assert list(app.silos[silo_id].tasks) == [task_id]
+
+
+def test_referencing_tracks_relationships_staged_in_the_set():
+    store, silos, _, tasks = make_stores()
+    changes = ChangeSet(store, silos)
+    new = Task(title="new", silo_id="s", dependencies=[tasks[0].id])
+    changes.put_task(new)
+    changes.add_relationship(tasks[1].id, tasks[2].id, TaskRelationship.RELATED_TO)
+
+    assert changes.referencing(tasks[0].id) == {new.id}
+    assert changes.referencing(tasks[2].id) == {tasks[1].id}
+    assert changes.referencing(tasks[1].id) == set()
+    assert changes.task(tasks[1].id).related == [tasks[2].id]
+
+
+def test_bulk_deletes_visit_only_the_tasks_that_reference_them(client, silo_id, monkeypatch):
+    from task_model import Task as TaskModel
+
+    visited = []
+    remove_relationship = TaskModel.remove_relationship
+
+    def counting_remove(self, task_id):
+        visited.append(self.id)
+        remove_relationship(self, task_id)
+
+    monkeypatch.setattr(TaskModel, "remove_relationship", counting_remove)
+    creates = [{"ref": f"c{i}", "title": f"C{i}", "silo_id": silo_id} for i in range(50)]
+    response = client.post("/api/tasks/bulk", json={
+        "creates": creates,
+        "relationships": [{"task_id": "c1", "related_task_id": "c0", "relationship_type": "depends_on"}],
+        "deletes": ["c0", "c2", "c3"]
+    })
+
+    assert response.status_code == 200
+    ids = [item["id"] for item in response.json()["results"]["creates"]]
+    assert visited == [ids[1]]
+    assert ids[1] in {task["id"] for task in client.get("/api/tasks", params={"limit": 100}).json()}
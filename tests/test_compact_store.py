@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta, timezone
+
+from compact_store import CompactTaskStore
+from snapshot import SnapshotReader, write_snapshot
+from task_model import Task, TaskPriority, TaskStatus
+
+
+def make_task(**fields):
+    defaults = {"title": "Task", "silo_id": "s"}
+    return Task(**{**defaults, **fields})
+
+
+def test_round_trip_returns_what_was_stored():
+    tasks = [
+        make_task(),
+        make_task(
+            status=TaskStatus.IN_PROGRESS,
+            priority=TaskPriority.HIGH,
+            due_date=datetime(2026, 11, 1, 9, 30),
+            estimated_time=timedelta(hours=2, microseconds=5),
+            completion_percentage=40,
+            tags=["a", "b"],
+            dependencies=["x"],
+            notes=[{"text": "note", "by": "me"}]
+        ),
+        # Values the columns cannot hold go to the overflow dict
+        make_task(due_date=datetime(2026, 11, 1, tzinfo=timezone.utc))
+    ]
+    store = CompactTaskStore({task.id: task for task in tasks})
+    assert len(store) == 3
+    for task in tasks:
+        assert store[task.id] == task
+        assert store.get_field(task.id, "due_date") == task.due_date
+        assert store.get_field(task.id, "tags") == task.tags
+
+
+def test_reads_are_copies_until_written_back():
+    task = make_task(tags=["a"])
+    store = CompactTaskStore({task.id: task})
+    read = store[task.id]
+    read.title = "changed"
+    read.tags.append("b")
+    assert store[task.id] == task
+
+    store[task.id] = read
+    assert store[task.id].title == "changed"
+    assert store[task.id].tags == ["a", "b"]
+
+
+def test_deleted_rows_are_reused_without_leaking_overflow():
+    aware = make_task(due_date=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    store = CompactTaskStore({aware.id: aware})
+    del store[aware.id]
+    plain = make_task(due_date=datetime(2026, 1, 1))
+    store[plain.id] = plain
+    assert aware.id not in store
+    assert store[plain.id].due_date.tzinfo is None
+    assert list(store) == [plain.id]
+
+
+def test_copy_is_independent():
+    task = make_task()
+    store = CompactTaskStore({task.id: task})
+    clone = store.copy()
+    changed = store[task.id]
+    changed.status = TaskStatus.COMPLETED
+    store[task.id] = changed
+    added = make_task()
+    store[added.id] = added
+    assert clone[task.id].status == TaskStatus.NOT_STARTED
+    assert added.id not in clone
+
+
+def test_snapshot_records_are_served_until_written(tmp_path):
+    tasks = [make_task(title=f"t{i}") for i in range(3)]
+    path = str(tmp_path / "data.snapshot")
+    write_snapshot(path, ((task.id, None, task) for task in tasks), [])
+    reader = SnapshotReader(path)
+    store = CompactTaskStore()
+    store.attach(reader, reader.task_slots())
+
+    assert sorted(store) == sorted(task.id for task in tasks)
+    assert store[tasks[0].id] == tasks[0]
+    assert store.raw_record(tasks[0].id) is not None
+
+    changed = store[tasks[0].id]
+    changed.title = "written"
+    store[tasks[0].id] = changed
+    del store[tasks[1].id]
+    assert store.raw_record(tasks[0].id) is None
+    assert store[tasks[0].id].title == "written"
+    assert len(store) == 2
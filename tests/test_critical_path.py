@@ -0,0 +1,102 @@
+import random
+
+import pytest
+
+from critical_path import (
+    DependencyCycleError, acyclic_edges, compute_critical_path, find_cycle, strongly_connected_components,
+    topological_order
+)
+from task_processor import DEFAULT_TASK_HOURS
+
+
+def test_schedule_of_a_known_dag():
+    # a(3) -> b(2) -> d(4), a -> c(1) -> d
+    nodes = ["a", "b", "c", "d"]
+    edges = [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]
+    result = compute_critical_path(nodes, edges, {"a": 3, "b": 2, "c": 1, "d": 4})
+
+    assert result["critical_path"] == ["a", "b", "d"]
+    assert result["duration"] == 9
+    assert result["order"] == ["a", "b", "c", "d"]
+    assert result["schedule"] == {
+        "a": {"earliest_start": 0, "earliest_finish": 3, "latest_start": 0, "latest_finish": 3, "slack": 0},
+        "b": {"earliest_start": 3, "earliest_finish": 5, "latest_start": 3, "latest_finish": 5, "slack": 0},
+        "c": {"earliest_start": 3, "earliest_finish": 4, "latest_start": 4, "latest_finish": 5, "slack": 1},
+        "d": {"earliest_start": 5, "earliest_finish": 9, "latest_start": 5, "latest_finish": 9, "slack": 0}
+    }
+
+
+def test_cycles_are_reported():
+    nodes = ["a", "b", "c", "d"]
+    edges = [("a", "b"), ("b", "c"), ("c", "b"), ("c", "d")]
+    assert find_cycle(nodes, edges) == ["b", "c", "b"]
+    assert find_cycle(nodes, [("a", "b"), ("b", "c")]) is None
+    with pytest.raises(DependencyCycleError) as error:
+        compute_critical_path(nodes, edges, {})
+    assert error.value.cycle == ["b", "c", "b"]
+
+
+def test_only_edges_inside_a_cycle_are_dropped():
+    # d only sits downstream of the a <-> b cycle, and comes first in node order
+    nodes = ["d", "a", "b", "e"]
+    edges = [("a", "b"), ("b", "a"), ("b", "d"), ("d", "e")]
+    kept, dropped = acyclic_edges(nodes, edges)
+    assert dropped == [("b", "a")]
+    assert kept == [("a", "b"), ("b", "d"), ("d", "e")]
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_dropping_breaks_every_cycle_and_nothing_else(seed):
+    rng = random.Random(seed)
+    nodes = [f"n{i}" for i in range(12)]
+    edges = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(rng.randint(5, 30))]
+
+    def reachable(start, edge_list):
+        seen, stack = {start}, [start]
+        while stack:
+            node = stack.pop()
+            for a, b in edge_list:
+                if a == node and b not in seen:
+                    seen.add(b)
+                    stack.append(b)
+        return seen
+
+    component = strongly_connected_components(nodes, edges)
+    for a in nodes:
+        for b in nodes:
+            same = b in reachable(a, edges) and a in reachable(b, edges)
+            assert (component[a] == component[b]) == same
+
+    kept, dropped = acyclic_edges(nodes, edges)
+    assert topological_order(nodes, kept)[1] == []
+    for a, b in dropped:
+        assert component[a] == component[b]
+
+
+def test_tasks_without_an_estimate_use_the_default_duration(client, silo_id):
+    response = client.post("/api/tasks/bulk", json={
+        "creates": [{"ref": "a", "title": "A", "silo_id": silo_id}, {"ref": "b", "title": "B", "silo_id": silo_id}],
+        "relationships": [{"task_id": "b", "related_task_id": "a", "relationship_type": "depends_on"}]
+    })
+    a, b = (item["id"] for item in response.json()["results"]["creates"])
+    assert client.put(f"/api/tasks/{a}", json={"estimated_time": "PT2H"}).status_code == 200
+
+    path = client.get("/api/tasks/critical-path", params={"silo_id": silo_id}).json()
+    assert path["critical_path"] == [a, b]
+    assert path["duration"] == 2 + DEFAULT_TASK_HOURS
+
+
+def test_a_dependency_cycle_answers_409(client, silo_id):
+    response = client.post("/api/tasks/bulk", json={
+        "creates": [{"ref": "a", "title": "A", "silo_id": silo_id}, {"ref": "b", "title": "B", "silo_id": silo_id}],
+        "relationships": [
+            {"task_id": "b", "related_task_id": "a", "relationship_type": "depends_on"},
+            {"task_id": "a", "related_task_id": "b", "relationship_type": "depends_on"}
+        ]
+    })
+    a, b = (item["id"] for item in response.json()["results"]["creates"])
+
+    response = client.get("/api/tasks/critical-path")
+    assert response.status_code == 409
+    cycle = response.json()["detail"]["cycle"]
+    assert set(cycle) == {a, b} and cycle[0] == cycle[-1]
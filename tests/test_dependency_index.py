@@ -0,0 +1,59 @@
+import random
+
+import pytest
+
+from task_graph import CLOSED_STATUSES, DependencyIndex
+from task_model import Task, TaskStatus
+
+
+def expected_ready(tasks):
+    def unmet(dep_id):
+        return dep_id in tasks and tasks[dep_id].status != TaskStatus.COMPLETED
+
+    return {
+        task_id for task_id, task in tasks.items()
+        if task.status not in CLOSED_STATUSES and not any(unmet(dep_id) for dep_id in task.dependencies)
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ready_set_matches_a_full_scan(seed):
+    rng = random.Random(seed)
+    index = DependencyIndex()
+    tasks = {}
+    ids = [f"t{i}" for i in range(40)]  # Dependencies may name tasks that do not exist yet
+
+    for _ in range(400):
+        task_id = rng.choice(ids)
+        if task_id in tasks and rng.random() < 0.15:
+            del tasks[task_id]
+            index.refresh(task_id, None)
+        else:
+            task = Task(
+                id=task_id,
+                title=task_id,
+                silo_id="s",
+                status=rng.choice(list(TaskStatus)),
+                dependencies=rng.sample(ids, rng.randint(0, 3))
+            )
+            tasks[task_id] = task
+            index.refresh(task_id, task)
+
+        ready = expected_ready(tasks)
+        assert index.ready == ready
+        assert set(index.top_ready(len(ids))) == ready
+        assert index.next_task_id() in (ready or {None})
+
+
+def test_completing_a_dependency_releases_its_dependents():
+    index = DependencyIndex()
+    first = Task(id="a", title="a", silo_id="s")
+    second = Task(id="b", title="b", silo_id="s", dependencies=["a"])
+    index.refresh("b", second)
+    index.refresh("a", first)
+    assert index.ready == {"a"}
+
+    first.status = TaskStatus.COMPLETED
+    index.refresh("a", first)
+    assert index.ready == {"b"}
+    assert index.top_ready(5) == ["b"]
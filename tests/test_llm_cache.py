@@ -0,0 +1,62 @@
+import asyncio
+import sqlite3
+import threading
+
+from llm_cache import ResponseCache
+
+
+def accessed_at(cache, key):
+    db = sqlite3.connect(cache.path)
+    try:
+        row = db.execute("SELECT accessed_at FROM responses WHERE key = ?", (key,)).fetchone()
+    finally:
+        db.close()
+    return row and row[0]
+
+
+def test_memory_hits_keep_an_entry_from_being_evicted(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.put("hot", "a")
+    cache.put("cold", "b")
+    written = accessed_at(cache, "hot")
+    assert cache.get("hot") == "a"
+    assert cache.stats()["memory_hits"] == 1
+    # The hit reaches disk with the next write, before that write evicts
+    cache.put("new", "c")
+    assert accessed_at(cache, "hot") > written
+    assert accessed_at(cache, "cold") is None
+    assert cache.stats()["disk_entries"] == 2
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"), ttl=-1)
+    cache.put("key", "value")
+    assert cache.get("key") is None
+    assert cache.stats()["misses"] == 1
+    assert accessed_at(cache, "key") is None
+
+
+def test_async_access_keeps_sqlite_off_the_loop(tmp_path):
+    cache = ResponseCache(path=str(tmp_path / "cache.sqlite3"))
+    disk_threads = []
+    for name in ("_get_disk", "_put_disk"):
+        method = getattr(cache, name)
+
+        def recording(*args, _method=method):
+            disk_threads.append(threading.get_ident())
+            return _method(*args)
+        setattr(cache, name, recording)
+
+    async def scenario():
+        assert await cache.aget("key") is None
+        await cache.aput("key", "value")
+        assert await cache.aget("key") == "value"  # Served from memory
+        cache._memory.clear()
+        assert await cache.aget("key") == "value"  # Read back from disk
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(disk_threads) == 3
+    assert loop_thread not in disk_threads
+    assert cache.stats()["memory_hits"] == 1
+    assert cache.stats()["disk_hits"] == 1
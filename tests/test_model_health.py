@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+from fastapi.testclient import TestClient
+
+from conftest import FakeAsyncClient
+
+
+class DownClient:
+    """ollama.Client stand-in for a host that refuses every connection."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def list(self):
+        raise ConnectionError("Connection refused")
+
+    def generate(self, **request):
+        raise AssertionError("Model called while Ollama is down")
+
+
+class AnsweringClient(DownClient):
+    def generate(self, **request):
+        return {"response": "Outline Drafted Today"}
+
+
+class UpClient(DownClient):
+    models = [{"model": "deepseek-r1:1.5b"}]
+
+    def list(self):
+        return {"models": self.models}
+
+
+def never_called(prompt, system):
+    raise AssertionError("Model called while Ollama is down")
+
+
+def test_model_calls_fall_back_while_ollama_is_down(processor):
+    processor.available = False
+    processor._client = DownClient()
+    processor._async_client = FakeAsyncClient(never_called)
+
+    assert processor._call_model("Parse this task: buy milk") == ""
+
+    result = asyncio.run(processor.process_task_dump_async("- Draft the outline\n- Write the essay"))
+    assert [node["data"]["title"] for node in result["nodes"]] == ["Draft The Outline", "Write The Essay"]
+    assert result["model_calls"] == 0
+    assert processor.async_client.prompts == []
+
+
+def test_cached_answers_are_served_while_ollama_is_down(processor):
+    processor._client = AnsweringClient()
+    assert processor._call_model("title please", temperature=0.1) == "Outline Drafted Today"
+
+    processor.available = False
+    processor._client = DownClient()
+    assert processor._call_model("title please", temperature=0.1) == "Outline Drafted Today"
+    assert processor._call_model("something new", temperature=0.1) == ""
+
+
+def test_check_health_caches_the_probe_result(processor, monkeypatch):
+    monkeypatch.setattr("ollama.Client", DownClient)
+    assert processor.check_health() is False
+    assert processor.health()["available"] is False
+    assert "Connection refused" in processor.health()["last_error"]
+
+    monkeypatch.setattr(UpClient, "models", [{"model": "llama3:8b"}])
+    monkeypatch.setattr("ollama.Client", UpClient)
+    assert processor.check_health() is False
+    assert "not found" in processor.last_error
+
+    monkeypatch.setattr(UpClient, "models", [{"model": processor.model}])
+    assert processor.check_health() is True
+    assert processor.health()["last_error"] is None
+    assert processor.health()["checked_at"] is not None
+
+
+def test_app_boots_with_ollama_unreachable(tmp_path, monkeypatch, processor):
+    import app
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("ollama.Client", DownClient)
+    processor.available = None
+    processor._async_client = FakeAsyncClient(never_called)
+    monkeypatch.setattr(app, "task_processor", processor)
+
+    with TestClient(app.app) as client:
+        deadline = time.monotonic() + 5
+        while client.get("/api/ai/health").json()["available"] is None:
+            assert time.monotonic() < deadline, "Health probe never ran"
+            time.sleep(0.01)
+
+        health = client.get("/api/ai/health").json()
+        assert health["available"] is False
+        assert "Connection refused" in health["last_error"]
+
+        silo = client.post("/api/silos", json={"name": "Work"})
+        assert silo.status_code == 200
+        processed = client.post("/api/tasks/process", json={"tasks": ["- Draft the outline"]})
+        assert processed.status_code == 200
+        assert processed.json()["nodes"][0]["data"]["title"] == "Draft The Outline"
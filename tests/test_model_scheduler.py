@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from model_scheduler import BATCH, INTERACTIVE, ModelBusyError, ModelScheduler, _on_event_loop
+from task_model import Task
+
+
+def wait_for_queue(scheduler, lane, length):
+    deadline = time.monotonic() + 2
+    while scheduler.stats()["lanes"][lane]["queued"] < length:
+        assert time.monotonic() < deadline, "waiter never queued"
+        time.sleep(0.005)
+
+
+def test_batch_leaves_the_last_slot_for_interactive():
+    scheduler = ModelScheduler(max_in_flight=2, queue_timeout=0.05)
+    scheduler.acquire(BATCH)
+    with pytest.raises(ModelBusyError) as busy:
+        scheduler.acquire(BATCH)  # Would take the reserved slot; waits, then times out
+    assert busy.value.status_code == 503
+    scheduler.acquire(INTERACTIVE)  # The reserved slot is still free
+    assert scheduler.stats()["lanes"][BATCH]["queued"] == 0
+
+
+def test_interactive_waiters_are_served_before_earlier_batch_waiters():
+    scheduler = ModelScheduler(max_in_flight=2, queue_timeout=2)
+    scheduler.acquire(INTERACTIVE)
+    scheduler.acquire(INTERACTIVE)
+    order = []
+
+    def call(lane):
+        with scheduler.slot(lane):
+            order.append(lane)
+
+    batch = threading.Thread(target=call, args=(BATCH,))
+    batch.start()
+    wait_for_queue(scheduler, BATCH, 1)
+    interactive = threading.Thread(target=call, args=(INTERACTIVE,))
+    interactive.start()
+    wait_for_queue(scheduler, INTERACTIVE, 1)
+
+    scheduler.release(INTERACTIVE)
+    interactive.join(2)
+    scheduler.release(INTERACTIVE)
+    batch.join(2)
+    assert order == [INTERACTIVE, BATCH]
+
+
+def test_full_queue_is_rejected_with_a_retry_hint():
+    scheduler = ModelScheduler(max_in_flight=1, max_queued={INTERACTIVE: 1, BATCH: 1}, queue_timeout=2)
+    scheduler.acquire(INTERACTIVE)
+    waiter = threading.Thread(target=scheduler.acquire, args=(INTERACTIVE,))
+    waiter.start()
+    wait_for_queue(scheduler, INTERACTIVE, 1)
+
+    with pytest.raises(ModelBusyError) as busy:
+        scheduler.admit(INTERACTIVE)
+    assert busy.value.status_code == 429
+    assert busy.value.retry_after >= 1
+    scheduler.release(INTERACTIVE)
+    waiter.join(2)
+
+
+def test_blocking_acquire_on_the_event_loop_fails_fast():
+    scheduler = ModelScheduler(max_in_flight=1)
+    scheduler.acquire(INTERACTIVE)
+
+    async def call():
+        scheduler.acquire(INTERACTIVE)
+
+    with pytest.raises(ModelBusyError) as busy:
+        asyncio.run(call())
+    assert busy.value.status_code == 503
+
+
+def test_coroutine_waiters_get_freed_slots():
+    scheduler = ModelScheduler(max_in_flight=1)
+
+    async def run():
+        order = []
+
+        async def call(name):
+            async with scheduler.aslot(INTERACTIVE):
+                order.append(name)
+                await asyncio.sleep(0)
+
+        await asyncio.gather(*(call(i) for i in range(5)))
+        return order
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+    assert scheduler.stats()["lanes"][INTERACTIVE]["in_flight"] == 0
+
+
+def test_create_task_suggests_a_silo_off_the_event_loop(client, monkeypatch):
+    import app
+
+    silo_ids = [client.post("/api/silos", json={"name": name}).json()["id"] for name in ("Work", "Home")]
+    calls = []
+
+    def suggest_silo(task, available_silos, ranked=None):
+        calls.append(_on_event_loop())
+        return silo_ids[1]
+
+    monkeypatch.setattr(app.task_processor, "parse_task", lambda text: Task(title="Paint", silo_id=""))
+    monkeypatch.setattr(app.task_processor, "estimate_completion_time", lambda task: None)
+    monkeypatch.setattr(app.task_processor, "suggest_silo", suggest_silo)
+    monkeypatch.setattr(app.silo_embeddings, "_encode", lambda texts: None)
+
+    response = client.post("/api/tasks", json={"title": "Paint the fence", "description": "d"})
+    assert response.status_code == 200
+    assert response.json()["silo_id"] == silo_ids[1]
+    assert calls == [False]
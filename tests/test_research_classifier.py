@@ -0,0 +1,87 @@
+import asyncio
+import json
+import threading
+
+import joblib
+import pytest
+
+from research_classifier import MIN_EXAMPLES, ResearchClassifier, _LinearScorer, read_decisions, train
+
+RESEARCH = ["Research the history of {}", "Write a literature review on {}", "Find studies about {}"]
+CHORES = ["Buy groceries for {}", "Clean the kitchen before {}", "Call mom about {}"]
+TOPICS = ["rome", "solar power", "bees", "jazz", "volcanoes", "tides", "chess", "coffee", "glaciers"]
+
+
+def write_log(path, count=MIN_EXAMPLES):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count * 3):
+            topic = TOPICS[i % len(TOPICS)] + f" {i}"
+            f.write(json.dumps({"text": RESEARCH[i % 3].format(topic), "label": True}) + "\n")
+            f.write(json.dumps({"text": CHORES[i % 3].format(topic), "label": False}) + "\n")
+
+
+@pytest.fixture
+def trained(tmp_path):
+    log_path, model_path = str(tmp_path / "decisions.jsonl"), str(tmp_path / "model.joblib")
+    write_log(log_path)
+    return log_path, model_path, train(log_path, model_path)
+
+
+def test_train_fits_and_saves_a_model(trained):
+    _, model_path, result = trained
+    assert result["yes"] == result["no"] == MIN_EXAMPLES * 3
+    assert result["cv_accuracy"] > 0.9
+    assert joblib.load(model_path).predict(["Research the history of tea"])[0]
+
+
+def test_train_needs_enough_examples_of_each_kind(tmp_path):
+    log_path = str(tmp_path / "decisions.jsonl")
+    write_log(log_path, count=2)
+    with pytest.raises(ValueError):
+        train(log_path, str(tmp_path / "model.joblib"))
+
+
+def test_linear_scorer_matches_predict_proba(trained):
+    _, model_path, _ = trained
+    pipeline = joblib.load(model_path)
+    scorer = _LinearScorer(pipeline)
+    texts = ["Research the history of tea", "Buy groceries", "Find studies about the kitchen", "", "unknown words"]
+    expected = pipeline.predict_proba(texts)[:, list(pipeline.classes_).index(True)]
+    for text, probability in zip(texts, expected):
+        assert scorer.probability_true(text) == pytest.approx(probability, abs=1e-9)
+
+
+def test_unsure_or_untrained_predictions_fall_back_to_the_model(trained, tmp_path):
+    log_path, model_path, _ = trained
+    classifier = ResearchClassifier(model_path=model_path, log_path=log_path, confidence=0.85)
+    assert classifier.predict("Research the history of tea and bees") is True
+    assert classifier.predict("Buy groceries for the kitchen") is False
+
+    strict = ResearchClassifier(model_path=model_path, log_path=log_path, confidence=1.0)
+    assert strict.predict("Research the history of tea") is None
+
+    untrained = ResearchClassifier(model_path=str(tmp_path / "missing.joblib"), log_path=log_path)
+    assert untrained.predict("Research the history of tea") is None
+    assert untrained.stats()["model_fallbacks"] == 1
+
+
+def test_arecord_appends_off_the_event_loop(tmp_path, monkeypatch):
+    log_path = str(tmp_path / "decisions.jsonl")
+    classifier = ResearchClassifier(model_path=str(tmp_path / "model.joblib"), log_path=log_path)
+    threads = []
+    record = classifier.record
+
+    def recording(*args):
+        threads.append(threading.get_ident())
+        record(*args)
+
+    monkeypatch.setattr(classifier, "record", recording)
+
+    async def scenario():
+        await classifier.arecord("Research bees", False)
+        await classifier.arecord("Research bees", True)
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(scenario())
+    assert len(threads) == 2 and loop_thread not in threads
+    assert read_decisions(log_path) == [("Research bees", True)]  # The latest answer wins
@@ -0,0 +1,125 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+from starlette.requests import Request
+
+from serialization import GZIP_MIN_BYTES, SerializedCache, json_response
+from task_model import Silo, Task, TaskPriority
+
+
+def make_request(accept_encoding=None):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+def response_model_encoding(model, value):
+    """What FastAPI sends for ``value`` under ``response_model=model``."""
+    return json.loads(json.dumps(TypeAdapter(model).dump_python(value, mode="json")))
+
+
+def test_cached_bytes_match_the_response_model_encoding():
+    task = Task(
+        title="Réviser — chapitre 2",
+        silo_id="s",
+        priority=TaskPriority.URGENT,
+        due_date=datetime(2026, 3, 1, 9, 30),
+        estimated_time=timedelta(hours=1, minutes=30),
+        dependencies=["a"],
+    )
+    task.add_note("started")
+    other = Task(title="other", silo_id="s")
+    store = {task.id: task, other.id: other}
+    cache = SerializedCache(Task)
+
+    assert json.loads(cache.encode(task.id, store)) == response_model_encoding(Task, task)
+    assert json.loads(cache.encode_list([other.id, task.id], store)) == response_model_encoding(List[Task], [other, task])
+    assert cache.encode_list([], store) == b"[]"
+
+    silo = Silo(name="Work", tasks=[task.id, other.id])
+    assert json.loads(SerializedCache(Silo).encode(silo.id, {silo.id: silo})) == response_model_encoding(Silo, silo)
+
+
+def test_entries_are_reused_until_invalidated():
+    task = Task(title="one", silo_id="s")
+    store = {task.id: task}
+    cache = SerializedCache(Task)
+
+    first = cache.encode(task.id, store)
+    store[task.id] = task.model_copy(update={"title": "renamed"})
+    assert cache.encode(task.id, store) is first
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1}
+
+    cache.invalidate(task.id, "unknown")
+    assert json.loads(cache.encode(task.id, store))["title"] == "renamed"
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 2}
+
+
+def test_task_and_silo_changes_invalidate_the_served_bytes(client, silo_id):
+    import app
+
+    task_id = client.post("/api/tasks", json={
+        "title": "Draft", "description": "d", "silo_id": silo_id, "parse_with_ai": False
+    }).json()["id"]
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "Draft"
+    assert task_id in app.task_json._bytes
+
+    client.put(f"/api/tasks/{task_id}", json={"title": "Final"})
+    assert task_id not in app.task_json._bytes
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "Final"
+    assert [task["title"] for task in client.get("/api/tasks").json()] == ["Final"]
+
+    assert client.get(f"/api/silos/{silo_id}").json()["name"] == "Work"
+    client.put(f"/api/silos/{silo_id}", json={"name": "Home"})
+    assert silo_id not in app.silo_json._bytes
+    assert client.get(f"/api/silos/{silo_id}").json()["name"] == "Home"
+
+    client.delete(f"/api/tasks/{task_id}")
+    assert client.get(f"/api/silos/{silo_id}").json()["tasks"] == []
+    assert client.get("/api/tasks").json() == []
+
+
+def test_small_bodies_are_sent_as_is():
+    body = b'{"id":"x"}'
+    response = json_response(make_request("gzip"), body, {"ETag": '"1"'})
+    assert response.body == body
+    assert "content-encoding" not in response.headers
+    assert "vary" not in response.headers
+    assert response.headers["etag"] == '"1"'
+    assert response.media_type == "application/json"
+
+
+def test_large_bodies_are_gzipped_only_when_accepted():
+    body = json.dumps(["x" * 100] * (GZIP_MIN_BYTES // 100)).encode()
+    assert len(body) >= GZIP_MIN_BYTES
+
+    compressed = json_response(make_request("br, gzip"), body)
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert gzip.decompress(compressed.body) == body
+
+    plain = json_response(make_request(), body)
+    assert plain.body == body
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+
+    just_under = json_response(make_request("gzip"), b" " * (GZIP_MIN_BYTES - 1))
+    assert "content-encoding" not in just_under.headers
+
+
+def test_task_listing_is_gzipped_past_the_threshold(client, silo_id):
+    for i in range(60):
+        client.post("/api/tasks", json={
+            "title": f"Task {i}", "description": "d" * 300, "silo_id": silo_id, "parse_with_ai": False
+        })
+
+    compressed = client.get("/api/tasks", params={"limit": 60}, headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert compressed.headers["vary"] == "Accept-Encoding"
+    assert len(compressed.json()) == 60
+
+    small = client.get("/api/tasks", params={"limit": 1}, headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    assert len(small.json()) == 1
@@ -0,0 +1,59 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from silo_embeddings import SiloEmbeddingIndex
+from task_model import Silo, Task
+
+VOCABULARY = ["paper", "research", "garden", "plants", "invoice", "tax"]
+
+
+class BagOfWords:
+    """Deterministic stand-in encoder that records which threads called it."""
+
+    def __init__(self):
+        self.threads = set()
+
+    def __call__(self, texts):
+        self.threads.add(threading.get_ident())
+        vectors = np.array([[text.lower().count(word) + 0.01 for word in VOCABULARY] for text in texts])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_index():
+    encoder = BagOfWords()
+    index = SiloEmbeddingIndex(encoder=encoder)
+    silos = [Silo(name="Research paper"), Silo(name="Garden plants"), Silo(name="Tax invoice")]
+    for silo in silos:
+        index.refresh_silo(silo.id, silo)
+    return index, encoder, silos
+
+
+def test_arank_matches_rank_and_encodes_off_the_loop():
+    index, encoder, silos = make_index()
+    expected = SiloEmbeddingIndex(encoder=BagOfWords())
+    for silo in silos:
+        expected.refresh_silo(silo.id, silo)
+
+    async def run():
+        return await index.arank("write the research paper"), threading.get_ident()
+
+    ranked, loop_thread = asyncio.run(run())
+    assert ranked == expected.rank("write the research paper")
+    assert ranked[0][0] == silos[0].id
+    assert loop_thread not in encoder.threads
+
+
+def test_arank_picks_up_changes_and_deletes():
+    index, _, silos = make_index()
+    garden = silos[1]
+
+    async def run():
+        await index.arank("plants")
+        index.refresh_task("t1", Task(title="invoice tax paper", silo_id=garden.id))
+        index.refresh_silo(silos[0].id, None)
+        return await index.arank("plants")
+
+    ranked = asyncio.run(run())
+    assert [silo_id for silo_id, _ in ranked] == [garden.id, silos[2].id]
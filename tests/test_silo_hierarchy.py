@@ -0,0 +1,104 @@
+import random
+from datetime import timedelta
+
+import pytest
+
+from silo_hierarchy import SiloHierarchy
+from task_model import Silo, Task, TaskStatus
+
+
+def expected_rollup(silo_id, silos, tasks):
+    def parent(sid):
+        declared = silos[sid].parent_id
+        return declared if declared in silos else None
+
+    def in_subtree(sid):
+        while sid is not None:
+            if sid == silo_id:
+                return True
+            sid = parent(sid)
+        return False
+
+    members = [task for task in tasks.values() if task.silo_id in silos and in_subtree(task.silo_id)]
+    by_status = {}
+    for task in members:
+        by_status[task.status.value] = by_status.get(task.status.value, 0) + 1
+    seconds = sum(task.estimated_time.total_seconds() for task in members if task.estimated_time)
+    completion = sum(task.completion_percentage or 0 for task in members)
+    return {
+        "task_count": len(members),
+        "by_status": by_status,
+        "estimated_hours": round(seconds / 3600, 4),
+        "average_completion": round(completion / len(members), 2) if members else 0.0
+    }
+
+
+def descendants(silo_id, silos):
+    found = {silo_id}
+    changed = True
+    while changed:
+        changed = False
+        for sid, silo in silos.items():
+            if sid not in found and silo.parent_id in found:
+                found.add(sid)
+                changed = True
+    return found
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_rollups_match_a_full_recount(seed):
+    rng = random.Random(seed)
+    hierarchy = SiloHierarchy()
+    silos, tasks = {}, {}
+
+    for step in range(300):
+        action = rng.random()
+        if action < 0.15 or not silos:
+            silo = Silo(name=f"s{step}", parent_id=rng.choice([None, *silos]))
+            silos[silo.id] = silo
+            hierarchy.refresh_silo(silo.id, silo)
+        elif action < 0.25:
+            silo_id = rng.choice(list(silos))
+            allowed = [sid for sid in silos if sid not in descendants(silo_id, silos)]
+            silos[silo_id].parent_id = rng.choice([None, *allowed])
+            hierarchy.refresh_silo(silo_id, silos[silo_id])
+        elif action < 0.3:
+            silo_id = rng.choice(list(silos))
+            del silos[silo_id]
+            hierarchy.refresh_silo(silo_id, None)
+        elif action < 0.85 or not tasks:
+            task = tasks.get(rng.choice(list(tasks))) if tasks and rng.random() < 0.5 else None
+            task = task or Task(title=f"t{step}", silo_id="placeholder")
+            task.silo_id = rng.choice(list(silos))
+            task.status = rng.choice(list(TaskStatus))
+            task.estimated_time = rng.choice([None, timedelta(minutes=rng.randint(1, 300))])
+            task.completion_percentage = rng.randint(0, 100)
+            tasks[task.id] = task
+            hierarchy.refresh_task(task.id, task)
+        else:
+            task_id = rng.choice(list(tasks))
+            del tasks[task_id]
+            hierarchy.refresh_task(task_id, None)
+
+        for silo_id in silos:
+            assert hierarchy.rollup(silo_id) == expected_rollup(silo_id, silos, tasks)
+
+
+def test_paths_and_ancestors_follow_reparenting():
+    hierarchy = SiloHierarchy()
+    root, middle, leaf = Silo(name="root"), Silo(name="middle"), Silo(name="leaf")
+    middle.parent_id, leaf.parent_id = root.id, middle.id
+    for silo in (leaf, middle, root):  # Children may arrive before their parents
+        hierarchy.refresh_silo(silo.id, silo)
+    assert hierarchy.path(leaf.id) == [root.id, middle.id]
+    assert hierarchy.is_ancestor(root.id, leaf.id)
+
+    # A parent that would close a cycle is ignored
+    root.parent_id = leaf.id
+    hierarchy.refresh_silo(root.id, root)
+    assert hierarchy.path(root.id) == []
+
+    middle.parent_id = None
+    hierarchy.refresh_silo(middle.id, middle)
+    assert hierarchy.path(leaf.id) == [middle.id]
+    assert not hierarchy.is_ancestor(root.id, leaf.id)
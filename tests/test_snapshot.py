@@ -0,0 +1,148 @@
+import json
+import os
+
+import pytest
+
+import storage
+from snapshot import SnapshotReader, write_snapshot
+from storage import StorageEngine, put_record
+from task_model import Silo, Task
+
+
+def make_engine(tmp_path, **kwargs):
+    return StorageEngine(
+        str(tmp_path / "data.snapshot"),
+        str(tmp_path / "data.log"),
+        legacy_snapshot_path=str(tmp_path / "data.json"),
+        **kwargs
+    )
+
+
+def make_data(count=5):
+    silo = Silo(name="Work")
+    tasks = [Task(title=f"Task {i}", silo_id=silo.id, tags=[f"t{i}"]) for i in range(count)]
+    for task in tasks:
+        silo.add_task(task.id)
+    return tasks, silo
+
+
+def write(path, tasks, silo):
+    write_snapshot(path, ((task.id, None, task) for task in tasks), [(silo.id, silo)])
+
+
+def test_snapshot_round_trip(tmp_path):
+    tasks, silo = make_data()
+    path = str(tmp_path / "a.snapshot")
+    write(path, tasks, silo)
+
+    reader = SnapshotReader(path)
+    slots = reader.task_slots()
+    assert [reader.load_task(slots[task.id]) for task in tasks] == tasks
+    assert reader.load_silos() == {silo.id: silo}
+
+    # Raw records are copied through unchanged
+    copy_path = str(tmp_path / "b.snapshot")
+    write_snapshot(copy_path, ((task.id, reader.raw(slots[task.id]), None) for task in tasks), [(silo.id, silo)])
+    with open(path, "rb") as a, open(copy_path, "rb") as b:
+        assert a.read() == b.read()
+    reader.close()
+
+
+def test_a_file_that_is_not_a_snapshot_is_refused(tmp_path):
+    engine = make_engine(tmp_path)
+    with open(engine.snapshot_path, "wb") as f:
+        f.write(b"not a snapshot at all, but long enough to have a header")
+    with pytest.raises(RuntimeError):
+        engine.load()
+
+
+def test_tasks_are_decoded_on_first_read(tmp_path, monkeypatch):
+    tasks, silo = make_data()
+    engine = make_engine(tmp_path)
+    write(engine.snapshot_path, tasks, silo)
+    decoded = []
+    load_task = SnapshotReader.load_task
+
+    def counting_load(self, slot):
+        decoded.append(slot)
+        return load_task(self, slot)
+
+    monkeypatch.setattr(SnapshotReader, "load_task", counting_load)
+    store, silos = engine.load()
+    assert len(store) == len(tasks) and decoded == []
+    assert silos == {silo.id: silo}
+
+    assert store[tasks[2].id] == tasks[2]
+    assert len(decoded) == 1
+    assert store.raw_record(tasks[2].id) is not None
+
+
+def test_legacy_json_snapshot_is_migrated_at_the_next_compaction(tmp_path):
+    tasks, silo = make_data()
+    engine = make_engine(tmp_path)
+    with open(engine.legacy_snapshot_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "tasks": {task.id: task.model_dump(mode="json") for task in tasks},
+            "silos": {silo.id: silo.model_dump(mode="json")}
+        }, f)
+
+    store, silos = engine.load()
+    assert [store[task.id] for task in tasks] == tasks
+    assert engine.needs_compaction()
+    engine.compact(store, silos)
+
+    assert os.path.exists(engine.snapshot_path)
+    reloaded, reloaded_silos = make_engine(tmp_path).load()
+    assert [reloaded[task.id] for task in tasks] == tasks
+    assert reloaded_silos == {silo.id: silo}
+    assert reloaded.raw_record(tasks[0].id) is not None
+
+
+def test_compaction_closes_the_old_mapping_and_repoints_the_store(tmp_path, monkeypatch):
+    tasks, silo = make_data()
+    engine = make_engine(tmp_path)
+    write(engine.snapshot_path, tasks, silo)
+    store, silos = engine.load()
+    old_reader = engine._reader
+    changed = store[tasks[0].id]
+    changed.title = "Changed"
+    store[changed.id] = changed
+    engine.append([put_record("task", changed)])
+
+    replace = os.replace
+
+    def windows_replace(src, dst):
+        # Windows refuses to replace a file that is still mapped
+        if old_reader._map.closed is False:
+            raise PermissionError(dst)
+        replace(src, dst)
+
+    monkeypatch.setattr(storage.os, "replace", windows_replace)
+    written = engine.write_compacted(store.copy(), silos)
+    engine.install_snapshot(written, store)
+
+    assert engine._reader is not old_reader
+    assert store[tasks[1].id] == tasks[1]
+    assert store.raw_record(tasks[1].id) == engine._reader.raw(engine._reader.task_slots()[tasks[1].id])
+    assert store[tasks[0].id].title == "Changed"
+    assert os.path.getsize(engine.log_path) == 0
+    assert make_engine(tmp_path).load()[0][tasks[0].id].title == "Changed"
+
+
+def test_a_failed_replace_keeps_the_store_readable(tmp_path, monkeypatch):
+    tasks, silo = make_data()
+    engine = make_engine(tmp_path)
+    write(engine.snapshot_path, tasks, silo)
+    store, silos = engine.load()
+    engine.append([put_record("task", tasks[0])])
+
+    def failing_replace(src, dst):
+        raise PermissionError(dst)
+
+    monkeypatch.setattr(storage.os, "replace", failing_replace)
+    written = engine.write_compacted(store.copy(), silos)
+    with pytest.raises(PermissionError):
+        engine.install_snapshot(written, store)
+
+    assert store[tasks[1].id] == tasks[1]
+    assert engine.log_records == 1  # The log was kept
@@ -0,0 +1,24 @@
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ("ollama", "numpy", "supabase", "rank_bm25", "flask", "jsoncomment", "sentence_transformers")
+
+
+def test_importing_app_leaves_heavy_dependencies_unloaded(tmp_path):
+    # A fresh interpreter, since this test process has already imported them
+    script = (
+        "import json, sys\n"
+        "import app\n"
+        f"print(json.dumps(sorted(m for m in {HEAVY_MODULES!r} if m in sys.modules)))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("SUPABASE_URL", None)
+    env.pop("SUPABASE_KEY", None)
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import threading
+
+from storage import PersistenceWorker, StorageEngine, delete_record, put_record
+from task_model import Silo, Task
+
+
+def make_engine(tmp_path, **kwargs):
+    return StorageEngine(
+        str(tmp_path / "data.snapshot"),
+        str(tmp_path / "data.log"),
+        legacy_snapshot_path=str(tmp_path / "data.json"),
+        **kwargs
+    )
+
+
+def test_log_replays_over_an_empty_store(tmp_path):
+    engine = make_engine(tmp_path)
+    silo = Silo(name="Work")
+    kept, deleted = Task(title="Kept", silo_id=silo.id), Task(title="Deleted", silo_id=silo.id)
+    silo.add_task(kept.id)
+    engine.append([put_record("silo", silo), put_record("task", kept), put_record("task", deleted)])
+    kept.title = "Kept, renamed"
+    engine.append([put_record("task", kept), delete_record("task", deleted.id)])
+
+    tasks, silos = make_engine(tmp_path).load()
+    assert list(tasks) == [kept.id]
+    assert tasks[kept.id].title == "Kept, renamed"
+    assert list(silos[silo.id].tasks) == [kept.id]
+
+
+def test_torn_tail_is_ignored_and_truncated(tmp_path):
+    engine = make_engine(tmp_path)
+    first, second = Task(title="First", silo_id="s"), Task(title="Second", silo_id="s")
+    engine.append([put_record("task", first), put_record("task", second)])
+    intact = os.path.getsize(engine.log_path)
+    with open(engine.log_path, "ab") as f:
+        f.write(b'{"op": "put", "kind": "task", "id": "torn", "da')
+
+    reloaded = make_engine(tmp_path)
+    tasks, _ = reloaded.load()
+    assert sorted(tasks) == sorted([first.id, second.id])
+    assert reloaded.log_records == 2
+    assert os.path.getsize(engine.log_path) == intact
+
+    # The next append starts on a clean line
+    third = Task(title="Third", silo_id="s")
+    reloaded.append([put_record("task", third)])
+    tasks, _ = make_engine(tmp_path).load()
+    assert third.id in tasks
+
+
+
+def test_complete_last_record_without_its_newline_is_torn(tmp_path):
+    engine = make_engine(tmp_path)
+    first, second = Task(title="First", silo_id="s"), Task(title="Second", silo_id="s")
+    engine.append([put_record("task", first)])
+    intact = os.path.getsize(engine.log_path)
+    engine.append([put_record("task", second)])
+    with open(engine.log_path, "r+b") as f:
+        f.truncate(os.path.getsize(engine.log_path) - 1)  # Died before the newline reached disk
+
+    reloaded = make_engine(tmp_path)
+    tasks, _ = reloaded.load()
+    assert list(tasks) == [first.id]
+    assert os.path.getsize(engine.log_path) == intact
+
+    third = Task(title="Third", silo_id="s")
+    reloaded.append([put_record("task", third)])
+    tasks, _ = make_engine(tmp_path).load()
+    assert sorted(tasks) == sorted([first.id, third.id])
+
+def test_compaction_round_trip(tmp_path):
+    engine = make_engine(tmp_path)
+    silo = Silo(name="Home")
+    tasks = [Task(title=f"Task {i}", silo_id=silo.id) for i in range(5)]
+    for task in tasks:
+        silo.add_task(task.id)
+    engine.append([put_record("silo", silo)] + [put_record("task", task) for task in tasks])
+    task_store, silo_store = make_engine(tmp_path).load()
+    engine.compact(task_store, silo_store)
+    assert os.path.getsize(engine.log_path) == 0
+    assert engine.log_records == 0
+
+    # Later changes go to the log on top of the new snapshot
+    tasks[0].title = "Changed after compaction"
+    engine.append([put_record("task", tasks[0]), delete_record("task", tasks[1].id)])
+
+    task_store, silo_store = make_engine(tmp_path).load()
+    assert len(task_store) == 4
+    assert task_store[tasks[0].id].title == "Changed after compaction"
+    assert task_store[tasks[2].id] == tasks[2]
+    assert list(silo_store[silo.id].tasks) == [task.id for task in tasks]
+
+
+def test_compaction_snapshots_silos_as_they_were_at_the_flush(tmp_path):
+    engine = make_engine(tmp_path, compact_every=1)
+    tasks, silos = engine.load()
+    silo = Silo(name="Live")
+    silo.add_task("before")
+    silos[silo.id] = silo
+    records = [put_record("silo", silo)]
+    compacting, resume = threading.Event(), threading.Event()
+    write_compacted = engine.write_compacted
+
+    def paused_write(task_store, silo_store):
+        compacting.set()
+        resume.wait(5)
+        return write_compacted(task_store, silo_store)
+    engine.write_compacted = paused_write
+
+    worker = PersistenceWorker(engine, lambda: records, lambda: (tasks, silos), durability="group")
+
+    async def scenario():
+        flush = asyncio.create_task(worker.commit())
+        assert await asyncio.to_thread(compacting.wait, 5)
+        # A handler changes the live silo while the snapshot is being written
+        silo.add_task("after")
+        silo.name = "Renamed"
+        resume.set()
+        await flush
+
+    asyncio.run(scenario())
+    _, reader_silos = make_engine(tmp_path).load()
+    assert reader_silos[silo.id].name == "Live"
+    assert list(reader_silos[silo.id].tasks) == ["before"]
+
+
+def test_failed_compaction_neither_requeues_records_nor_fails_commits(tmp_path):
+    engine = make_engine(tmp_path, compact_every=1)
+    tasks, silos = engine.load()
+    pending = []
+
+    def broken_write(task_store, silo_store):
+        raise OSError("disk full")
+    engine.write_compacted = broken_write
+
+    def collect():
+        records, pending[:] = list(pending), []
+        return records
+
+    worker = PersistenceWorker(engine, collect, lambda: (tasks, silos), durability="request", flush_interval=0)
+    written = [Task(title=f"t{i}", silo_id="s") for i in range(3)]
+
+    async def scenario():
+        worker.start()
+        for task in written:
+            pending.append(put_record("task", task))
+            await worker.commit()  # Resolves: the record is on disk
+        await worker.stop()
+
+    asyncio.run(scenario())
+    with open(engine.log_path, encoding="utf-8") as f:
+        assert len(f.readlines()) == len(written)
+    assert sorted(make_engine(tmp_path).load()[0]) == sorted(task.id for task in written)
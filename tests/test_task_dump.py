@@ -0,0 +1,177 @@
+import asyncio
+import json
+
+from conftest import FakeAsyncClient
+from model_scheduler import ModelScheduler
+from task_processor import MAX_CONCURRENT_CALLS
+
+TITLE_PROMPT = "Generate a concise, descriptive title"
+RESEARCH_PROMPT = "Should this task require EXTERNAL RESOURCES"
+SOURCES_PROMPT = "Generate research sources for:"
+ANALYSIS_PROMPT = "Analyze these tasks:"
+
+
+def dump(count):
+    return "\n".join(f"- Task number {i}" for i in range(count))
+
+
+def model(dependencies=(), triage=None):
+    """Answer every pipeline prompt; only bullets that mention sources get research children."""
+    def answer(prompt, system):
+        if prompt.startswith("Tasks:"):
+            return triage(prompt) if triage else "no batch answer"
+        if prompt.startswith(TITLE_PROMPT):
+            return "Do The Thing"
+        if prompt.startswith(RESEARCH_PROMPT):
+            return "no"
+        if prompt.startswith(SOURCES_PROMPT):
+            return json.dumps([{"title": "Source", "url": "https://example.com", "summary": "s", "key_points": ["k"]}])
+        if prompt.startswith(ANALYSIS_PROMPT):
+            return json.dumps({"dependencies": [list(edge) for edge in dependencies]})
+        raise AssertionError(f"Unexpected prompt: {prompt}")
+    return answer
+
+
+def test_model_calls_run_concurrently_up_to_the_run_limit(processor):
+    processor.scheduler = ModelScheduler(max_in_flight=4 * MAX_CONCURRENT_CALLS)
+    processor._async_client = FakeAsyncClient(model(), delay=0.01)
+    result = asyncio.run(processor.process_task_dump_async(dump(12)))
+
+    assert len(result["nodes"]) == 12
+    assert processor.async_client.max_in_flight == MAX_CONCURRENT_CALLS
+    assert set(result["timings"]["stages"]) >= {"title", "research_check", "analysis"}
+
+
+def test_the_sync_wrapper_returns_the_async_result(processor):
+    processor._async_client = FakeAsyncClient(model(dependencies=[(0, 1)]))
+    result = processor.process_task_dump(dump(2))
+    assert [node["id"] for node in result["nodes"]] == ["task_0", "task_1"]
+    assert {"source": "task_0", "target": "task_1", "type": "dependency"} in result["edges"]
+
+
+async def collect(stream):
+    return [event async for event in stream]
+
+
+def test_stream_yields_nodes_then_resource_edges_then_dependencies(processor):
+    processor._async_client = FakeAsyncClient(model(dependencies=[(0, 1)]))
+    events = asyncio.run(collect(processor.stream_task_dump("- Find sources on tides\n- Write the essay")))
+    kinds = [event["event"] for event in events]
+
+    assert kinds[-2:] == ["critical_path", "done"]
+    seen = set()
+    for event in events:
+        if event["event"] == "node":
+            assert event.get("parent") is None or event["parent"] in seen
+            seen.add(event["node"]["id"])
+    assert seen == {"task_0", "task_1", "res_0_0"}
+
+    edge_types = [event["edge"]["type"] for event in events if event["event"] == "edge"]
+    assert edge_types == ["uses_resource", "resource", "dependency"]
+    last_node = max(i for i, kind in enumerate(kinds) if kind == "node")
+    first_parent_edge = next(i for i, event in enumerate(events) if event.get("edge", {}).get("type") == "resource")
+    assert last_node < first_parent_edge
+
+    critical = events[-2]
+    assert critical["critical_path"] == ["task_0", "task_1"]
+    assert critical["duration_hours"] == 2.0
+    assert json.loads(json.dumps(events)) == events
+
+
+def test_unparseable_dump_streams_a_single_error(processor):
+    processor._async_client = FakeAsyncClient(model())
+    events = asyncio.run(collect(processor.stream_task_dump("   \n ")))
+    assert [event["event"] for event in events] == ["error"]
+    assert processor.async_client.prompts == []
+
+
+def test_closing_the_stream_cancels_outstanding_model_calls(processor):
+    client = FakeAsyncClient(model(), delay=0.05)
+    processor._async_client = client
+
+    async def abandon():
+        stream = processor.stream_task_dump(dump(8))
+        await stream.__anext__()
+        await stream.aclose()
+        for _ in range(3):
+            await asyncio.sleep(0)
+        assert client.in_flight == 0
+        sent = len(client.prompts)
+        await asyncio.sleep(0.2)
+        return sent
+
+    sent = asyncio.run(abandon())
+    assert len(client.prompts) == sent
+    # The first event only needed a few calls; the rest were never sent
+    assert sent < 8 * 2
+
+
+def test_non_streaming_result_keeps_task_durations(processor):
+    processor._async_client = FakeAsyncClient(model(dependencies=[(0, 1)]))
+    result = asyncio.run(processor.process_task_dump_async("- Draft outline (2 hours)\n- Write the essay 30 min"))
+
+    tasks = {node["id"]: node for node in result["nodes"] if node["type"] == "task"}
+    assert tasks["task_0"]["data"]["duration_hours"] == 2.0
+    assert tasks["task_1"]["data"]["duration_hours"] == 0.5
+    assert result["duration_hours"] == 2.5
+    assert result["critical_path"] == ["task_0", "task_1"]
+    assert result["schedule"]["task_1"]["earliest_start"] == 2.0
+
+
+def test_each_run_asks_for_the_dependency_analysis_once(processor):
+    processor._async_client = FakeAsyncClient(model(dependencies=[(0, 1), (1, 2)]))
+    result = asyncio.run(processor.process_task_dump_async(dump(3)))
+
+    analysis_prompts = [p for p in processor.async_client.prompts if p.startswith(ANALYSIS_PROMPT)]
+    assert len(analysis_prompts) == 1
+    assert [edge for edge in result["edges"] if edge["type"] == "dependency"] == [
+        {"source": "task_0", "target": "task_1", "type": "dependency"},
+        {"source": "task_1", "target": "task_2", "type": "dependency"},
+    ]
+    assert result["critical_path"] == ["task_0", "task_1", "task_2"]
+
+
+def test_dependency_analysis_is_shared_within_a_run(processor):
+    from task_processor import PipelineRun
+
+    processor._async_client = FakeAsyncClient(model())
+
+    async def analyse():
+        run = PipelineRun()
+        first = processor._dependency_analysis(run, ["a", "b"])
+        again = processor._dependency_analysis(run, ["a", "b"])
+        other = processor._dependency_analysis(run, ["a", "c"])
+        await asyncio.gather(first, other)
+        return first, again, other, PipelineRun()
+
+    first, again, other, fresh = asyncio.run(analyse())
+    assert first is again
+    assert other is not first
+    assert fresh.analyses == {}
+
+
+def test_model_calls_counts_only_requests_sent_to_the_model(processor):
+    processor._async_client = FakeAsyncClient(model())
+    first = asyncio.run(processor.process_task_dump_async(dump(2)))
+    assert first["model_calls"] == len(processor.async_client.prompts)
+    assert first["timings"]["model_calls"] == first["model_calls"]
+
+    # The analysis prompt runs at low temperature and is answered from the cache
+    sent = len(processor.async_client.prompts)
+    second = asyncio.run(processor.process_task_dump_async(dump(2)))
+    assert second["model_calls"] == len(processor.async_client.prompts) - sent
+    assert second["timings"]["cached_calls"] >= 1
+    assert not any(p.startswith(ANALYSIS_PROMPT) for p in processor.async_client.prompts[sent:])
+
+
+def test_process_endpoint_returns_the_streamed_shape(client, processor, monkeypatch):
+    import app
+
+    processor._async_client = FakeAsyncClient(model(dependencies=[(0, 1)]))
+    monkeypatch.setattr(app, "task_processor", processor)
+    body = client.post("/api/tasks/process", json={"tasks": ["- Draft outline (2 hours)", "- Write the essay"]}).json()
+
+    assert [node["data"]["duration_hours"] for node in body["nodes"]] == [2.0, 1.0]
+    assert body["duration_hours"] == 3.0
+    assert body["critical_path"] == ["task_0", "task_1"]
+    assert body["model_calls"] == len(processor.async_client.prompts)
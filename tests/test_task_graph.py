@@ -0,0 +1,83 @@
+from task_graph import RelationshipStore
+from task_model import Task, TaskRelationship
+
+
+def make_task(task_id, **fields):
+    return Task(id=task_id, title=task_id, silo_id="s", **fields)
+
+
+def create_tasks(client, silo_id, *titles):
+    return [
+        client.post("/api/tasks", json={
+            "title": title, "description": "d", "silo_id": silo_id, "parse_with_ai": False
+        }).json()["id"]
+        for title in titles
+    ]
+
+
+def test_parent_id_indexes_a_child_of_edge():
+    store = RelationshipStore()
+    store.rebuild({
+        "parent": make_task("parent"),
+        "b": make_task("b", parent_id="parent"),
+        "a": make_task("a", parent_id="parent", related=["b"]),
+    })
+
+    assert store.outgoing("a") == {(TaskRelationship.CHILD_OF, "parent"), (TaskRelationship.RELATED_TO, "b")}
+    assert store.children("parent") == ["a", "b"]
+    assert store.referencing("parent") == {"a", "b"}
+    assert store.referencing("b") == {"a"}
+
+    store.refresh("a", make_task("a"))
+    assert store.children("parent") == ["b"]
+    assert store.referencing("b") == set()
+
+
+def test_deleting_a_task_removes_its_edges_from_both_maps():
+    store = RelationshipStore()
+    store.rebuild({"a": make_task("a", dependencies=["b"]), "b": make_task("b", dependents=["a"])})
+    assert store.referencing("a") == {"b"}
+
+    store.refresh("b", None)
+    assert store.outgoing("b") == frozenset()
+    assert store.referencing("a") == set()
+    # Edges to tasks that no longer exist stay visible until their holder changes
+    assert store.referencing("b") == {"a"}
+
+
+def test_relationship_endpoints_update_both_directions(client, silo_id):
+    a, b, c = create_tasks(client, silo_id, "a", "b", "c")
+
+    assert client.post(f"/api/tasks/{a}/relationships/{b}", params={"relationship_type": "depends_on"}).status_code == 200
+    assert client.post(f"/api/tasks/{c}/relationships/{a}", params={"relationship_type": "child_of"}).status_code == 200
+
+    rel_a = client.get(f"/api/tasks/{a}/relationships").json()
+    assert rel_a["outgoing"] == {"depends_on": [b]}
+    assert rel_a["incoming"] == {"blocks": [b], "child_of": [c]}
+    assert rel_a["children"] == [c]
+    rel_b = client.get(f"/api/tasks/{b}/relationships").json()
+    assert rel_b["outgoing"] == {"blocks": [a]}
+    assert rel_b["incoming"] == {"depends_on": [a]}
+    assert client.get(f"/api/tasks/{b}").json()["dependents"] == [a]
+
+    assert client.delete(f"/api/tasks/{b}/relationships/{a}").status_code == 200
+    rel_a = client.get(f"/api/tasks/{a}/relationships").json()
+    assert rel_a["outgoing"] == {}
+    assert rel_a["incoming"] == {"child_of": [c]}
+    assert client.get(f"/api/tasks/{b}/relationships").json()["incoming"] == {}
+
+
+def test_deleting_a_task_clears_the_relationships_pointing_at_it(client, silo_id):
+    import app
+
+    a, b, c = create_tasks(client, silo_id, "a", "b", "c")
+    client.post(f"/api/tasks/{a}/relationships/{b}", params={"relationship_type": "depends_on"})
+    client.post(f"/api/tasks/{c}/relationships/{b}", params={"relationship_type": "related_to"})
+    assert app.relationships.referencing(b) == {a, c}
+
+    assert client.delete(f"/api/tasks/{b}").status_code == 200
+    assert app.relationships.referencing(b) == set()
+    assert app.relationships.outgoing(b) == frozenset()
+    assert client.get(f"/api/tasks/{a}").json()["dependencies"] == []
+    assert client.get(f"/api/tasks/{c}").json()["related"] == []
+    assert client.get(f"/api/tasks/{a}/relationships").json()["incoming"] == {}
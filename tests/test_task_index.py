@@ -0,0 +1,130 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from task_index import TaskIndex
+from task_model import Task, TaskPriority, TaskStatus
+
+SILOS = ["a", "b", "c"]
+START = datetime(2026, 1, 1)
+
+
+def random_task(rng, task_id=None):
+    due = None
+    if rng.random() < 0.7:
+        due = START + timedelta(days=rng.randint(0, 30))
+        if rng.random() < 0.2:
+            due = due.astimezone(timezone.utc)
+    task = Task(
+        title="t",
+        silo_id=rng.choice(SILOS),
+        status=rng.choice(list(TaskStatus)),
+        priority=rng.choice(list(TaskPriority)),
+        due_date=due
+    )
+    if task_id:
+        task.id = task_id
+    return task
+
+
+def brute_force(order, store, silo_id=None, status=None, priority=None, due_after=None, due_before=None):
+    result = []
+    for task_id in order:
+        task = store[task_id]
+        if silo_id and task.silo_id != silo_id:
+            continue
+        if status and task.status.value != status:
+            continue
+        if priority and task.priority.value != priority:
+            continue
+        due = task.due_date.timestamp() if task.due_date else None
+        if due_after and (due is None or due < due_after.timestamp()):
+            continue
+        if due_before and (due is None or due > due_before.timestamp()):
+            continue
+        result.append(task_id)
+    return result
+
+
+def random_filters(rng):
+    filters = {}
+    if rng.random() < 0.5:
+        filters["silo_id"] = rng.choice(SILOS)
+    if rng.random() < 0.4:
+        filters["status"] = rng.choice(list(TaskStatus)).value
+    if rng.random() < 0.3:
+        filters["priority"] = rng.choice(list(TaskPriority)).value
+    if rng.random() < 0.5:
+        filters["due_after"] = START + timedelta(days=rng.randint(0, 30))
+    if rng.random() < 0.5:
+        filters["due_before"] = START + timedelta(days=rng.randint(0, 30))
+    return filters
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_queries_match_a_brute_force_scan(seed):
+    rng = random.Random(seed)
+    index = TaskIndex()
+    store = {}
+    order = []  # Ids in the order they were first indexed
+
+    for step in range(600):
+        roll = rng.random()
+        if store and roll < 0.2:
+            task_id = rng.choice(order)
+            del store[task_id]
+            order.remove(task_id)
+            index.refresh(task_id, None)
+        elif store and roll < 0.5:
+            task_id = rng.choice(order)
+            store[task_id] = random_task(rng, task_id)
+            index.refresh(task_id, store[task_id])
+        else:
+            task = random_task(rng)
+            store[task.id] = task
+            order.append(task.id)
+            index.refresh(task.id, task)
+
+        if step % 20 == 0:
+            filters = random_filters(rng)
+            expected = brute_force(order, store, **filters)
+            skip, limit = rng.randint(0, 5), rng.randint(1, 15)
+            page, _ = index.query(skip=skip, limit=limit, **filters)
+            assert page == expected[skip:skip + limit]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_cursor_paging_returns_every_match_once_without_an_empty_page(seed):
+    rng = random.Random(seed)
+    index = TaskIndex()
+    store = {}
+    for _ in range(300):
+        task = random_task(rng)
+        store[task.id] = task
+        index.refresh(task.id, task)
+    order = list(store)
+
+    for _ in range(20):
+        filters = random_filters(rng)
+        expected = brute_force(order, store, **filters)
+        limit = rng.randint(1, 20)
+        pages, cursor = index.query(limit=limit, **filters)
+        while cursor is not None:
+            page, cursor = index.query(limit=limit, cursor=cursor, **filters)
+            assert page, "a cursor led to an empty page"
+            pages.extend(page)
+        assert pages == expected
+
+
+def test_exactly_full_last_page_has_no_cursor():
+    index = TaskIndex()
+    for i in range(10):
+        task = Task(title=str(i), silo_id="a")
+        index.refresh(task.id, task)
+    page, cursor = index.query(limit=10)
+    assert len(page) == 10 and cursor is None
+    page, cursor = index.query(limit=5)
+    assert cursor is not None
+    page, cursor = index.query(limit=5, cursor=cursor)
+    assert len(page) == 5 and cursor is None
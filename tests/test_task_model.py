@@ -0,0 +1,64 @@
+import json
+
+from task_model import OrderedIdSet, Silo
+
+
+def test_ordered_id_set_keeps_first_insertion_order():
+    ids = OrderedIdSet(["c", "a", "c"])
+    ids.add("b")
+    ids.add("a")
+    assert list(ids) == ["c", "a", "b"]
+    assert "a" in ids and "z" not in ids
+
+    ids.discard("a")
+    ids.discard("missing")
+    ids.add("a")
+    assert list(ids) == ["c", "b", "a"]
+    assert len(ids) == 3
+
+
+def test_silo_ids_round_trip_through_json():
+    silo = Silo(name="Work")
+    for task_id in ("t3", "t1", "t2"):
+        silo.add_task(task_id)
+    silo.add_child("child")
+    silo.remove_task("t1")
+
+    dumped = silo.model_dump(mode="json")
+    assert dumped["tasks"] == ["t3", "t2"]
+    assert dumped["children"] == ["child"]
+    assert json.loads(silo.model_dump_json())["tasks"] == ["t3", "t2"]
+
+    restored = Silo.model_validate_json(silo.model_dump_json())
+    assert isinstance(restored.tasks, OrderedIdSet)
+    assert list(restored.tasks) == ["t3", "t2"]
+    assert Silo.model_validate(dumped).tasks == silo.tasks
+
+
+def test_validated_silos_never_share_an_id_set():
+    ids = OrderedIdSet(["a"])
+    silo = Silo(name="Work", tasks=ids)
+    silo.add_task("b")
+    assert list(ids) == ["a"]
+
+    copy = silo.model_copy(deep=True)
+    copy.add_task("c")
+    assert list(silo.tasks) == ["a", "b"]
+
+
+def test_json_schema_describes_a_list_of_ids():
+    schema = Silo.model_json_schema()
+    for field in ("tasks", "children"):
+        assert schema["properties"][field]["type"] == "array"
+        assert schema["properties"][field]["items"] == {"type": "string"}
+
+
+def test_silo_endpoints_return_task_ids_as_a_list(client, silo_id):
+    task_ids = [
+        client.post("/api/tasks", json={
+            "title": title, "description": "d", "silo_id": silo_id, "parse_with_ai": False
+        }).json()["id"]
+        for title in ("one", "two", "three")
+    ]
+    client.delete(f"/api/tasks/{task_ids[1]}")
+    assert client.get(f"/api/silos/{silo_id}").json()["tasks"] == [task_ids[0], task_ids[2]]
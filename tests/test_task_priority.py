@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+from task_model import Task, TaskPriority
+from task_priority import TaskPriorityQueue, due_date_score, priority_score
+
+
+def make_task(title, due_date=None, priority=TaskPriority.MEDIUM):
+    return Task(title=title, silo_id="silo", due_date=due_date, priority=priority)
+
+
+def test_aware_and_naive_due_dates_score_the_same():
+    now = datetime.now()
+    naive = now + timedelta(days=2, hours=3)
+    aware = naive.astimezone(timezone.utc)
+    assert due_date_score(make_task("a", naive), now) == due_date_score(make_task("b", aware), now) == 30
+
+
+def test_queue_mixes_aware_and_naive_due_dates():
+    clock = [datetime(2026, 1, 1, 12, 0)]
+    queue = TaskPriorityQueue(clock=lambda: clock[0])
+    tasks = [
+        make_task("naive", datetime(2026, 1, 5, 12, 0)),
+        make_task("aware", datetime(2026, 1, 3, 12, 0).astimezone(timezone.utc)),
+        make_task("none")
+    ]
+    for task in tasks:
+        queue.refresh(task.id, task)
+        queue.set_eligible(task.id, True)
+
+    # Walk the clock across every band boundary; rollovers must match a full rescore
+    for _ in range(12 * 8):
+        clock[0] += timedelta(hours=1)
+        expected = sorted(tasks, key=lambda t: -priority_score(t, clock[0]))
+        assert [queue.score(t.id) for t in expected] == [priority_score(t, clock[0]) for t in expected]
+        assert queue.peek() is not None
+
+
+def test_aware_due_date_update_is_indexed_and_saved(client, silo_id):
+    import app
+
+    task_id = client.post(
+        "/api/tasks", json={"title": "Report", "description": "d", "silo_id": silo_id, "parse_with_ai": False}
+    ).json()["id"]
+    response = client.put(f"/api/tasks/{task_id}", json={"due_date": "2026-11-01T00:00:00+00:00"})
+
+    assert response.status_code == 200
+    assert task_id in app.dependency_index.top_ready(10)
+    with open(app.storage.log_path, encoding="utf-8") as f:
+        assert "2026-11-01T00:00:00Z" in f.read()
+
+
+def test_failing_index_does_not_stop_the_commit(client, silo_id, monkeypatch):
+    import app
+
+    task_id = client.post(
+        "/api/tasks", json={"title": "Report", "description": "d", "silo_id": silo_id, "parse_with_ai": False}
+    ).json()["id"]
+    client.get(f"/api/tasks/{task_id}")  # Cache the encoded task
+    refresh = app.task_retriever.refresh
+
+    def failing_refresh(changed_id, task):
+        if task is not None:
+            raise RuntimeError("index bug")
+        refresh(changed_id, task)
+
+    monkeypatch.setattr(app.task_retriever, "refresh", failing_refresh)
+    assert client.put(f"/api/tasks/{task_id}", json={"title": "Renamed"}).status_code == 200
+
+    assert client.get(f"/api/tasks/{task_id}").json()["title"] == "Renamed"
+    assert app.task_index.query(silo_id=silo_id)[0] == [task_id]
+    with open(app.storage.log_path, encoding="utf-8") as f:
+        assert "Renamed" in f.read()
@@ -0,0 +1,100 @@
+import numpy as np
+
+import task_retrieval
+from model_scheduler import _on_event_loop
+from task_model import Task, TaskStatus
+from task_retrieval import TaskRetriever
+
+VOCABULARY = ["paper", "draft", "garden", "fence", "paint", "review"]
+
+
+class BagOfWords:
+    """Deterministic stand-in encoder that records every text it encodes."""
+
+    def __init__(self):
+        self.encoded = []
+
+    def __call__(self, texts):
+        self.encoded.extend(texts)
+        vectors = np.array([[text.lower().count(word) + 0.01 for word in VOCABULARY] for text in texts])
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_retriever(encoder=None):
+    retriever = TaskRetriever(encoder=encoder)
+    tasks = {
+        task.id: task for task in [
+            Task(title="Draft the paper", silo_id="work"),
+            Task(title="Review the paper draft", silo_id="work"),
+            Task(title="Paint the fence", silo_id="work"),
+            Task(title="Paper archive", silo_id="work", status=TaskStatus.ARCHIVED),
+            Task(title="Paper in another silo", silo_id="home")
+        ]
+    }
+    retriever.rebuild(tasks)
+    return retriever, list(tasks.values())
+
+
+def test_shortlist_leaves_out_archived_self_and_linked_tasks():
+    retriever, (draft, review, paint, archived, _) = make_retriever(BagOfWords())
+    ids = [task_id for task_id, _ in retriever.shortlist(draft)]
+    assert ids == [review.id, paint.id]
+    assert archived.id not in ids and draft.id not in ids
+
+    assert [task_id for task_id, _ in retriever.shortlist(draft, exclude={review.id})] == [paint.id]
+    assert [task_id for task_id, _ in retriever.shortlist(draft, k=1)] == [review.id]
+
+
+def test_shortlist_falls_back_to_bm25_without_an_encoder(monkeypatch):
+    monkeypatch.setattr(task_retrieval, "shared_encoder", lambda model_name: None)
+    retriever, (draft, review, paint, _, _) = make_retriever()
+    shortlist = retriever.shortlist(draft)
+    assert [task_id for task_id, _ in shortlist] == [review.id, paint.id]
+    # Pure BM25, scaled so the best match scores 1
+    assert shortlist[0][1] == 1.0 and 0.0 <= shortlist[1][1] < 1.0
+
+
+def test_a_task_change_drops_only_its_silos_cache():
+    encoder = BagOfWords()
+    retriever, (draft, review, paint, _, other) = make_retriever(encoder)
+    before = dict(retriever.shortlist(draft))
+    retriever.shortlist(other)
+    assert set(retriever._bm25) == {"work", "home"}
+    encoded = len(encoder.encoded)
+
+    paint.title = "Paint the paper draft review"
+    retriever.refresh(paint.id, paint)
+    assert set(retriever._bm25) == {"home"}
+
+    assert dict(retriever.shortlist(draft))[paint.id] > before[paint.id]
+    # Only the edited task and the query are encoded again
+    assert encoder.encoded[encoded:] == ["Paint the paper draft review", "Draft the paper"]
+
+    retriever.refresh(review.id, None)
+    assert review.id not in [task_id for task_id, _ in retriever.shortlist(draft)]
+
+
+def test_suggest_dependencies_shortlists_off_the_event_loop(client, silo_id, monkeypatch):
+    import app
+
+    task_ids = [
+        client.post("/api/tasks", json={
+            "title": title, "description": "d", "silo_id": silo_id, "parse_with_ai": False
+        }).json()["id"]
+        for title in ("Draft the paper", "Review the paper")
+    ]
+    calls = []
+    shortlist = app.task_retriever.shortlist
+
+    def recording_shortlist(*args, **kwargs):
+        calls.append(_on_event_loop())
+        return shortlist(*args, **kwargs)
+
+    monkeypatch.setattr(app.task_retriever, "shortlist", recording_shortlist)
+    monkeypatch.setattr(app.task_retriever, "_encoder", BagOfWords())
+    monkeypatch.setattr(app.task_processor, "suggest_dependencies", lambda task, candidates: [])
+
+    response = client.post("/api/ai/suggest-dependencies", params={"task_id": task_ids[0]})
+    assert response.status_code == 200
+    assert response.json()["candidates"] == 1
+    assert calls == [False]
@@ -0,0 +1,89 @@
+import asyncio
+import json
+
+import task_processor
+from conftest import FakeAsyncClient
+from task_processor import MAX_BATCH_ITEMS, PipelineRun
+
+TITLE_PROMPT = "Generate a concise, descriptive title"
+RESEARCH_PROMPT = "Should this task require EXTERNAL RESOURCES"
+
+
+def test_batches_are_capped_by_item_count(processor):
+    batches = processor._plan_batches([f"short task {i}" for i in range(40)])
+    assert [len(batch) for batch in batches] == [MAX_BATCH_ITEMS, MAX_BATCH_ITEMS, 40 - 2 * MAX_BATCH_ITEMS]
+    assert [idx for batch in batches for idx in batch] == list(range(40))
+
+
+def test_batches_fit_the_context_window(processor, monkeypatch):
+    # About 1000 tokens each: two fit in 4096 - 1024 answer - 300 instructions
+    long_tasks = ["x" * 4000 for _ in range(5)]
+    assert processor._plan_batches(long_tasks) == [[0, 1], [2, 3], [4]]
+
+    monkeypatch.setattr(task_processor, "CONTEXT_WINDOW", 8192)
+    assert processor._plan_batches(long_tasks) == [[0, 1, 2, 3, 4]]
+
+    # A smaller answer budget leaves room for fewer answers per batch
+    monkeypatch.setattr(task_processor, "MAX_TOKENS", 256)
+    assert [len(batch) for batch in processor._plan_batches(["task"] * 10)] == [4, 4, 2]
+
+    # A bullet larger than the whole budget still gets a batch of its own
+    monkeypatch.setattr(task_processor, "CONTEXT_WINDOW", 2048)
+    assert processor._plan_batches(["x" * 20000, "short"]) == [[0], [1]]
+
+
+def test_triage_answers_are_validated_item_by_item(processor):
+    batch = [10, 11, 12, 13, 14, 15]
+    response = "Sure! " + json.dumps([
+        {"index": 1, "title": "Draft Project Plan", "needs_research": False},
+        {"index": "2", "title": "Plan", "needs_research": "yes"},   # Title under two words
+        {"index": 3, "title": "Book Flights Now", "needs_research": "maybe"},
+        {"index": 4, "title": "Call The Bank", "needs_research": 1},  # Not a boolean
+        {"title": "No Index Given", "needs_research": True},
+        {"index": 9, "title": "Out Of Range", "needs_research": True},
+        {"index": 1, "title": "Duplicate Answer", "needs_research": True},
+        "not an object",
+        {"index": 6, "title": "\"Read: Papers!\"", "needs_research": True}
+    ])
+    assert processor._parse_triage(response, batch) == {
+        10: ("Draft Project Plan", False),
+        11: (None, True),
+        12: ("Book Flights Now", None),
+        13: ("Call The Bank", None),
+        15: ("Read Papers", True)
+    }
+    assert processor._parse_triage("no JSON here", batch) == {}
+    assert processor._parse_triage('[{"index": 1,', batch) == {}
+
+
+def test_only_the_parts_a_batch_got_wrong_are_asked_again(processor):
+    bullets = ["Draft the project plan", "Plan the offsite", "Book the flights"]
+
+    def answer(prompt, system):
+        if prompt.startswith("Tasks:"):
+            return json.dumps([
+                {"index": 1, "title": "Draft Project Plan", "needs_research": False},
+                {"index": 2, "title": "Plan", "needs_research": False},
+                {"index": 3, "title": "Book Flights", "needs_research": "unsure"}
+            ])
+        if prompt.startswith(TITLE_PROMPT):
+            return "Plan Team Offsite"
+        if prompt.startswith(RESEARCH_PROMPT):
+            return "no"
+        return json.dumps({"dependencies": []})
+
+    processor._async_client = FakeAsyncClient(answer)
+    result = asyncio.run(processor.process_task_dump_async("\n".join(f"- {b}" for b in bullets)))
+
+    titles = {node["id"]: node["data"]["title"] for node in result["nodes"]}
+    assert titles == {"task_0": "Draft Project Plan", "task_1": "Plan Team Offsite", "task_2": "Book Flights"}
+    prompts = processor.async_client.prompts
+    assert sum(p.startswith("Tasks:") for p in prompts) == 1
+    assert [p for p in prompts if p.startswith(TITLE_PROMPT)] == [processor._title_prompt(bullets[1])]
+    assert [p for p in prompts if p.startswith(RESEARCH_PROMPT)] == [processor._research_prompt(bullets[2])]
+
+
+def test_a_batch_of_one_is_not_sent(processor):
+    processor._async_client = FakeAsyncClient(lambda prompt, system: "")
+    assert asyncio.run(processor._atriage_batch(PipelineRun(), ["only task"], [0])) == {}
+    assert processor.async_client.prompts == []